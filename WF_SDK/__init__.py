@@ -2,16 +2,21 @@
 This module realizes communication with Digilent Test & Measurement devices
 """
 
-from WF_SDK import device
-from WF_SDK import scope
-from WF_SDK import wavegen
-from WF_SDK import supplies
-from WF_SDK import dmm
-from WF_SDK import logic
-from WF_SDK import pattern
-from WF_SDK import static
-from WF_SDK import protocol
+from importlib import import_module
 
-from WF_SDK import tools
+# instruments are imported only when they are first used
+__submodules__ = ["device", "scope", "wavegen", "supplies", "dmm", "logic", "pattern", "static", "protocol", "tools", "pool", "polling", "library", "simulator", "trace", "storage", "buffers", "measurements", "captures"]
+__all__ = __submodules__ + ["error", "warning"]
 
-from WF_SDK.device import error, warning
+def __getattr__(name):
+    """
+        import instruments and error classes on first access
+    """
+    if name in __submodules__:
+        return import_module("WF_SDK." + name)
+    if name in ["error", "warning"]:
+        return getattr(import_module("WF_SDK.device"), name)
+    raise AttributeError("module 'WF_SDK' has no attribute '" + name + "'")
+
+def __dir__():
+    return __all__
@@ -0,0 +1,65 @@
+""" BUFFER POOL FUNCTIONS: get, clear, check """
+
+import threading                  # every thread gets its own buffers
+from WF_SDK.library import error
+
+"""-----------------------------------------------------------------------"""
+
+# the buffers of the calling thread, by ctypes element type
+__pool__ = threading.local()
+
+"""-----------------------------------------------------------------------"""
+
+def get(element_type, size):
+    """
+        get a reusable ctypes array, instead of creating a new one for every transfer
+
+        parameters: - element type, like ctypes.c_double
+                    - minimum number of elements
+
+        returns:    - a ctypes array with at least the requested number of elements
+
+        every thread has one buffer for every element type, it grows to the largest requested size,
+        and its content is overwritten by the next transfer using the same type in the same thread
+    """
+    buffers = getattr(__pool__, "buffers", None)
+    if buffers is None:
+        buffers = __pool__.buffers = {}
+    buffer = buffers.get(element_type)
+    if buffer is None or len(buffer) < size:
+        buffer = (element_type * size)()   # create an empty buffer
+        buffers[element_type] = buffer
+    return buffer
+
+"""-----------------------------------------------------------------------"""
+
+def clear():
+    """
+        release the buffers of the calling thread (like after a recording with the maximum buffer size)
+    """
+    __pool__.buffers = {}
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def check(out, element_type, shape, function, instrument):
+    """
+        check that samples can be written directly into an array passed as out (the library writes whole rows without bounds checks)
+
+        parameters: - the array
+                    - numpy element type, like "float64"
+                    - the expected shape
+                    - name of the function and the instrument for the error
+
+        raises an error if out isn't a writable, C-contiguous numpy array of the type and the shape
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    if not isinstance(out, numpy.ndarray) or out.dtype != numpy.dtype(element_type) or out.shape != tuple(shape) \
+            or not out.flags.c_contiguous or not out.flags.writeable:
+        found = type(out).__name__
+        if isinstance(out, numpy.ndarray):
+            found = str(out.dtype) + " array with the shape " + str(out.shape)
+            found += "" if out.flags.c_contiguous else " (not contiguous)"
+            found += "" if out.flags.writeable else " (read-only)"
+        raise error("out has to be a writable, C-contiguous " + element_type + " array with the shape " + str(tuple(shape)) + ", got: " + found, function, instrument)
+    return
@@ -0,0 +1,40 @@
+""" CAPTURE RESULTS: capture """
+
+"""-----------------------------------------------------------------------"""
+
+class capture:
+    """
+        a recording with the settings it was made with (see scope.capture and logic.capture)
+
+        the settings are read from the device after the acquisition, so a capture describes itself
+        and stays valid when the instrument is set up again (it can be passed to other threads)
+    """
+    __slots__ = ["data", "sampling_frequency", "range", "offset", "trigger_position", "channels", "start"]
+
+    def __init__(self, data, sampling_frequency, channels, trigger_position=-1, start=0.0, range=None, offset=None):
+        self.data = data                                # numpy array with the samples, one row for every channel if a list of channels is recorded
+        self.sampling_frequency = sampling_frequency    # the sampling frequency set on the device in Hz (not the requested one)
+        self.channels = channels                        # the recorded channel of every row
+        self.trigger_position = trigger_position        # index of the trigger sample, -1 if there is no trigger
+        self.start = start                              # UTC time of the first sample in seconds
+        self.range = range                              # numpy array with the amplitude range of every channel in Volts (None for logic captures)
+        self.offset = offset                            # numpy array with the offset voltage of every channel in Volts (None for logic captures)
+        return
+
+    def __len__(self):
+        return self.data.shape[-1]
+
+    def time(self, start=0, stop=None):
+        """
+            get the time of the samples (computed at every call)
+
+            parameters: - index of the first sample, default is 0
+                        - index after the last sample, default is None (the end of the capture)
+
+            returns:    - numpy float64 array with the time of the samples in seconds, relative to the trigger
+                          (or to the first sample without trigger)
+        """
+        import numpy              # imported here, creating a capture doesn't need it
+        if stop is None:
+            stop = len(self)
+        return (numpy.arange(start, stop) - max(self.trigger_position, 0)) / self.sampling_frequency
@@ -1,4 +1,4 @@
-""" DEVICE CONTROL FUNCTIONS: open, check_error, close, temperature """
+""" DEVICE CONTROL FUNCTIONS: enum, watch, unwatch, open, check_error, close, temperature, find_node """
 
 """
 import ctypes                            # import the C compatible data types
@@ -21,28 +21,13 @@ else:
 """-----------------------------------------------------------------------"""
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-import inspect                    # caller function data
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+import sys                        # caller function data
+import json                       # capability cache file format
+import io                         # file access (open is redefined in this module)
+import threading                  # devices can be used from several threads
+from os import path, makedirs     # capability cache location
+from WF_SDK.library import dwf, constants, error, warning   # shared library, constants and exceptions
+from WF_SDK import library        # backend selection
 
 """-----------------------------------------------------------------------"""
 
@@ -63,34 +48,11 @@ def open():
 
 """-----------------------------------------------------------------------"""
 
-class error(Exception):
-    """
-        WaveForms SDK error
-    """
-    def __init__(self, message, function, instrument):
-        self.message = message
-        self.function = function
-        self.instrument = instrument
-        return
-    def __str__(self):
-        return "Error: " + self.instrument + " -> " + self.function + " -> " + self.message
-
-class warning(Exception):
-    """
-        WaveForms SDK warning, or non-fatal error
-    """
-    def __init__(self, message, function, instrument):
-        self.message = message
-        self.function = function
-        self.instrument = instrument
-        return
-    def __str__(self):
-        return "Warning: " + self.instrument + " -> " + self.function + " -> " + self.message
-
 class data:
     """ stores the device handle, the device name and the device data """
     handle = ctypes.c_int(0)
     name = ""
+    serial = ""
     version = ""
     class analog:
         class input:
@@ -127,6 +89,8 @@ class data:
             max_read_range = []
             set_steps = []
             read_steps = []
+            __channels__ = {}   # channel label -> channel index, filled by open()
+            __nodes__ = {}      # (channel label, node name) -> node, filled by open()
     class digital:
         class input:
             channel_count = 0
@@ -134,78 +98,250 @@ class data:
         class output:
             channel_count = 0
             max_buffer_size = 0
+    def __init__(self):
+        # every opened device gets its own copy of the fields
+        __copy_fields__(data, self)
+        self.handle = ctypes.c_int(0)
+        return
 
 """-----------------------------------------------------------------------"""
 
-def open(device=None, config=0):
-    """
-        open a specific device
+class node:
+    """ stores the position and the ranges of an analog IO node (returned by find_node) """
+    def __init__(self, device_data, channel, index):
+        IO = device_data.analog.IO
+        self.channel = channel
+        self.index = index
+        self.unit = IO.node_unit[channel][index]
+        self.min_set_range = IO.min_set_range[channel][index]
+        self.max_set_range = IO.max_set_range[channel][index]
+        self.set_steps = IO.set_steps[channel][index]
+        self.min_read_range = IO.min_read_range[channel][index]
+        self.max_read_range = IO.max_read_range[channel][index]
+        self.read_steps = IO.read_steps[channel][index]
+        return
 
-        parameters: - device type: None (first device), "Analog Discovery", "Analog Discovery 2", "Analog Discovery Studio", "Digital Discovery", "Analog Discovery Pro 3X50", "Analog Discovery Pro 5250"
-                    - configuration: 0 = auto, default = auto
+"""-----------------------------------------------------------------------"""
 
-        returns:    - device data
-    """
-    device_names = [("Analog Discovery", constants.devidDiscovery), ("Analog Discovery 2", constants.devidDiscovery2),
+class device_info:
+    """ stores the enumeration data of a connected device (returned by enum) """
+    def __init__(self, index, name, serial, device_id, revision, busy):
+        self.index = index          # index in the last enumeration
+        self.name = name            # device type, like "Analog Discovery 2"
+        self.serial = serial
+        self.id = device_id
+        self.revision = revision
+        self.busy = busy            # True if the device is opened by a program
+        return
+    def __repr__(self):
+        return "device_info(" + self.name + ", " + self.serial + (", busy" if self.busy else "") + ")"
+
+"""-----------------------------------------------------------------------"""
+
+__lock__ = threading.Lock()   # device enumeration and connection are not thread safe
+__sessions__ = []             # devices opened by this process
+__snapshot__ = []             # result of the last enumeration (device_info list)
+__watcher__ = None            # background enumeration: (thread, stop event), or None
+
+# device names and IDs
+__device_names__ = [("Analog Discovery", constants.devidDiscovery), ("Analog Discovery 2", constants.devidDiscovery2),
                     ("Analog Discovery Studio", constants.devidDiscovery2), ("Digital Discovery", constants.devidDDiscovery),
                     ("Analog Discovery Pro 3X50", constants.devidADP3X50), ("Analog Discovery Pro 5250", constants.devidADP5250)]
-    
-    # decode device names
-    device_type = constants.enumfilterAll
-    for pair in device_names:
-        if pair[0] == device:
-            device_type = pair[1]
-            break
 
-    # count devices
-    device_count = ctypes.c_int()
-    dwf.FDwfEnum(device_type, ctypes.byref(device_count))
+"""-----------------------------------------------------------------------"""
 
-    # check for connected devices
-    if device_count.value <= 0:
-        if device_type.value == 0:
-            raise error("There are no connected devices", "open", "device")
-        else:
-            raise error("Error: There is no " + device + " connected", "open", "device")
+def __copy_fields__(template, target):
+    """
+        copy the fields of a data class to an object, nested classes and lists are copied, not shared
+    """
+    for key, value in vars(template).items():
+        if key in ["__module__", "__qualname__", "__doc__", "__dict__", "__weakref__"] or callable(value) and not isinstance(value, type):
+            continue
+        if isinstance(value, type):
+            nested = value.__new__(value)
+            __copy_fields__(value, nested)
+            value = nested
+        elif isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, dict):
+            value = dict(value)
+        setattr(target, key, value)
+    return target
 
-    # this is the device handle - it will be used by all functions to "address" the connected device
-    device_handle = ctypes.c_int(0)
+"""-----------------------------------------------------------------------"""
 
-    # connect to the first available device
-    index = 0
-    while device_handle.value == 0 and index < device_count.value:
-        dwf.FDwfDeviceConfigOpen(ctypes.c_int(index), ctypes.c_int(config), ctypes.byref(device_handle))
-        index += 1  # increment the index and try again if the device is busy
-
-    # check connected device type
-    device_name = ""
-    if device_handle.value != 0:
-        device_id = ctypes.c_int()
-        device_rev = ctypes.c_int()
-        dwf.FDwfEnumDeviceType(ctypes.c_int(index - 1), ctypes.byref(device_id), ctypes.byref(device_rev))
-
-        # decode device id
-        for pair in device_names:
-            if pair[1].value == device_id.value:
-                device_name = pair[0]
+def __state__(device_data, instrument, template):
+    """
+        get the state of an instrument on a specific device (created on first use)
+
+        parameters: - device data
+                    - instrument name, like "scope"
+                    - the data class of the instrument, used as template
+    """
+    state = getattr(device_data, instrument, None)
+    if state is None:
+        state = __copy_fields__(template, template.__new__(template))
+        setattr(device_data, instrument, state)
+    return state
+
+"""-----------------------------------------------------------------------"""
+
+def enum(device=None):
+    """
+        list the connected devices (every device is enumerated in one pass)
+
+        parameters: - device type: None (every device), or a name accepted by open()
+
+        returns:    - list of device_info (index, name, serial, id, revision, busy)
+    """
+    with __lock__:
+        devices = __enum__()
+    return [candidate for candidate in devices if __match__(candidate, device)]
+
+"""-----------------------------------------------------------------------"""
+
+def watch(callback=None, interval=1):
+    """
+        refresh the device list in a background thread, open() uses this list instead of enumerating every time
+
+        parameters: - function called with the lists of the arrived and the removed devices (device_info), default is None
+                    - time between two enumerations in seconds, default is 1s
+    """
+    global __watcher__
+    unwatch()
+    with __lock__:
+        known = {candidate.serial: candidate for candidate in __enum__()}
+    stop = threading.Event()
+
+    def run(known):
+        while not stop.wait(interval):
+            try:
+                with __lock__:
+                    current = {candidate.serial: candidate for candidate in __enum__()}
+            except error:
+                continue    # try again later
+            arrived = [candidate for serial, candidate in current.items() if serial not in known]
+            removed = [candidate for serial, candidate in known.items() if serial not in current]
+            known = current
+            if callback is not None and (len(arrived) > 0 or len(removed) > 0):
+                callback(arrived, removed)
+        return
+
+    thread = threading.Thread(target=run, args=(known,), name="WF_SDK device watcher", daemon=True)
+    __watcher__ = (thread, stop)
+    thread.start()
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def unwatch():
+    """
+        stop the background enumeration
+    """
+    global __watcher__
+    if __watcher__ is not None:
+        thread, stop = __watcher__
+        __watcher__ = None
+        stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def open(device=None, config=0, cache=None, serial=None, backend=None):
+    """
+        open a specific device
+
+        parameters: - device type: None (first device), "Analog Discovery", "Analog Discovery 2", "Analog Discovery Studio", "Digital Discovery", "Analog Discovery Pro 3X50", "Analog Discovery Pro 5250"
+                    - configuration: 0 = auto, default = auto
+                    - capability cache: None/False = disabled (default), True = default folder (~/.cache/WF_SDK), or the path of a folder
+                    - serial number: None (any device), or the serial number of the device, like "210321ABCDEF"
+                    - backend: None (WF_SDK_BACKEND environment variable, or "libdwf"), "libdwf" (WaveForms runtime) or "simulator"
+
+        returns:    - device data
+    """
+    global __snapshot__
+    with __lock__:
+        # switch between the WaveForms runtime and the simulator
+        if backend is not None and backend != library.backend:
+            if len(__sessions__) > 0:
+                raise error("Close every device before switching to the " + backend + " backend", "open", "device")
+            library.load(backend)
+            __snapshot__ = []
+
+        # use the list of the watcher, enumerate only if there is no watcher, or the list is out of date
+        for refresh in ([False, True] if __watcher__ is not None else [True]):
+            devices = __enum__() if refresh else __snapshot__
+            devices = [candidate for candidate in devices if __match__(candidate, device) and (serial is None or candidate.serial == serial)]
+
+            # this is the device handle - it will be used by all functions to "address" the connected device
+            device_handle = ctypes.c_int(0)
+
+            # connect to the first available device
+            for candidate in devices:
+                if candidate.busy:
+                    continue
+                dwf.FDwfDeviceConfigOpen(candidate.index, config, ctypes.byref(device_handle))
+                if device_handle.value != 0:
+                    candidate.busy = True
+                    break
+            if device_handle.value != 0:
                 break
 
-    # check for errors
-    # if the device handle is empty after a connection attempt
-    if device_handle == constants.hdwfNone:
+        # check for connected devices
+        if len(devices) == 0:
+            if serial is not None:
+                raise error("There is no device with the serial number " + serial + " connected", "open", "device")
+            elif device is None:
+                raise error("There are no connected devices", "open", "device")
+            else:
+                raise error("Error: There is no " + device + " connected", "open", "device")
+
         # check for errors
-        err_nr = ctypes.c_int() # variable for error number
-        dwf.FDwfGetLastError(ctypes.byref(err_nr));  # get error number
-        # if there is an error
-        if err_nr != constants.dwfercNoErc:
+        # if the device handle is empty after a connection attempt
+        if device_handle.value == constants.hdwfNone.value:
             # check the error message
             check_error()
-
-    global data
-    data.handle = device_handle
-    data.name = device_name
-    data = __get_info__(data)
-    return data
+            if serial is not None:
+                raise error("The device with the serial number " + serial + " is busy", "open", "device")
+            raise error("All connected devices are busy", "open", "device")
+
+        # check connected device type
+        device_name = candidate.name
+        device_serial = candidate.serial
+
+    # every device gets its own data record
+    device_data = data()
+    device_data.handle = device_handle
+    device_data.name = device_name
+    device_data.serial = device_serial
+
+    # load the device information from the cache, or enumerate it
+    if cache:
+        if cache == True:
+            cache = path.join(path.expanduser("~"), ".cache", "WF_SDK")
+        version = ctypes.create_string_buffer(16)
+        dwf.FDwfGetVersion(version)
+        device_data.version = str(version.value)[2:-1]
+        cache_file = path.join(cache, "{}_{}_{}_{}.json".format(candidate.id, candidate.revision, device_serial, device_data.version))
+        try:
+            device_data = __load_info__(device_data, cache_file)
+        except (OSError, ValueError, KeyError):
+            # no cache entry (or a broken one): enumerate, then save the results
+            device_data = __get_info__(device_data)
+            try:
+                makedirs(cache, exist_ok=True)
+                __save_info__(device_data, cache_file, candidate.id, candidate.revision)
+            except OSError:
+                pass
+    else:
+        device_data = __get_info__(device_data)
+    __index_nodes__(device_data)
+
+    with __lock__:
+        __sessions__.append(device_data)
+    return device_data
 
 """-----------------------------------------------------------------------"""
 
@@ -217,8 +353,9 @@ def check_error():
     dwf.FDwfGetLastErrorMsg(err_msg)                  # get the error message
     err_msg = err_msg.value.decode("ascii")           # format the message
     if err_msg != "":
-        err_func = inspect.stack()[1].function        # get caller function
-        err_inst = inspect.stack()[1].filename        # get caller file name
+        caller = sys._getframe(1).f_code              # get caller function data
+        err_func = caller.co_name                     # get caller function
+        err_inst = caller.co_filename                 # get caller file name
         # delete the extension
         err_inst = err_inst.split('.')[0]
         # delete the path
@@ -233,12 +370,23 @@ def check_error():
 
 def close(device_data):
     """
-        close a specific device
+        close a specific device, or every device opened by this process (device_data = device.data)
     """
-    if device_data.handle != 0:
+    if device_data is data:
+        for session in list(__sessions__):
+            close(session)
+        return
+    if device_data.handle.value != 0:
         dwf.FDwfDeviceClose(device_data.handle)
-    data.handle = ctypes.c_int(0)
-    data.name = ""
+    device_data.handle = ctypes.c_int(0)
+    device_data.name = ""
+    with __lock__:
+        if device_data in __sessions__:
+            __sessions__.remove(device_data)
+        # the device can be opened again
+        for candidate in __snapshot__:
+            if candidate.serial == device_data.serial:
+                candidate.busy = False
     return
 
 """-----------------------------------------------------------------------"""
@@ -247,42 +395,118 @@ def temperature(device_data):
     """
         return the board temperature
     """
-    channel = -1
-    node = -1
-    # find the system monitor
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "System":
-            channel = channel_index
-            break
-    if channel < 0:
-        return 0
-    
-    # find the temperature node
-    for node_index in range(device_data.analog.IO.node_count[channel]):
-        if device_data.analog.IO.node_name[channel][node_index] == "Temp":
-            node = node_index
-            break
-    if node < 0:
-        return 0
+    # find the temperature node of the system monitor
+    sensor = find_node(device_data, ["System", "USB"], "Temp")
     
     # read the temperature
-    if dwf.FDwfAnalogIOStatus(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfAnalogIOStatus(device_data.handle)
     temperature = ctypes.c_double()
-    if dwf.FDwfAnalogIOChannelNodeStatus(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.byref(temperature)) == 0:
-        check_error()
+    dwf.FDwfAnalogIOChannelNodeStatus(device_data.handle, sensor.channel, sensor.index, ctypes.byref(temperature))
     return temperature.value
 
 """-----------------------------------------------------------------------"""
 
+def find_node(device_data, channel_label, node_name, required=True):
+    """
+        find an analog IO node by name
+
+        parameters: - device data
+                    - channel label, like "V+", or a list of labels, the first one present on the device is used
+                    - node name, like "Voltage"
+                    - raise an error if the device doesn't have the node, False returns None instead
+                      (for the optional nodes), default is True
+
+        returns:    - node (channel and node index, unit, set/read ranges and steps), or None
+    """
+    labels = [channel_label] if isinstance(channel_label, str) else channel_label
+    IO = device_data.analog.IO
+    for label in labels:
+        if label in IO.__channels__:
+            try:
+                return IO.__nodes__[(label, node_name)]
+            except KeyError:
+                if not required:
+                    return None
+                nodes = ", ".join(IO.node_name[IO.__channels__[label]])
+                raise error("There is no \"" + node_name + "\" node on the \"" + label + "\" channel (nodes: " + nodes + ")", "find_node", "device")
+    if not required:
+        return None
+    channels = ", ".join(IO.channel_label)
+    raise error("There is no \"" + "\"/\"".join(labels) + "\" channel on the " + device_data.name + " (channels: " + channels + ")", "find_node", "device")
+
+"""-----------------------------------------------------------------------"""
+
+def __index_nodes__(device_data):
+    """
+        index the analog IO nodes by channel label and node name
+    """
+    IO = device_data.analog.IO
+    IO.__channels__ = {}
+    IO.__nodes__ = {}
+    for channel_index in range(IO.channel_count):
+        label = IO.channel_label[channel_index]
+        if label in IO.__channels__:
+            continue    # keep the first channel with a label
+        IO.__channels__[label] = channel_index
+        for node_index in range(IO.node_count[channel_index]):
+            IO.__nodes__.setdefault((label, IO.node_name[channel_index][node_index]), node(device_data, channel_index, node_index))
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __enum__():
+    """
+        enumerate every connected device and store the results (call it with __lock__ held)
+
+        returns:    - list of device_info
+    """
+    global __snapshot__
+    device_count = ctypes.c_int()
+    dwf.FDwfEnum(constants.enumfilterAll, ctypes.byref(device_count))
+    devices = []
+    device_id = ctypes.c_int()
+    device_rev = ctypes.c_int()
+    serial = ctypes.create_string_buffer(32)
+    opened = ctypes.c_int()
+    for index in range(device_count.value):
+        # get the device type
+        dwf.FDwfEnumDeviceType(index, ctypes.byref(device_id), ctypes.byref(device_rev))
+        device_name = ""
+        for pair in __device_names__:
+            if pair[1].value == device_id.value:
+                device_name = pair[0]
+                break
+
+        # get the serial number
+        dwf.FDwfEnumSN(index, serial)
+        device_serial = serial.value.decode("ascii").replace("SN:", "")
+
+        # check if the device is used
+        dwf.FDwfEnumDeviceIsOpened(index, ctypes.byref(opened))
+        devices.append(device_info(index, device_name, device_serial, device_id.value, device_rev.value, opened.value != 0))
+    __snapshot__ = devices
+    return devices
+
+"""-----------------------------------------------------------------------"""
+
+def __match__(candidate, device):
+    """
+        check the type of an enumerated device (None and unknown names match every device)
+    """
+    for pair in __device_names__:
+        if pair[0] == device:
+            return pair[1].value == candidate.id
+    return True
+
+"""-----------------------------------------------------------------------"""
+
 def __get_info__(device_data):
     """
         get and return device information
     """
     # check WaveForms version
     version = ctypes.create_string_buffer(16)
-    if dwf.FDwfGetVersion(version) == 0:
-        check_error()
+    dwf.FDwfGetVersion(version)
     device_data.version = str(version.value)[2:-1]
 
     # define temporal variables
@@ -292,43 +516,38 @@ def __get_info__(device_data):
 
     # analog input information
     # channel count
-    if dwf.FDwfAnalogInChannelCount(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfAnalogInChannelCount(device_data.handle, ctypes.byref(temp1))
     device_data.analog.input.channel_count = temp1.value
     # buffer size
-    if dwf.FDwfAnalogInBufferSizeInfo(device_data.handle, 0, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfAnalogInBufferSizeInfo(device_data.handle, None, ctypes.byref(temp1))
     device_data.analog.input.max_buffer_size = temp1.value
     # ADC resolution
-    if dwf.FDwfAnalogInBitsInfo(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfAnalogInBitsInfo(device_data.handle, ctypes.byref(temp1))
     device_data.analog.input.max_resolution = temp1.value
     # range information
     temp1 = ctypes.c_double()
     temp2 = ctypes.c_double()
     temp3 = ctypes.c_double()
-    if dwf.FDwfAnalogInChannelRangeInfo(device_data.handle, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
-        check_error()
+    dwf.FDwfAnalogInChannelRangeInfo(device_data.handle, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3))
     device_data.analog.input.min_range = temp1.value
     device_data.analog.input.max_range = temp2.value
     device_data.analog.input.steps_range = int(temp3.value)
     # offset information
-    if dwf.FDwfAnalogInChannelOffsetInfo(device_data.handle, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
-        check_error()
+    dwf.FDwfAnalogInChannelOffsetInfo(device_data.handle, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3))
     device_data.analog.input.min_offset = temp1.value
     device_data.analog.input.max_offset = temp2.value
     device_data.analog.input.steps_offset = int(temp3.value)
 
     # analog output information
     temp1 = ctypes.c_int()
-    if dwf.FDwfAnalogOutCount(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfAnalogOutCount(device_data.handle, ctypes.byref(temp1))
     device_data.analog.output.channel_count = temp1.value
+    for name in ["node_count", "node_type", "max_buffer_size", "min_amplitude", "max_amplitude", "min_offset", "max_offset", "min_frequency", "max_frequency"]:
+        setattr(device_data.analog.output, name, [])    # drop the results of a previous enumeration
     for channel_index in range(device_data.analog.output.channel_count):
         # check node types and node count
         temp1 = ctypes.c_int()
-        if dwf.FDwfAnalogOutNodeInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.byref(temp1)) == 0:
-            check_error()
+        dwf.FDwfAnalogOutNodeInfo(device_data.handle, channel_index, ctypes.byref(temp1))
         templist = []
         for node_index in range(3):
             if ((1 << node_index) & int(temp1.value)) == 0:
@@ -344,8 +563,7 @@ def __get_info__(device_data):
         # buffer size
         templist = []
         for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeDataInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), 0, ctypes.byref(temp1)) == 0:
-                check_error()
+            dwf.FDwfAnalogOutNodeDataInfo(device_data.handle, channel_index, node_index, None, ctypes.byref(temp1))
             templist.append(temp1.value)
         device_data.analog.output.max_buffer_size.append(templist)
         # amplitude information
@@ -354,8 +572,7 @@ def __get_info__(device_data):
         temp1 = ctypes.c_double()
         temp2 = ctypes.c_double()
         for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeAmplitudeInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
-                check_error()
+            dwf.FDwfAnalogOutNodeAmplitudeInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2))
             templist1.append(temp1.value)
             templist2.append(temp2.value)
         device_data.analog.output.min_amplitude.append(templist1)
@@ -364,8 +581,7 @@ def __get_info__(device_data):
         templist1 = []
         templist2 = []
         for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeOffsetInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
-                check_error()
+            dwf.FDwfAnalogOutNodeOffsetInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2))
             templist1.append(temp1.value)
             templist2.append(temp2.value)
         device_data.analog.output.min_offset.append(templist1)
@@ -374,8 +590,7 @@ def __get_info__(device_data):
         templist1 = []
         templist2 = []
         for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeFrequencyInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
-                check_error()
+            dwf.FDwfAnalogOutNodeFrequencyInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2))
             templist1.append(temp1.value)
             templist2.append(temp2.value)
         device_data.analog.output.min_frequency.append(templist1)
@@ -384,21 +599,20 @@ def __get_info__(device_data):
     # analog IO information
     # channel count
     temp1 = ctypes.c_int()
-    if dwf.FDwfAnalogIOChannelCount(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfAnalogIOChannelCount(device_data.handle, ctypes.byref(temp1))
     device_data.analog.IO.channel_count = temp1.value
+    for name in ["node_count", "channel_name", "channel_label", "node_name", "node_unit", "min_set_range", "max_set_range", "min_read_range", "max_read_range", "set_steps", "read_steps"]:
+        setattr(device_data.analog.IO, name, [])    # drop the results of a previous enumeration
     for channel_index in range(device_data.analog.IO.channel_count):
         # channel names and labels
         temp1 = ctypes.create_string_buffer(256)
         temp2 = ctypes.create_string_buffer(256)
-        if dwf.FDwfAnalogIOChannelName(device_data.handle, ctypes.c_int(channel_index), temp1, temp2) == 0:
-            check_error()
+        dwf.FDwfAnalogIOChannelName(device_data.handle, channel_index, temp1, temp2)
         device_data.analog.IO.channel_name.append(str(temp1.value)[2:-1])
         device_data.analog.IO.channel_label.append(str(temp2.value)[2:-1])
         # check node count
         temp1 = ctypes.c_int()
-        if dwf.FDwfAnalogIOChannelInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.byref(temp1)) == 0:
-            check_error()
+        dwf.FDwfAnalogIOChannelInfo(device_data.handle, channel_index, ctypes.byref(temp1))
         device_data.analog.IO.node_count.append(temp1.value)
         # node names and units
         templist1 = []
@@ -406,8 +620,7 @@ def __get_info__(device_data):
         for node_index in range(device_data.analog.IO.node_count[channel_index]):
             temp1 = ctypes.create_string_buffer(256)
             temp2 = ctypes.create_string_buffer(256)
-            if dwf.FDwfAnalogIOChannelNodeName(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), temp1, temp2) == 0:
-                check_error()
+            dwf.FDwfAnalogIOChannelNodeName(device_data.handle, channel_index, node_index, temp1, temp2)
             templist1.append(str(temp1.value)[2:-1])
             templist2.append(str(temp2.value)[2:-1])
         device_data.analog.IO.node_name.append(templist1)
@@ -420,8 +633,7 @@ def __get_info__(device_data):
         temp2 = ctypes.c_double()
         temp3 = ctypes.c_int()
         for node_index in range(device_data.analog.IO.node_count[channel_index]):
-            if dwf.FDwfAnalogIOChannelNodeSetInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
-                check_error()
+            dwf.FDwfAnalogIOChannelNodeSetInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3))
             templist1.append(temp1.value)
             templist2.append(temp2.value)
             templist3.append(temp3.value)
@@ -433,8 +645,7 @@ def __get_info__(device_data):
         templist2 = []
         templist3 = []
         for node_index in range(device_data.analog.IO.node_count[channel_index]):
-            if dwf.FDwfAnalogIOChannelNodeStatusInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
-                check_error()
+            dwf.FDwfAnalogIOChannelNodeStatusInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3))
             templist1.append(temp1.value)
             templist2.append(temp2.value)
             templist3.append(temp3.value)
@@ -445,22 +656,60 @@ def __get_info__(device_data):
     # digital input information
     # channel count
     temp1 = ctypes.c_int()
-    if dwf.FDwfDigitalInBitsInfo(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfDigitalInBitsInfo(device_data.handle, ctypes.byref(temp1))
     device_data.digital.input.channel_count = temp1.value
     # buffer size
-    if dwf.FDwfDigitalInBufferSizeInfo(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfDigitalInBufferSizeInfo(device_data.handle, ctypes.byref(temp1))
     device_data.digital.input.max_buffer_size = temp1.value
 
     # digital output information
     # channel count
-    if dwf.FDwfDigitalOutCount(device_data.handle, ctypes.byref(temp1)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutCount(device_data.handle, ctypes.byref(temp1))
     device_data.digital.output.channel_count = temp1.value
     # buffer size
-    if dwf.FDwfDigitalOutDataInfo(device_data.handle, ctypes.c_int(0), ctypes.byref(temp1)) == 0:
-        check_error()
-    device_data.digital.output.max_buffer_size = temp1.value
+    temp2 = ctypes.c_uint()
+    dwf.FDwfDigitalOutDataInfo(device_data.handle, 0, ctypes.byref(temp2))
+    device_data.digital.output.max_buffer_size = temp2.value
 
     return device_data
+
+"""-----------------------------------------------------------------------"""
+
+def __info_sections__(device_data):
+    """
+        list the parts of the device information as (name, part) pairs
+    """
+    return [("analog.input", device_data.analog.input), ("analog.output", device_data.analog.output), ("analog.IO", device_data.analog.IO),
+            ("digital.input", device_data.digital.input), ("digital.output", device_data.digital.output)]
+
+"""-----------------------------------------------------------------------"""
+
+def __save_info__(device_data, file_name, device_id, device_rev):
+    """
+        save the device information into a JSON file
+    """
+    record = {"id": device_id, "revision": device_rev, "serial": device_data.serial, "version": device_data.version, "name": device_data.name, "info": {}}
+    for name, section in __info_sections__(device_data):
+        record["info"][name] = {key: value for key, value in vars(section).items() if not key.startswith("__")}
+    with io.open(file_name, "wt") as f:
+        json.dump(record, f, indent=1)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __load_info__(device_data, file_name):
+    """
+        load the device information from a JSON file (a cache entry, or a fixture)
+    """
+    with io.open(file_name, "rt") as f:
+        record = json.load(f)
+    for name, section in __info_sections__(device_data):
+        fields = record["info"][name]
+        # every field must be present, otherwise the entry is from an older version
+        for key in [key for key in vars(section) if not key.startswith("__")]:
+            setattr(section, key, fields[key])
+    if device_data.name == "":
+        device_data.name = record["name"]
+    if device_data.version == "":
+        device_data.version = record["version"]
+    return device_data
@@ -1,28 +1,8 @@
 """ DIGITAL MULTIMETER CONTROL FUNCTIONS: open, measure, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+from WF_SDK.library import dwf, constants   # shared library and constants
+from WF_SDK.device import __state__, find_node
 
 """-----------------------------------------------------------------------"""
 
@@ -42,15 +22,13 @@ class mode:
 """-----------------------------------------------------------------------"""
 
 class data:
-    """ storers instrument information """
-    __channel__ = -1
+    """ storers instrument information (every device has its own copy: device_data.dmm) """
     class __nodes__:
-        __enable__ = -1
-        __mode__ = -1
-        __range__ = -1
-        __meas__ = -1
-        __raw__ = -1
-        __input__ = -1
+        __enable__ = None
+        __mode__ = None
+        __range__ = None
+        __meas__ = None
+        __input__ = None
 
 """-----------------------------------------------------------------------"""
 
@@ -58,32 +36,17 @@ def open(device_data):
     """
         initialize the digital multimeter
     """
-    # find channel
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "DMM":
-            data.__channel__ = channel_index
-            break
-    
+    state = __state__(device_data, "dmm", data)
+
     # find nodes
-    if data.__channel__ >= 0:
-        for node_index in range(device_data.analog.IO.node_count[data.__channel__]):
-            if device_data.analog.IO.node_name[data.__channel__][node_index] == "Enable":
-                data.__nodes__.__enable__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Mode":
-                data.__nodes__.__mode__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Range":
-                data.__nodes__.__range__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Meas":
-                data.__nodes__.__meas__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Raw":
-                data.__nodes__.__raw__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Input":
-                data.__nodes__.__input__ = node_index
+    state.__nodes__.__enable__ = find_node(device_data, "DMM", "Enable")
+    state.__nodes__.__mode__ = find_node(device_data, "DMM", "Mode")
+    state.__nodes__.__range__ = find_node(device_data, "DMM", "Range")
+    state.__nodes__.__meas__ = find_node(device_data, "DMM", "Meas")
+    state.__nodes__.__input__ = find_node(device_data, "DMM", "Input", required=False)
 
     # enable the DMM
-    if data.__channel__ >= 0 and data.__nodes__.__enable__ >= 0:
-        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__enable__), ctypes.c_double(1.0)) == 0:
-            check_error()
+    __set_node__(device_data, state.__nodes__.__enable__, 1)
     return
 
 """-----------------------------------------------------------------------"""
@@ -99,38 +62,28 @@ def measure(device_data, mode, range=0, high_impedance=False):
         
         returns:    - the measured value in V/A/Ω/°C, or None on error
     """
-    if data.__channel__ >= 0:
+    state = __state__(device_data, "dmm", data)
+    if state.__nodes__.__meas__ is not None:
         # set input impedance
-        if data.__nodes__.__input__ >= 0:
+        if state.__nodes__.__input__ is not None:
             if high_impedance:
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__input__), ctypes.c_double(1)) == 0:
-                    check_error()
+                __set_node__(device_data, state.__nodes__.__input__, 1)
             else:
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__input__), ctypes.c_double(0)) == 0:
-                    check_error()
+                __set_node__(device_data, state.__nodes__.__input__, 0)
 
         # set mode
-        if data.__nodes__.__mode__ >= 0:
-            if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__mode__), mode) == 0:
-                check_error()
+        __set_node__(device_data, state.__nodes__.__mode__, mode)
 
         # set range
-        if data.__nodes__.__range__ >= 0:
-            if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__range__), range) == 0:
-                check_error()
+        __set_node__(device_data, state.__nodes__.__range__, range)
 
         # fetch analog IO status
-        if dwf.FDwfAnalogIOStatus(device_data.handle) == 0:
-            # signal error
-            check_error()
-            return None
+        dwf.FDwfAnalogIOStatus(device_data.handle)
         
         # get reading
-        if data.__nodes__.__meas__ >= 0:
-            measurement = ctypes.c_double()
-            if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__meas__), ctypes.byref(measurement)) == 0:
-                check_error()
-            return measurement.value
+        measurement = ctypes.c_double()
+        dwf.FDwfAnalogIOChannelNodeStatus(device_data.handle, state.__nodes__.__meas__.channel, state.__nodes__.__meas__.index, ctypes.byref(measurement))
+        return measurement.value
     return None
 
 """-----------------------------------------------------------------------"""
@@ -139,11 +92,20 @@ def close(device_data):
     """
         reset the instrument
     """
+    state = __state__(device_data, "dmm", data)
+
     # disable the DMM
-    if data.__channel__ >= 0 and data.__nodes__.__enable__ >= 0:
-        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__enable__), ctypes.c_double(0)) == 0:
-            check_error()
+    if state.__nodes__.__enable__ is not None:
+        __set_node__(device_data, state.__nodes__.__enable__, 0)
     # reset the instrument
-    if dwf.FDwfAnalogIOReset(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfAnalogIOReset(device_data.handle)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __set_node__(device_data, node, value):
+    """
+        set the value of a DMM node
+    """
+    dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, node.channel, node.index, value)
     return
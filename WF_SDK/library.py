@@ -0,0 +1,469 @@
+""" LIBRARY LOADER AND CALL LAYER: dwf, constants, error, warning, load, backend, wrap, shadow, invalidate """
+
+import ctypes                     # import the C compatible data types
+from sys import platform, path    # this is needed to check the OS type and get the PATH
+from os import sep, environ       # OS specific file path separators and the backend selection
+
+# get the library and constants paths (the paths are OS specific)
+if platform.startswith("win"):
+    # on Windows
+    lib_path = "dwf"
+    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
+elif platform.startswith("darwin"):
+    # on macOS
+    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
+    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
+else:
+    # on Linux
+    lib_path = "libdwf.so"
+    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
+
+# import constants (only once, for every instrument)
+if constants_path not in path:
+    path.append(constants_path)
+try:
+    import dwfconstants as constants
+except ImportError:
+    # the WaveForms runtime isn't installed: use the copy of the simulator
+    from WF_SDK.simulator import dwfconstants as constants
+
+"""-----------------------------------------------------------------------"""
+
+class error(Exception):
+    """
+        WaveForms SDK error
+    """
+    def __init__(self, message, function, instrument):
+        self.message = message
+        self.function = function
+        self.instrument = instrument
+        return
+    def __str__(self):
+        return "Error: " + self.instrument + " -> " + self.function + " -> " + self.message
+
+class warning(Exception):
+    """
+        WaveForms SDK warning, or non-fatal error
+    """
+    def __init__(self, message, function, instrument):
+        self.message = message
+        self.function = function
+        self.instrument = instrument
+        return
+    def __str__(self):
+        return "Warning: " + self.instrument + " -> " + self.function + " -> " + self.message
+
+"""-----------------------------------------------------------------------"""
+
+# C types used in the SDK header
+HDWF = ctypes.c_int
+BOOL = ctypes.c_int
+UINT = ctypes.c_uint
+DOUBLE = ctypes.c_double
+BYTE = ctypes.c_ubyte      # DwfState, TRIGSRC and FUNC
+STRING = ctypes.c_char_p   # character buffers (ctypes.create_string_buffer)
+VOID_P = ctypes.c_void_p   # untyped data buffers
+INT_P = ctypes.POINTER(ctypes.c_int)
+UINT_P = ctypes.POINTER(ctypes.c_uint)
+DOUBLE_P = ctypes.POINTER(ctypes.c_double)
+SHORT_P = ctypes.POINTER(ctypes.c_short)
+BYTE_P = ctypes.POINTER(ctypes.c_ubyte)
+
+# argument types of every FDwf function used by the package (every function returns a BOOL)
+prototypes = {
+    # device
+    "FDwfGetLastError": [INT_P],
+    "FDwfGetLastErrorMsg": [STRING],
+    "FDwfGetVersion": [STRING],
+    "FDwfEnum": [ctypes.c_int, INT_P],
+    "FDwfEnumDeviceType": [ctypes.c_int, INT_P, INT_P],
+    "FDwfEnumSN": [ctypes.c_int, STRING],
+    "FDwfEnumDeviceIsOpened": [ctypes.c_int, INT_P],
+    "FDwfDeviceConfigOpen": [ctypes.c_int, ctypes.c_int, INT_P],
+    "FDwfDeviceClose": [HDWF],
+    # oscilloscope
+    "FDwfAnalogInReset": [HDWF],
+    "FDwfAnalogInConfigure": [HDWF, BOOL, BOOL],
+    "FDwfAnalogInStatus": [HDWF, BOOL, BYTE_P],
+    "FDwfAnalogInStatusData": [HDWF, ctypes.c_int, DOUBLE_P, ctypes.c_int],
+    "FDwfAnalogInStatusData16": [HDWF, ctypes.c_int, SHORT_P, ctypes.c_int, ctypes.c_int],
+    "FDwfAnalogInStatusSample": [HDWF, ctypes.c_int, DOUBLE_P],
+    "FDwfAnalogInStatusRecord": [HDWF, INT_P, INT_P, INT_P],
+    "FDwfAnalogInStatusTime": [HDWF, UINT_P, UINT_P, UINT_P],
+    "FDwfAnalogInChannelCount": [HDWF, INT_P],
+    "FDwfAnalogInBufferSizeInfo": [HDWF, INT_P, INT_P],
+    "FDwfAnalogInBitsInfo": [HDWF, INT_P],
+    "FDwfAnalogInChannelRangeInfo": [HDWF, DOUBLE_P, DOUBLE_P, DOUBLE_P],
+    "FDwfAnalogInChannelOffsetInfo": [HDWF, DOUBLE_P, DOUBLE_P, DOUBLE_P],
+    "FDwfAnalogInChannelEnableSet": [HDWF, ctypes.c_int, BOOL],
+    "FDwfAnalogInChannelOffsetSet": [HDWF, ctypes.c_int, DOUBLE],
+    "FDwfAnalogInChannelRangeSet": [HDWF, ctypes.c_int, DOUBLE],
+    "FDwfAnalogInChannelRangeGet": [HDWF, ctypes.c_int, DOUBLE_P],
+    "FDwfAnalogInChannelOffsetGet": [HDWF, ctypes.c_int, DOUBLE_P],
+    "FDwfAnalogInChannelFilterSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    "FDwfAnalogInBufferSizeSet": [HDWF, ctypes.c_int],
+    "FDwfAnalogInFrequencySet": [HDWF, DOUBLE],
+    "FDwfAnalogInFrequencyGet": [HDWF, DOUBLE_P],
+    "FDwfAnalogInAcquisitionModeSet": [HDWF, ctypes.c_int],
+    "FDwfAnalogInRecordLengthSet": [HDWF, DOUBLE],
+    "FDwfAnalogInTriggerAutoTimeoutSet": [HDWF, DOUBLE],
+    "FDwfAnalogInTriggerSourceSet": [HDWF, BYTE],
+    "FDwfAnalogInTriggerChannelSet": [HDWF, ctypes.c_int],
+    "FDwfAnalogInTriggerTypeSet": [HDWF, ctypes.c_int],
+    "FDwfAnalogInTriggerLevelSet": [HDWF, DOUBLE],
+    "FDwfAnalogInTriggerConditionSet": [HDWF, ctypes.c_int],
+    # waveform generator
+    "FDwfAnalogOutReset": [HDWF, ctypes.c_int],
+    "FDwfAnalogOutConfigure": [HDWF, ctypes.c_int, BOOL],
+    "FDwfAnalogOutCount": [HDWF, INT_P],
+    "FDwfAnalogOutNodeInfo": [HDWF, ctypes.c_int, INT_P],
+    "FDwfAnalogOutNodeDataInfo": [HDWF, ctypes.c_int, ctypes.c_int, INT_P, INT_P],
+    "FDwfAnalogOutNodeAmplitudeInfo": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P, DOUBLE_P],
+    "FDwfAnalogOutNodeOffsetInfo": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P, DOUBLE_P],
+    "FDwfAnalogOutNodeFrequencyInfo": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P, DOUBLE_P],
+    "FDwfAnalogOutNodeEnableSet": [HDWF, ctypes.c_int, ctypes.c_int, BOOL],
+    "FDwfAnalogOutNodeFunctionSet": [HDWF, ctypes.c_int, ctypes.c_int, BYTE],
+    "FDwfAnalogOutNodeDataSet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P, ctypes.c_int],
+    "FDwfAnalogOutNodeFrequencySet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE],
+    "FDwfAnalogOutNodeAmplitudeSet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE],
+    "FDwfAnalogOutNodeOffsetSet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE],
+    "FDwfAnalogOutNodeSymmetrySet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE],
+    "FDwfAnalogOutRunSet": [HDWF, ctypes.c_int, DOUBLE],
+    "FDwfAnalogOutWaitSet": [HDWF, ctypes.c_int, DOUBLE],
+    "FDwfAnalogOutRepeatSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    # analog I/O (supplies, DMM, device information)
+    "FDwfAnalogIOReset": [HDWF],
+    "FDwfAnalogIOEnableSet": [HDWF, BOOL],
+    "FDwfAnalogIOStatus": [HDWF],
+    "FDwfAnalogIOChannelCount": [HDWF, INT_P],
+    "FDwfAnalogIOChannelName": [HDWF, ctypes.c_int, STRING, STRING],
+    "FDwfAnalogIOChannelInfo": [HDWF, ctypes.c_int, INT_P],
+    "FDwfAnalogIOChannelNodeName": [HDWF, ctypes.c_int, ctypes.c_int, STRING, STRING],
+    "FDwfAnalogIOChannelNodeSetInfo": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P, DOUBLE_P, INT_P],
+    "FDwfAnalogIOChannelNodeStatusInfo": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P, DOUBLE_P, INT_P],
+    "FDwfAnalogIOChannelNodeSet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE],
+    "FDwfAnalogIOChannelNodeGet": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P],
+    "FDwfAnalogIOChannelNodeStatus": [HDWF, ctypes.c_int, ctypes.c_int, DOUBLE_P],
+    # static I/O
+    "FDwfDigitalIOReset": [HDWF],
+    "FDwfDigitalIOOutputEnableSet": [HDWF, UINT],
+    "FDwfDigitalIOOutputEnableGet": [HDWF, UINT_P],
+    "FDwfDigitalIOOutputSet": [HDWF, UINT],
+    "FDwfDigitalIOOutputGet": [HDWF, UINT_P],
+    "FDwfDigitalIOStatus": [HDWF],
+    "FDwfDigitalIOInputStatus": [HDWF, UINT_P],
+    # logic analyzer
+    "FDwfDigitalInReset": [HDWF],
+    "FDwfDigitalInConfigure": [HDWF, BOOL, BOOL],
+    "FDwfDigitalInStatus": [HDWF, BOOL, BYTE_P],
+    "FDwfDigitalInStatusData": [HDWF, VOID_P, ctypes.c_int],
+    "FDwfDigitalInStatusRecord": [HDWF, INT_P, INT_P, INT_P],
+    "FDwfDigitalInInternalClockInfo": [HDWF, DOUBLE_P],
+    "FDwfDigitalInAcquisitionModeSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalInDividerSet": [HDWF, UINT],
+    "FDwfDigitalInDividerGet": [HDWF, UINT_P],
+    "FDwfDigitalInSampleFormatSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalInBitsInfo": [HDWF, INT_P],
+    "FDwfDigitalInBufferSizeInfo": [HDWF, INT_P],
+    "FDwfDigitalInBufferSizeSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalInTriggerSourceSet": [HDWF, BYTE],
+    "FDwfDigitalInTriggerPositionSet": [HDWF, UINT],
+    "FDwfDigitalInTriggerPrefillSet": [HDWF, UINT],
+    "FDwfDigitalInTriggerSet": [HDWF, UINT, UINT, UINT, UINT],
+    "FDwfDigitalInTriggerResetSet": [HDWF, UINT, UINT, UINT, UINT],
+    "FDwfDigitalInTriggerAutoTimeoutSet": [HDWF, DOUBLE],
+    "FDwfDigitalInTriggerLengthSet": [HDWF, DOUBLE, DOUBLE, ctypes.c_int],
+    "FDwfDigitalInTriggerCountSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    # pattern generator
+    "FDwfDigitalOutReset": [HDWF],
+    "FDwfDigitalOutConfigure": [HDWF, BOOL],
+    "FDwfDigitalOutCount": [HDWF, INT_P],
+    "FDwfDigitalOutDataInfo": [HDWF, ctypes.c_int, UINT_P],
+    "FDwfDigitalOutInternalClockInfo": [HDWF, DOUBLE_P],
+    "FDwfDigitalOutCounterInfo": [HDWF, ctypes.c_int, UINT_P, UINT_P],
+    "FDwfDigitalOutEnableSet": [HDWF, ctypes.c_int, BOOL],
+    "FDwfDigitalOutTypeSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    "FDwfDigitalOutDividerSet": [HDWF, ctypes.c_int, UINT],
+    "FDwfDigitalOutIdleSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    "FDwfDigitalOutCounterSet": [HDWF, ctypes.c_int, UINT, UINT],
+    "FDwfDigitalOutDataSet": [HDWF, ctypes.c_int, VOID_P, UINT],
+    "FDwfDigitalOutWaitSet": [HDWF, DOUBLE],
+    "FDwfDigitalOutRepeatSet": [HDWF, UINT],
+    "FDwfDigitalOutRunSet": [HDWF, DOUBLE],
+    "FDwfDigitalOutRepeatTriggerSet": [HDWF, BOOL],
+    "FDwfDigitalOutTriggerSourceSet": [HDWF, BYTE],
+    "FDwfDigitalOutTriggerSlopeSet": [HDWF, ctypes.c_int],
+    # I2C
+    "FDwfDigitalI2cReset": [HDWF],
+    "FDwfDigitalI2cClear": [HDWF, INT_P],
+    "FDwfDigitalI2cStretchSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalI2cRateSet": [HDWF, DOUBLE],
+    "FDwfDigitalI2cSclSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalI2cSdaSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalI2cWrite": [HDWF, ctypes.c_int, BYTE_P, ctypes.c_int, INT_P],
+    "FDwfDigitalI2cRead": [HDWF, ctypes.c_int, BYTE_P, ctypes.c_int, INT_P],
+    "FDwfDigitalI2cWriteRead": [HDWF, ctypes.c_int, BYTE_P, ctypes.c_int, BYTE_P, ctypes.c_int, INT_P],
+    "FDwfDigitalI2cSpyStart": [HDWF],
+    "FDwfDigitalI2cSpyStatus": [HDWF, INT_P, INT_P, BYTE_P, INT_P, INT_P],
+    # SPI
+    "FDwfDigitalSpiReset": [HDWF],
+    "FDwfDigitalSpiFrequencySet": [HDWF, DOUBLE],
+    "FDwfDigitalSpiClockSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalSpiDataSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    "FDwfDigitalSpiIdleSet": [HDWF, ctypes.c_int, ctypes.c_int],
+    "FDwfDigitalSpiModeSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalSpiOrderSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalSpiSelect": [HDWF, ctypes.c_int, ctypes.c_int],
+    "FDwfDigitalSpiWriteOne": [HDWF, ctypes.c_int, ctypes.c_int, UINT],
+    "FDwfDigitalSpiRead": [HDWF, ctypes.c_int, ctypes.c_int, BYTE_P, ctypes.c_int],
+    "FDwfDigitalSpiWrite": [HDWF, ctypes.c_int, ctypes.c_int, BYTE_P, ctypes.c_int],
+    "FDwfDigitalSpiWriteRead": [HDWF, ctypes.c_int, ctypes.c_int, BYTE_P, ctypes.c_int, BYTE_P, ctypes.c_int],
+    # UART
+    "FDwfDigitalUartReset": [HDWF],
+    "FDwfDigitalUartRateSet": [HDWF, DOUBLE],
+    "FDwfDigitalUartBitsSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalUartParitySet": [HDWF, ctypes.c_int],
+    "FDwfDigitalUartStopSet": [HDWF, DOUBLE],
+    "FDwfDigitalUartTxSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalUartRxSet": [HDWF, ctypes.c_int],
+    "FDwfDigitalUartTx": [HDWF, STRING, ctypes.c_int],
+    "FDwfDigitalUartRx": [HDWF, STRING, ctypes.c_int, INT_P, INT_P],
+    # tools
+    "FDwfSpectrumWindow": [DOUBLE_P, ctypes.c_int, ctypes.c_int, DOUBLE, DOUBLE_P],
+    "FDwfSpectrumTransform": [DOUBLE_P, ctypes.c_int, DOUBLE_P, DOUBLE_P, ctypes.c_int, DOUBLE, DOUBLE]
+}
+
+# the return value of these functions is checked by the caller (a failure is expected)
+unchecked = ["FDwfGetLastError", "FDwfGetLastErrorMsg", "FDwfDeviceConfigOpen"]
+
+# the setters skipped when they would write the values written last (shadow register cache),
+# with the number of index arguments after the device handle (the channel and node indices), the rest are the values
+shadowed = {
+    # oscilloscope
+    "FDwfAnalogInChannelEnableSet": 1, "FDwfAnalogInChannelOffsetSet": 1, "FDwfAnalogInChannelRangeSet": 1, "FDwfAnalogInChannelFilterSet": 1,
+    "FDwfAnalogInBufferSizeSet": 0, "FDwfAnalogInFrequencySet": 0, "FDwfAnalogInAcquisitionModeSet": 0, "FDwfAnalogInRecordLengthSet": 0,
+    "FDwfAnalogInTriggerAutoTimeoutSet": 0, "FDwfAnalogInTriggerSourceSet": 0, "FDwfAnalogInTriggerChannelSet": 0,
+    "FDwfAnalogInTriggerTypeSet": 0, "FDwfAnalogInTriggerLevelSet": 0, "FDwfAnalogInTriggerConditionSet": 0,
+    # waveform generator
+    "FDwfAnalogOutNodeEnableSet": 2, "FDwfAnalogOutNodeFunctionSet": 2, "FDwfAnalogOutNodeFrequencySet": 2, "FDwfAnalogOutNodeAmplitudeSet": 2,
+    "FDwfAnalogOutNodeOffsetSet": 2, "FDwfAnalogOutNodeSymmetrySet": 2, "FDwfAnalogOutRunSet": 1, "FDwfAnalogOutWaitSet": 1, "FDwfAnalogOutRepeatSet": 1,
+    # power supplies
+    "FDwfAnalogIOEnableSet": 0, "FDwfAnalogIOChannelNodeSet": 2,
+    # pattern generator
+    "FDwfDigitalOutEnableSet": 1, "FDwfDigitalOutTypeSet": 1, "FDwfDigitalOutDividerSet": 1, "FDwfDigitalOutIdleSet": 1, "FDwfDigitalOutCounterSet": 1,
+    "FDwfDigitalOutWaitSet": 0, "FDwfDigitalOutRepeatSet": 0, "FDwfDigitalOutRunSet": 0, "FDwfDigitalOutRepeatTriggerSet": 0,
+    "FDwfDigitalOutTriggerSourceSet": 0, "FDwfDigitalOutTriggerSlopeSet": 0
+}
+
+# instrument names used in error messages, by function name prefix
+instruments = [("FDwfAnalogIn", "scope"), ("FDwfAnalogOut", "wavegen"), ("FDwfAnalogIO", "analog IO"),
+               ("FDwfDigitalIO", "static"), ("FDwfDigitalIn", "logic"), ("FDwfDigitalOut", "pattern"),
+               ("FDwfDigitalI2c", "protocol/i2c"), ("FDwfDigitalSpi", "protocol/spi"), ("FDwfDigitalUart", "protocol/uart"),
+               ("FDwfSpectrum", "tools"), ("FDwf", "device")]
+
+"""-----------------------------------------------------------------------"""
+
+def instrument(function_name):
+    """
+        get the instrument name of an FDwf function
+    """
+    for prefix, name in instruments:
+        if function_name.startswith(prefix):
+            return name
+    return "device"
+
+"""-----------------------------------------------------------------------"""
+
+def __errcheck__(result, function, arguments):
+    """
+        raise an error if an FDwf function fails (called by ctypes after every call)
+    """
+    if result == 0:
+        # the state of the device is unknown after an error
+        invalidate(__handle_of__(function.__name__, arguments))
+        message = ctypes.create_string_buffer(512)
+        dwf.FDwfGetLastErrorMsg(message)
+        raise error(message.value.decode("ascii").strip(), function.__name__, instrument(function.__name__))
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+class __library__:
+    """
+        stand-in for the dynamic library: the library is loaded on the first
+        FDwf call and every function is cached on this object after its first lookup
+
+        the functions in the prototype table convert their arguments and raise an error on failure
+    """
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        function = getattr(load(), name)
+        if name in prototypes:
+            function.argtypes = prototypes[name]
+            function.restype = BOOL
+            if name not in unchecked:
+                function.errcheck = __errcheck__
+        if __wrapper__ is not None:
+            function = __wrapper__(name, function)
+        if shadowing:
+            if name in shadowed:
+                function = __shadowed__(name, function, shadowed[name])
+            elif name.endswith("Reset") or name in ["FDwfDeviceClose", "FDwfDeviceConfigOpen"]:
+                function = __resetting__(name, function)
+            elif name.startswith(("FDwfDigitalI2c", "FDwfDigitalSpi", "FDwfDigitalUart")):
+                # the protocol engines drive the DIO lines with the pattern generator
+                function = __resetting__(name, function, "FDwfDigitalOut")
+        setattr(self, name, function)   # the next lookup won't reach __getattr__
+        return function
+
+dwf = __library__()
+
+"""-----------------------------------------------------------------------"""
+
+# applied to every function on lookup, like the call tracer: wrapper(name, function) returns the new function
+__wrapper__ = None
+
+# called with the function name and the arguments of every setter call skipped by the shadow register cache
+__skipped__ = None
+
+def wrap(wrapper, skipped=None):
+    """
+        wrap every FDwf function, or remove the wrapper
+
+        parameters: - wrapper(name, function), returns the function to call instead, None removes the wrapper
+                    - skipped(name, arguments), called instead of the wrapped function when the shadow register cache
+                      skips a call (these calls don't reach the wrapper), default is None
+    """
+    global __wrapper__, __skipped__
+    __wrapper__ = wrapper
+    __skipped__ = skipped
+    vars(dwf).clear()   # every function is looked up (and wrapped) again on its next call
+    return
+
+"""-----------------------------------------------------------------------"""
+
+# skip the setters which wouldn't change anything (off by default, set WF_SDK_SHADOW=1 or call shadow(True) to turn it on)
+shadowing = environ.get("WF_SDK_SHADOW", "0") != "0"
+
+# the values written last, by device handle: {(function name, indices): values}
+__registers__ = {}
+
+def shadow(enable):
+    """
+        turn the shadow register cache on or off
+
+        parameters: - True skips the setter calls repeating the values written last, False sends every call
+
+        the cache is off by default: it only knows the values written by this process, so the changes made by the
+        device itself (like a supply turned off by the overcurrent protection) or by other programs aren't noticed
+    """
+    global shadowing
+    shadowing = enable
+    __registers__.clear()
+    vars(dwf).clear()   # every function is looked up (and wrapped) again on its next call
+    return
+
+def invalidate(device=None):
+    """
+        forget the values written to a device, the next setter calls are sent again (like after changing the
+        settings from another program); resets, closing the device and errors do this automatically
+
+        parameters: - device data or device handle, default is None (every device)
+    """
+    if device is None:
+        __registers__.clear()
+    else:
+        handle = getattr(device, "handle", device)
+        __registers__.pop(getattr(handle, "value", handle), None)
+    return
+
+def __shadowed__(name, function, indices):
+    """
+        skip a setter call if it would write the values written last
+    """
+    def setter(*arguments):
+        handle = getattr(arguments[0], "value", arguments[0])
+        key = (name,) + tuple(getattr(argument, "value", argument) for argument in arguments[1:1 + indices])
+        values = tuple(getattr(argument, "value", argument) for argument in arguments[1 + indices:])
+        registers = __registers__.setdefault(handle, {})
+        if registers.get(key) == values:
+            if __skipped__ is not None:
+                __skipped__(name, arguments)
+            return 1
+        result = function(*arguments)
+        if indices > 0:
+            # a write to every channel (index -1) replaces the writes to single channels, and the other way around
+            every = -1 in key[1:]
+            for other in [other for other in registers if other[0] == name and (every or -1 in other[1:])]:
+                del registers[other]
+        registers[key] = values
+        return result
+    setter.__name__ = name
+    return setter
+
+def __resetting__(name, function, prefix=None):
+    """
+        forget the values written to an instrument when it is reset, or to a device when it is opened or closed,
+        or the values of the functions with the given prefix after every call
+    """
+    if prefix is None:
+        prefix = name[:-len("Reset")] if name.endswith("Reset") else "FDwf"
+    def reset(*arguments):
+        try:
+            return function(*arguments)
+        finally:
+            if name == "FDwfDeviceConfigOpen":
+                handle = getattr(arguments[2], "_obj", arguments[2])   # the new handle (passed by reference)
+            else:
+                handle = arguments[0]
+            handle = getattr(handle, "value", handle)
+            if handle == -1:
+                __registers__.clear()   # every device is closed
+            else:
+                registers = __registers__.get(handle, {})
+                for key in [key for key in registers if key[0].startswith(prefix)]:
+                    del registers[key]
+    reset.__name__ = name
+    return reset
+
+def __handle_of__(name, arguments):
+    """
+        get the device handle of a failed call (None invalidates every device)
+    """
+    if name.startswith(("FDwfGet", "FDwfEnum", "FDwfSpectrum", "FDwfDeviceConfigOpen")) or len(arguments) == 0:
+        return None
+    return arguments[0]
+
+"""-----------------------------------------------------------------------"""
+
+__handle__ = None
+
+# the library behind the FDwf calls: "libdwf" (the WaveForms runtime) or "simulator" (simulated devices)
+backends = ["libdwf", "simulator"]
+backend = environ.get("WF_SDK_BACKEND", "libdwf")
+
+def load(name=None):
+    """
+        load the dynamic library, or the simulator (only the first call loads it)
+
+        parameters: - backend name: None (keep the selected backend), "libdwf" or "simulator"
+
+        returns:    - the library object
+    """
+    global __handle__, backend
+    if name is not None and name != backend:
+        if name not in backends:
+            raise error("Unknown backend: " + name + " (possible: " + ", ".join(backends) + ")", "load", "library")
+        backend = name
+        __handle__ = None
+        vars(dwf).clear()   # drop the functions of the previous backend
+    if __handle__ is None:
+        if backend == "simulator":
+            from WF_SDK.simulator.backend import library as simulated_library
+            __handle__ = simulated_library()
+        elif backend == "libdwf":
+            __handle__ = ctypes.cdll.LoadLibrary(lib_path)
+        else:
+            raise error("Unknown backend: " + backend + " (possible: " + ", ".join(backends) + ")", "load", "library")
+    return __handle__
@@ -1,36 +1,23 @@
-""" LOGIC ANALYZER CONTROL FUNCTIONS: open, trigger, record, close """
+""" LOGIC ANALYZER CONTROL FUNCTIONS: open, trigger, record, record_async, capture, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+from time import time             # needed for the timestamps
+from WF_SDK.library import dwf, constants   # shared library and constants
+from WF_SDK.device import __state__
+from WF_SDK import polling, buffers, captures
 
 """-----------------------------------------------------------------------"""
 
 class data:
-    """ stores the sampling frequency and the buffer size """
+    """
+        stores the sampling frequency and the buffer size (every device has its own copy: device_data.logic,
+        the settings of the last opened logic analyzer are also copied here)
+    """
     sampling_frequency = 100e06
     buffer_size = 4096
     max_buffer_size = 0
+    polls = 0               # status reads during the last recording
+    trigger_position = -1   # index of the trigger sample, -1 if there is no trigger
 
 """-----------------------------------------------------------------------"""
 
@@ -42,29 +29,29 @@ def open(device_data, sampling_frequency=100e06, buffer_size=0):
                     - sampling frequency in Hz, default is 100MHz
                     - buffer size, default is 0 (maximum)
     """
-    # set global variables
-    data.sampling_frequency = sampling_frequency
-    data.max_buffer_size = device_data.digital.input.max_buffer_size
+    # set the state of the logic analyzer on this device
+    state = __state__(device_data, "logic", data)
+    state.sampling_frequency = sampling_frequency
+    state.max_buffer_size = device_data.digital.input.max_buffer_size
 
     # get internal clock frequency
     internal_frequency = ctypes.c_double()
-    if dwf.FDwfDigitalInInternalClockInfo(device_data.handle, ctypes.byref(internal_frequency)) == 0:
-        check_error()
+    dwf.FDwfDigitalInInternalClockInfo(device_data.handle, ctypes.byref(internal_frequency))
     
     # set clock frequency divider (needed for lower frequency input signals)
-    if dwf.FDwfDigitalInDividerSet(device_data.handle, ctypes.c_int(int(internal_frequency.value / sampling_frequency))) == 0:
-        check_error()
+    dwf.FDwfDigitalInDividerSet(device_data.handle, int(internal_frequency.value / sampling_frequency))
     
     # set 16-bit sample format
-    if dwf.FDwfDigitalInSampleFormatSet(device_data.handle, ctypes.c_int(16)) == 0:
-        check_error()
+    dwf.FDwfDigitalInSampleFormatSet(device_data.handle, 16)
     
     # set buffer size
     if buffer_size == 0:
-        buffer_size = data.max_buffer_size
-    data.buffer_size = buffer_size
-    if dwf.FDwfDigitalInBufferSizeSet(device_data.handle, ctypes.c_int(buffer_size)) == 0:
-        check_error()
+        buffer_size = state.max_buffer_size
+    state.buffer_size = buffer_size
+    dwf.FDwfDigitalInBufferSizeSet(device_data.handle, buffer_size)
+
+    # logic.data mirrors the last opened logic analyzer, for the scripts reading the settings from the module
+    data.sampling_frequency, data.buffer_size, data.max_buffer_size = sampling_frequency, buffer_size, state.max_buffer_size
     return
 
 """-----------------------------------------------------------------------"""
@@ -85,90 +72,187 @@ def trigger(device_data, enable, channel, position=0, timeout=0, rising_edge=Tru
                     - count - instance count, the default is 0 (immediate)
     """
     # set trigger source to digital I/O lines, or turn it off
+    state = __state__(device_data, "logic", data)
     if enable:
-        if dwf.FDwfDigitalInTriggerSourceSet(device_data.handle, constants.trigsrcDetectorDigitalIn) == 0:
-            check_error()
+        dwf.FDwfDigitalInTriggerSourceSet(device_data.handle, constants.trigsrcDetectorDigitalIn)
     else:
-        if dwf.FDwfDigitalInTriggerSourceSet(device_data.handle, constants.trigsrcNone) == 0:
-            check_error()
+        dwf.FDwfDigitalInTriggerSourceSet(device_data.handle, constants.trigsrcNone)
+        state.trigger_position = -1
         return
     
     # set starting position and prefill
-    position = min(data.buffer_size, max(0, position))
-    if dwf.FDwfDigitalInTriggerPositionSet(device_data.handle, ctypes.c_int(data.buffer_size - position)) == 0:
-        check_error()
-    if dwf.FDwfDigitalInTriggerPrefillSet(device_data.handle, ctypes.c_int(position)) == 0:
-        check_error()
+    position = min(state.buffer_size, max(0, position))
+    state.trigger_position = position
+    dwf.FDwfDigitalInTriggerPositionSet(device_data.handle, state.buffer_size - position)
+    dwf.FDwfDigitalInTriggerPrefillSet(device_data.handle, position)
 
     # set trigger condition
-    channel = ctypes.c_int(1 << channel)
+    channel = 1 << channel
     if not rising_edge:
-        if dwf.FDwfDigitalInTriggerSet(device_data.handle, channel, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int(0)) == 0:
-            check_error()
-        if dwf.FDwfDigitalInTriggerResetSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int(0), channel) == 0:
-            check_error()
+        dwf.FDwfDigitalInTriggerSet(device_data.handle, channel, 0, 0, 0)
+        dwf.FDwfDigitalInTriggerResetSet(device_data.handle, 0, 0, 0, channel)
     else:
-        if dwf.FDwfDigitalInTriggerSet(device_data.handle, ctypes.c_int(0), channel, ctypes.c_int(0), ctypes.c_int(0)) == 0:
-            check_error()
-        if dwf.FDwfDigitalInTriggerResetSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), channel, ctypes.c_int(0)) == 0:
-            check_error()
+        dwf.FDwfDigitalInTriggerSet(device_data.handle, 0, channel, 0, 0)
+        dwf.FDwfDigitalInTriggerResetSet(device_data.handle, 0, 0, channel, 0)
     
     # set auto triggering
-    if dwf.FDwfDigitalInTriggerAutoTimeoutSet(device_data.handle, ctypes.c_double(timeout)) == 0:
-        check_error()
+    dwf.FDwfDigitalInTriggerAutoTimeoutSet(device_data.handle, timeout)
     
     # set sequence length to activate trigger
-    if dwf.FDwfDigitalInTriggerLengthSet(device_data.handle, ctypes.c_double(length_min), ctypes.c_double(length_max), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfDigitalInTriggerLengthSet(device_data.handle, length_min, length_max, 0)
 
     # set event counter
-    if dwf.FDwfDigitalInTriggerCountSet(device_data.handle, ctypes.c_int(count), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfDigitalInTriggerCountSet(device_data.handle, count, 0)
     return
 
 """-----------------------------------------------------------------------"""
 
-def record(device_data, channel):
+def record(device_data, channel, out=None):
     """
         initialize the logic analyzer
 
         parameters: - device data
                     - channel - the selected DIO line number
+                    - numpy array to store the logic values in, reused between recordings (at least buffer size elements),
+                      default is None (a new list)
 
-        returns:    - a list with the recorded logic values
+        returns:    - a list (or out) with the recorded logic values
     """
     # set up the instrument
-    if dwf.FDwfDigitalInConfigure(device_data.handle, ctypes.c_bool(False), ctypes.c_bool(True)) == 0:
-        check_error()
+    dwf.FDwfDigitalInConfigure(device_data.handle, False, True)
     
     # read data to an internal buffer
-    while True:
-        status = ctypes.c_byte()    # variable to store buffer status
-        if dwf.FDwfDigitalInStatus(device_data.handle, ctypes.c_bool(True), ctypes.byref(status)) == 0:
-            check_error()
+    state = __state__(device_data, "logic", data)
+    state.polls = polling.wait(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
+    
+    # get samples
+    return __get_data__(device_data, channel, out)
+
+"""-----------------------------------------------------------------------"""
+
+async def record_async(device_data, channel, timeout=None, out=None):
+    """
+        record logic signals without blocking the event loop
+
+        parameters: - device data
+                    - channel - the selected DIO line number
+                    - timeout in seconds, default is None (wait until the buffer is full)
+                    - numpy array to store the logic values in, see record, default is None (a new list)
+
+        returns:    - a list (or out) with the recorded logic values
+
+        raises TimeoutError if the buffer isn't filled in time, the acquisition is stopped on timeout and on cancellation
+    """
+    # set up the instrument
+    dwf.FDwfDigitalInConfigure(device_data.handle, False, True)
     
-        if status.value == constants.stsDone.value:
-            # exit loop when finished
-            break
+    # read data to an internal buffer
+    state = __state__(device_data, "logic", data)
+    try:
+        state.polls = await polling.wait_async(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency), timeout)
+    except BaseException:
+        # stop the acquisition
+        dwf.FDwfDigitalInConfigure(device_data.handle, False, False)
+        raise
     
     # get samples
-    buffer = (ctypes.c_uint16 * data.buffer_size)()
-    if dwf.FDwfDigitalInStatusData(device_data.handle, buffer, ctypes.c_int(2 * data.buffer_size)) == 0:
-        check_error()
+    return __get_data__(device_data, channel, out)
+
+"""-----------------------------------------------------------------------"""
+
+def capture(device_data, channel=0, out=None):
+    """
+        record logic signals with their acquisition settings (needs numpy)
+
+        parameters: - device data
+                    - channel - the selected DIO line number, or a list of DIO lines
+                    - C-contiguous numpy uint8 array to store the logic values in (buffer size, or lines x buffer size),
+                      the capture keeps it, default is None (a new array)
+
+        returns:    - captures.capture: the logic values, with the sampling frequency set on the device, the trigger position,
+                      the DIO lines and the UTC time of the first sample (from the clock of the computer)
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    channels = [channel] if isinstance(channel, int) else list(channel)
+    state = __state__(device_data, "logic", data)
+    if out is not None:
+        buffers.check(out, "uint8", (state.buffer_size,) if isinstance(channel, int) else (len(channels), state.buffer_size), "capture", "logic")
+
+    # set up the instrument
+    dwf.FDwfDigitalInConfigure(device_data.handle, False, True)
+
+    # read data to an internal buffer
+    state.polls = polling.wait(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
+    finished = time()
+
+    # the sampling frequency set on the device
+    internal_frequency = ctypes.c_double()
+    dwf.FDwfDigitalInInternalClockInfo(device_data.handle, ctypes.byref(internal_frequency))
+    divider = ctypes.c_uint()
+    dwf.FDwfDigitalInDividerGet(device_data.handle, ctypes.byref(divider))
+    frequency = internal_frequency.value / max(divider.value, 1)
+
+    # extract the bits of every line from one copy of the samples
+    samples = out if out is not None else numpy.empty((len(channels), state.buffer_size), dtype=numpy.uint8)
+    rows = samples.reshape(len(channels), state.buffer_size)
+    __get_data__(device_data, channels[0], rows[0])
+    for row, line in zip(rows[1:], channels[1:]):
+        __get_bits__(device_data, line, row)
+    if isinstance(channel, int):
+        samples = samples.reshape(state.buffer_size)
+    return captures.capture(samples, frequency, channels, state.trigger_position, finished - state.buffer_size / frequency)
+
+"""-----------------------------------------------------------------------"""
+
+def close(device_data):
+    """
+        reset the instrument
+    """
+    dwf.FDwfDigitalInReset(device_data.handle)
+    __state__(device_data, "logic", data).trigger_position = -1
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __done__(device_data):
+    """
+        read the acquisition status, returns True when the buffer is full
+    """
+    status = ctypes.c_ubyte()    # variable to store buffer status
+    dwf.FDwfDigitalInStatus(device_data.handle, True, ctypes.byref(status))
+    return status.value == constants.stsDone.value
+
+"""-----------------------------------------------------------------------"""
+
+def __get_data__(device_data, channel, out=None):
+    """
+        copy the recorded samples of a DIO line into a list, or into out
+    """
+    state = __state__(device_data, "logic", data)
+    buffer = buffers.get(ctypes.c_uint16, state.buffer_size)
+    dwf.FDwfDigitalInStatusData(device_data.handle, buffer, 2 * state.buffer_size)
+
+    # extract the bits in place
+    if out is not None:
+        return __get_bits__(device_data, channel, out)
     
     # convert buffer to list of lists of integers
     result = []
-    for point in buffer:
+    for point in buffer[:state.buffer_size]:
         result.append((int(point) & (1 << channel)) >> channel)
-    
     return result
 
 """-----------------------------------------------------------------------"""
 
-def close(device_data):
+def __get_bits__(device_data, channel, out):
     """
-        reset the instrument
+        extract the bits of a DIO line from the last copied samples into out
     """
-    if dwf.FDwfDigitalInReset(device_data.handle) == 0:
-        check_error()
-    return
+    import numpy                  # imported here, the list return doesn't need numpy
+    state = __state__(device_data, "logic", data)
+    buffer = buffers.get(ctypes.c_uint16, state.buffer_size)
+    samples = numpy.frombuffer(buffer, dtype=numpy.uint16, count=state.buffer_size)
+    bits = out[:state.buffer_size]
+    numpy.right_shift(samples, channel, out=bits, casting="unsafe")
+    numpy.bitwise_and(bits, 1, out=bits, casting="unsafe")
+    return out
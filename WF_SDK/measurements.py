@@ -0,0 +1,174 @@
+""" WAVEFORM MEASUREMENT FUNCTIONS: measure """
+
+import numpy                      # every measurement is computed on whole arrays
+
+"""-----------------------------------------------------------------------"""
+
+class measurement:
+    """ measurement names """
+    mean = "mean"                   # average voltage
+    rms = "rms"                     # root mean square voltage
+    minimum = "minimum"             # lowest voltage
+    maximum = "maximum"             # highest voltage
+    peak_to_peak = "peak_to_peak"   # maximum - minimum
+    top = "top"                     # voltage of the high level (average of the samples in the highest quarter of the range)
+    base = "base"                   # voltage of the low level (average of the samples in the lowest quarter of the range)
+    amplitude = "amplitude"         # top - base
+    frequency = "frequency"         # in Hz, from the rising edges
+    period = "period"               # in seconds, average time between the rising edges
+    duty_cycle = "duty_cycle"       # in percents, average high time / period
+    rise_time = "rise_time"         # in seconds, average time from the low to the high reference level on the rising edges
+    fall_time = "fall_time"         # in seconds, average time from the high to the low reference level on the falling edges
+    overshoot = "overshoot"         # in percents of the amplitude, (maximum - top) / amplitude
+    undershoot = "undershoot"       # in percents of the amplitude, (base - minimum) / amplitude
+    all = [mean, rms, minimum, maximum, peak_to_peak, top, base, amplitude, frequency, period, duty_cycle, rise_time, fall_time, overshoot, undershoot]
+
+"""-----------------------------------------------------------------------"""
+
+def measure(buffer, sampling_frequency, measurements=None, levels=(10, 50, 90)):
+    """
+        measure recorded signals, every capture in one pass over the whole array
+
+        parameters: - buffer: list or numpy array of voltages (like scope.record), or an array with several captures,
+                      the last axis holds the samples (like scope.record_channels or scope.record_segments)
+                    - sampling frequency in Hz
+                    - list of measurement names: mean, rms, minimum, maximum, peak_to_peak, top, base, amplitude, frequency,
+                      period, duty_cycle, rise_time, fall_time, overshoot, undershoot, default is None (every measurement)
+                    - low, middle and high reference levels in percents of the amplitude, default is (10, 50, 90)
+
+        returns:    - dictionary by measurement name: a float for a single capture, or a numpy array with the shape of the
+                      captures (the buffer without its last axis), NaN if a capture doesn't have enough edges
+
+        an edge goes from the low to the high reference level (or back), the noise between them is ignored,
+        and the times of the level crossings are interpolated between the samples
+    """
+    if measurements is None:
+        measurements = measurement.all
+    buffer = numpy.asarray(buffer, dtype=numpy.float64)
+    shape = buffer.shape[:-1]
+    signals = buffer.reshape(-1, buffer.shape[-1])
+    results = {}
+
+    # statistics
+    if measurement.mean in measurements:
+        results[measurement.mean] = signals.mean(axis=1)
+    if measurement.rms in measurements:
+        results[measurement.rms] = numpy.sqrt(numpy.einsum("ij,ij->i", signals, signals) / signals.shape[1])
+    minimum = signals.min(axis=1)
+    maximum = signals.max(axis=1)
+    results[measurement.minimum] = minimum
+    results[measurement.maximum] = maximum
+    results[measurement.peak_to_peak] = maximum - minimum
+
+    # levels
+    levelled = [measurement.top, measurement.base, measurement.amplitude, measurement.overshoot, measurement.undershoot,
+                measurement.frequency, measurement.period, measurement.duty_cycle, measurement.rise_time, measurement.fall_time]
+    if any(name in measurements for name in levelled):
+        top = __band__(signals, minimum + 0.75 * (maximum - minimum), maximum)
+        base = __band__(signals, minimum, minimum + 0.25 * (maximum - minimum))
+        amplitude = top - base
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            results[measurement.overshoot] = numpy.where(amplitude > 0, (maximum - top) / amplitude * 100, numpy.nan)
+            results[measurement.undershoot] = numpy.where(amplitude > 0, (base - minimum) / amplitude * 100, numpy.nan)
+        results[measurement.top] = top
+        results[measurement.base] = base
+        results[measurement.amplitude] = amplitude
+        results.update(__edges__(signals, sampling_frequency, base, amplitude, levels, measurements))
+
+    # keep the requested measurements in the shape of the captures
+    for name in list(results):
+        if name not in measurements:
+            del results[name]
+        elif len(shape) == 0:
+            results[name] = float(results[name][0])
+        else:
+            results[name] = results[name].reshape(shape)
+    return results
+
+"""-----------------------------------------------------------------------"""
+
+def __edges__(signals, sampling_frequency, base, amplitude, levels, measurements):
+    """
+        time measurements from the rising and falling edges of every row
+    """
+    rows, length = signals.shape
+    low, middle, high = [(base + amplitude * level / 100)[:, None] for level in levels]
+    results = {}
+
+    # the state of the signal: 1 above the high level, -1 below the low level, kept between them (hysteresis)
+    state = (signals >= high).astype(numpy.int8) - (signals <= low).astype(numpy.int8)
+    outside = __last__(state != 0)      # the last sample above the high or below the low level
+    state = numpy.take_along_axis(state, outside, axis=1)
+    row, column = numpy.nonzero((state[:, 1:] * state[:, :-1]) < 0)
+    column += 1     # the first sample of the new state
+    rising = state[row, column] > 0
+    falling = ~rising
+
+    # the middle level crossing of every edge: after the last sample on the other side
+    time = numpy.empty(len(row))
+    time[rising] = __crossing__(signals, middle, row[rising], __last__(signals < middle)[row[rising], column[rising]])
+    time[falling] = __crossing__(signals, middle, row[falling], __last__(signals > middle)[row[falling], column[falling]])
+    counts = numpy.bincount(row[rising], minlength=rows)
+
+    # period: from the first to the last rising edge
+    first = numpy.full(rows, numpy.nan)
+    last = numpy.full(rows, numpy.nan)
+    first[row[rising][::-1]] = time[rising][::-1]
+    last[row[rising]] = time[rising]
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        period = numpy.where(counts > 1, (last - first) / (counts - 1), numpy.nan) / sampling_frequency
+        results[measurement.period] = period
+        results[measurement.frequency] = 1 / period
+
+        # duty cycle: the falling edges after a rising edge (the edges alternate)
+        if measurement.duty_cycle in measurements:
+            pulse = falling[1:] & rising[:-1] & (row[1:] == row[:-1])
+            widths = numpy.bincount(row[1:][pulse], weights=time[1:][pulse] - time[:-1][pulse], minlength=rows)
+            pulses = numpy.bincount(row[1:][pulse], minlength=rows)
+            results[measurement.duty_cycle] = widths / pulses / sampling_frequency / period * 100
+
+        # rise and fall time: from the last sample outside the first level to the first sample outside the second level
+        if measurement.rise_time in measurements:
+            start = __crossing__(signals, low, row[rising], outside[row[rising], column[rising] - 1])
+            stop = __crossing__(signals, high, row[rising], column[rising] - 1)
+            results[measurement.rise_time] = __average__(row[rising], stop - start, rows) / sampling_frequency
+        if measurement.fall_time in measurements:
+            start = __crossing__(signals, high, row[falling], outside[row[falling], column[falling] - 1])
+            stop = __crossing__(signals, low, row[falling], column[falling] - 1)
+            results[measurement.fall_time] = __average__(row[falling], stop - start, rows) / sampling_frequency
+    return results
+
+"""-----------------------------------------------------------------------"""
+
+def __last__(mask):
+    """
+        index of the last True element at or before every element of a row (0 if there is none)
+    """
+    indices = numpy.where(mask, numpy.arange(mask.shape[1]), 0)
+    return numpy.maximum.accumulate(indices, axis=1)
+
+def __crossing__(signals, level, row, before):
+    """
+        interpolated sample index where the signal crosses a level between two samples (before and the next one)
+    """
+    after = numpy.minimum(before + 1, signals.shape[1] - 1)
+    first, second = signals[row, before], signals[row, after]
+    level = level[row, 0]
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        fraction = numpy.where(second != first, (level - first) / (second - first), 0)
+    return before + numpy.clip(fraction, 0, 1)
+
+def __band__(signals, low, high):
+    """
+        average of the samples between two levels in every row
+    """
+    inside = (signals >= low[:, None]) & (signals <= high[:, None])
+    return numpy.einsum("ij,ij->i", signals, inside) / inside.sum(axis=1)
+
+def __average__(row, values, rows):
+    """
+        average of the values of every row, NaN for the rows without values
+    """
+    counts = numpy.bincount(row, minlength=rows)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return numpy.bincount(row, weights=values, minlength=rows) / counts
@@ -1,28 +1,7 @@
 """ PATTERN GENERATOR CONTROL FUNCTIONS: generate, close, enable, disable """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+from WF_SDK.library import dwf, constants   # shared library and constants
 
 """-----------------------------------------------------------------------"""
 
@@ -74,13 +53,11 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
         
     # get internal clock frequency
     internal_frequency = ctypes.c_double()
-    if dwf.FDwfDigitalOutInternalClockInfo(device_data.handle, ctypes.byref(internal_frequency)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutInternalClockInfo(device_data.handle, ctypes.byref(internal_frequency))
     
     # get counter value range
     counter_limit = ctypes.c_uint()
-    if dwf.FDwfDigitalOutCounterInfo(device_data.handle, ctypes.c_int(channel), ctypes.c_int(0), ctypes.byref(counter_limit)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutCounterInfo(device_data.handle, channel, None, ctypes.byref(counter_limit))
     
     # calculate the divider for the given signal frequency
     if function == constants.DwfDigitalOutTypePulse:
@@ -89,20 +66,16 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
         divider = int(internal_frequency.value / frequency)
     
     # enable the respective channel
-    if dwf.FDwfDigitalOutEnableSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(1)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutEnableSet(device_data.handle, channel, 1)
     
     # set output type
-    if dwf.FDwfDigitalOutTypeSet(device_data.handle, ctypes.c_int(channel), function) == 0:
-        check_error()
+    dwf.FDwfDigitalOutTypeSet(device_data.handle, channel, function)
     
     # set frequency
-    if dwf.FDwfDigitalOutDividerSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(divider)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutDividerSet(device_data.handle, channel, divider)
 
     # set idle state
-    if dwf.FDwfDigitalOutIdleSet(device_data.handle, ctypes.c_int(channel), idle) == 0:
-        check_error()
+    dwf.FDwfDigitalOutIdleSet(device_data.handle, channel, idle)
 
     # set PWM signal duty cycle
     if function == constants.DwfDigitalOutTypePulse:
@@ -111,8 +84,7 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
         # calculate steps for low and high parts of the period
         high_steps = int(steps * duty_cycle / 100)
         low_steps = int(steps - high_steps)
-        if dwf.FDwfDigitalOutCounterSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(low_steps), ctypes.c_int(high_steps)) == 0:
-            check_error()
+        dwf.FDwfDigitalOutCounterSet(device_data.handle, channel, low_steps, high_steps)
     
     # load custom signal data
     elif function == constants.DwfDigitalOutTypeCustom:
@@ -123,51 +95,41 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
                 buffer[index >> 3] |= 1 << (index & 7)
     
         # load data
-        if dwf.FDwfDigitalOutDataSet(device_data.handle, ctypes.c_int(channel), ctypes.byref(buffer), ctypes.c_int(len(data))) == 0:
-            check_error()
+        dwf.FDwfDigitalOutDataSet(device_data.handle, channel, ctypes.byref(buffer), len(data))
     
     # calculate run length
     if run_time == "auto":
         run_time = len(data) / frequency
     
     # set wait time
-    if dwf.FDwfDigitalOutWaitSet(device_data.handle, ctypes.c_double(wait)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutWaitSet(device_data.handle, wait)
     
     # set repeat count
-    if dwf.FDwfDigitalOutRepeatSet(device_data.handle, ctypes.c_int(repeat)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutRepeatSet(device_data.handle, repeat)
     
     # set run length
-    if dwf.FDwfDigitalOutRunSet(device_data.handle, ctypes.c_double(run_time)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutRunSet(device_data.handle, run_time)
 
     # enable triggering
-    if dwf.FDwfDigitalOutRepeatTriggerSet(device_data.handle, ctypes.c_int(trigger_enabled)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutRepeatTriggerSet(device_data.handle, trigger_enabled)
     
     if trigger_enabled:
         # set trigger source
-        if dwf.FDwfDigitalOutTriggerSourceSet(device_data.handle, trigger_source) == 0:
-            check_error()
+        dwf.FDwfDigitalOutTriggerSourceSet(device_data.handle, trigger_source)
     
         # set trigger slope
         if trigger_edge_rising == True:
             # rising edge
-            if dwf.FDwfDigitalOutTriggerSlopeSet(device_data.handle, constants.DwfTriggerSlopeRise) == 0:
-                check_error()
+            dwf.FDwfDigitalOutTriggerSlopeSet(device_data.handle, constants.DwfTriggerSlopeRise)
         elif trigger_edge_rising == False:
             # falling edge
-            if dwf.FDwfDigitalOutTriggerSlopeSet(device_data.handle, constants.DwfTriggerSlopeFall) == 0:
-                check_error()
+            dwf.FDwfDigitalOutTriggerSlopeSet(device_data.handle, constants.DwfTriggerSlopeFall)
         elif trigger_edge_rising == None:
             # either edge
-            if dwf.FDwfDigitalOutTriggerSlopeSet(device_data.handle, constants.DwfTriggerSlopeEither) == 0:
-                check_error()
+            dwf.FDwfDigitalOutTriggerSlopeSet(device_data.handle, constants.DwfTriggerSlopeEither)
 
     # start generating the signal
-    if dwf.FDwfDigitalOutConfigure(device_data.handle, ctypes.c_int(True)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutConfigure(device_data.handle, True)
     return
 
 """-----------------------------------------------------------------------"""
@@ -176,8 +138,7 @@ def close(device_data):
     """
         reset the instrument
     """
-    if dwf.FDwfDigitalOutReset(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfDigitalOutReset(device_data.handle)
     return
 
 """-----------------------------------------------------------------------"""
@@ -186,10 +147,8 @@ def enable(device_data, channel):
     """ enables a digital output channel """
     if device_data.name == "Digital Discovery":
         channel = channel - 24
-    if dwf.FDwfDigitalOutEnableSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(1)) == 0:
-        check_error()
-    if dwf.FDwfDigitalOutConfigure(device_data.handle, ctypes.c_int(True)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutEnableSet(device_data.handle, channel, 1)
+    dwf.FDwfDigitalOutConfigure(device_data.handle, True)
     return
 
 """-----------------------------------------------------------------------"""
@@ -198,8 +157,6 @@ def disable(device_data, channel):
     """ disables a digital output channel """
     if device_data.name == "Digital Discovery":
         channel = channel - 24
-    if dwf.FDwfDigitalOutEnableSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(0)) == 0:
-        check_error()
-    if dwf.FDwfDigitalOutConfigure(device_data.handle, ctypes.c_int(True)) == 0:
-        check_error()
+    dwf.FDwfDigitalOutEnableSet(device_data.handle, channel, 0)
+    dwf.FDwfDigitalOutConfigure(device_data.handle, True)
     return
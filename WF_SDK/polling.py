@@ -0,0 +1,100 @@
+""" STATUS POLLING FUNCTIONS: estimate, wait, wait_async """
+
+from time import perf_counter, sleep   # needed for the delays
+
+"""-----------------------------------------------------------------------"""
+
+class settings:
+    """ delays between two status reads (shared by every instrument) """
+    min_interval = 0.5e-03   # shortest delay in seconds
+    max_interval = 10e-03    # longest delay in seconds, reached while waiting for a trigger
+    early_wake = 0.9         # the first status read is done after this part of the estimated time
+
+"""-----------------------------------------------------------------------"""
+
+def estimate(buffer_size, sampling_frequency):
+    """
+        estimate the duration of an acquisition
+
+        parameters: - buffer size (number of samples)
+                    - sampling frequency in Hz
+
+        returns:    - the time needed to fill the buffer in seconds
+    """
+    if sampling_frequency <= 0:
+        return 0
+    return buffer_size / sampling_frequency
+
+"""-----------------------------------------------------------------------"""
+
+def wait(done, expected=0, timeout=None):
+    """
+        wait until an acquisition is finished, without keeping a CPU core busy
+
+        parameters: - function reading the status, returns True when finished
+                    - estimated duration of the acquisition in seconds, see estimate()
+                    - timeout in seconds, default is None (no timeout)
+
+        returns:    - the number of status reads
+
+        raises TimeoutError if the acquisition isn't finished in time
+    """
+    polls = 0
+    for delay in __delays__(expected, timeout):
+        if delay > 0:
+            sleep(delay)
+        polls += 1
+        if done():
+            return polls
+
+"""-----------------------------------------------------------------------"""
+
+async def wait_async(done, expected=0, timeout=None):
+    """
+        wait until an acquisition is finished, without blocking the event loop
+
+        parameters: - function reading the status, returns True when finished
+                    - estimated duration of the acquisition in seconds, see estimate()
+                    - timeout in seconds, default is None (no timeout)
+
+        returns:    - the number of status reads
+
+        raises TimeoutError if the acquisition isn't finished in time
+    """
+    import asyncio                # imported here, so importing the module stays fast
+    polls = 0
+    for delay in __delays__(expected, timeout):
+        await asyncio.sleep(delay)    # a zero delay still lets other tasks run
+        polls += 1
+        if done():
+            return polls
+
+"""-----------------------------------------------------------------------"""
+
+def __delays__(expected, timeout):
+    """
+        generate the delays before the status reads
+
+        the first status read is done right before the estimated end of the acquisition,
+        after that the delay doubles with every read (between min_interval and max_interval)
+    """
+    start = perf_counter()
+    delay = expected * settings.early_wake
+    if delay < settings.min_interval:
+        delay = 0   # short acquisitions are read right away
+    interval = settings.min_interval
+    while True:
+        elapsed = perf_counter() - start
+        if timeout is not None:
+            if elapsed >= timeout:
+                raise TimeoutError("the acquisition didn't finish in {}s".format(timeout))
+            delay = min(delay, timeout - elapsed)
+        yield delay
+
+        # wait for the rest of the acquisition, then back off
+        remaining = expected - (perf_counter() - start)
+        if remaining > settings.min_interval:
+            delay = remaining
+        else:
+            delay = interval
+            interval = min(interval * 2, settings.max_interval)
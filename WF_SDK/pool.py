@@ -0,0 +1,71 @@
+""" DEVICE POOL FUNCTIONS: open, run, close """
+
+from concurrent.futures import ThreadPoolExecutor   # worker threads (FDwf calls release the GIL)
+from WF_SDK import device
+from WF_SDK.device import error
+
+"""-----------------------------------------------------------------------"""
+
+class data:
+    """ stores the opened devices and the worker threads """
+    def __init__(self, devices):
+        self.devices = devices
+        self.executor = ThreadPoolExecutor(max_workers=max(len(devices), 1), thread_name_prefix="WF_SDK")
+        return
+
+"""-----------------------------------------------------------------------"""
+
+def open(count=None, device_type=None, config=0, cache=None):
+    """
+        open several devices
+
+        parameters: - number of devices, default is None (every available device)
+                    - device type: None (any device), or a name accepted by device.open()
+                    - configuration: 0 = auto, default = auto
+                    - capability cache, see device.open()
+
+        returns:    - pool data (the opened devices are in pool_data.devices)
+    """
+    devices = []
+    try:
+        while count is None or len(devices) < count:
+            try:
+                devices.append(device.open(device_type, config, cache))
+            except error:
+                # stop if every device is open, unless more devices are needed
+                if count is None and len(devices) > 0:
+                    break
+                raise
+    except:
+        # don't keep devices open if the pool can't be created
+        for device_data in devices:
+            device.close(device_data)
+        raise
+    return data(devices)
+
+"""-----------------------------------------------------------------------"""
+
+def run(pool_data, function, *args, **kwargs):
+    """
+        call a function for every device in parallel
+
+        parameters: - pool data
+                    - function with the device data as first parameter, like scope.record
+                    - other parameters are passed to the function
+
+        returns:    - list of results, in the order of pool_data.devices
+    """
+    futures = [pool_data.executor.submit(function, device_data, *args, **kwargs) for device_data in pool_data.devices]
+    return [future.result() for future in futures]
+
+"""-----------------------------------------------------------------------"""
+
+def close(pool_data):
+    """
+        close every device in the pool and stop the worker threads
+    """
+    pool_data.executor.shutdown(wait=True)
+    for device_data in pool_data.devices:
+        device.close(device_data)
+    pool_data.devices = []
+    return
@@ -2,6 +2,19 @@
 This module controls the protocol instrument
 """
 
-from WF_SDK.protocol import i2c
-from WF_SDK.protocol import spi
-from WF_SDK.protocol import uart
+from importlib import import_module
+
+# interfaces are imported only when they are first used
+__submodules__ = ["i2c", "spi", "uart"]
+__all__ = __submodules__
+
+def __getattr__(name):
+    """
+        import interfaces on first access
+    """
+    if name in __submodules__:
+        return import_module("WF_SDK.protocol." + name)
+    raise AttributeError("module 'WF_SDK.protocol' has no attribute '" + name + "'")
+
+def __dir__():
+    return __all__
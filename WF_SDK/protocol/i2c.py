@@ -1,38 +1,17 @@
 """ PROTOCOL: I2C CONTROL FUNCTIONS: open, read, write, exchange, spy, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-import inspect                    # get caller information
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error, warning
+from WF_SDK.library import dwf, constants, warning   # shared library and constants
+from WF_SDK import buffers
 
 """-----------------------------------------------------------------------"""
 
-def __check_warning__(device_data, nak):
+def __check_warning__(nak, function):
     """
         check for I2C errors
     """
-    if nak != 0:
-        raise warning("NAK: index " + str(nak), inspect.stack()[1].function, "protocol/i2c")
+    if nak.value != 0:
+        raise warning("NAK: index " + str(nak.value), function, "protocol/i2c")
     return
 
 """-----------------------------------------------------------------------"""
@@ -48,38 +27,30 @@ def open(device_data, sda, scl, clk_rate=100e03, stretching=True):
                     - stretching (enables/disables clock stretching)
     """
     # reset the interface
-    if dwf.FDwfDigitalI2cReset(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cReset(device_data.handle)
 
     # clock stretching
     if stretching:
-        if dwf.FDwfDigitalI2cStretchSet(device_data.handle, ctypes.c_int(1)) == 0:
-            check_error()
+        dwf.FDwfDigitalI2cStretchSet(device_data.handle, 1)
     else:
-        if dwf.FDwfDigitalI2cStretchSet(device_data.handle, ctypes.c_int(0)) == 0:
-            check_error()
+        dwf.FDwfDigitalI2cStretchSet(device_data.handle, 0)
 
     # set clock frequency
-    if dwf.FDwfDigitalI2cRateSet(device_data.handle, ctypes.c_double(clk_rate)) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cRateSet(device_data.handle, clk_rate)
 
     #  set communication lines
-    if dwf.FDwfDigitalI2cSclSet(device_data.handle, ctypes.c_int(scl)) == 0:
-        check_error()
-    if dwf.FDwfDigitalI2cSdaSet(device_data.handle, ctypes.c_int(sda)) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cSclSet(device_data.handle, scl)
+    dwf.FDwfDigitalI2cSdaSet(device_data.handle, sda)
 
     # check bus
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cClear(device_data.handle, ctypes.byref(nak)) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cClear(device_data.handle, ctypes.byref(nak))
     if nak.value == 0:
         raise warning("I2C bus lockup", "open", "protocol/i2c")
 
     # write 0 bytes
-    if dwf.FDwfDigitalI2cWrite(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int(0), ctypes.byref(nak)) == 0:
-        check_error()
-    __check_warning__(device_data, nak)
+    dwf.FDwfDigitalI2cWrite(device_data.handle, 0, None, 0, ctypes.byref(nak))
+    __check_warning__(nak, "open")
     return
 
 """-----------------------------------------------------------------------"""
@@ -100,44 +71,45 @@ def write(device_data, data, address):
 
     # encode the string into a string buffer
     data = bytes(data, "utf-8")
-    buffer = (ctypes.c_ubyte * len(data))()
-    for index in range(0, len(buffer)):
-        buffer[index] = ctypes.c_ubyte(data[index])
+    buffer = (ctypes.c_ubyte * len(data)).from_buffer_copy(data)
 
     # send
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cWrite(device_data.handle, ctypes.c_int(address << 1), buffer, ctypes.c_int(ctypes.sizeof(buffer)), ctypes.byref(nak)) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cWrite(device_data.handle, address << 1, buffer, ctypes.sizeof(buffer), ctypes.byref(nak))
 
     # check for not acknowledged
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "write")
     return ""
 
 """-----------------------------------------------------------------------"""
 
-def read(device_data, count, address):
+def read(device_data, count, address, out=None):
     """
         receives data from I2C
         
         parameters: - device data
                     - count (number of bytes to receive)
                     - address (8-bit address of the slave device)
+                    - writable buffer to store the bytes in, reused between reads (like a bytearray or a numpy uint8 array
+                      with at least count elements), default is None (a new list)
         
-        return:     - integer list containing the received bytes
+        return:     - integer list (or out) containing the received bytes
     """
-    # create buffer to store data
-    buffer = (ctypes.c_ubyte * count)()
+    # the bytes are written directly into out, otherwise into a reusable buffer
+    if out is not None:
+        buffer = (ctypes.c_ubyte * count).from_buffer(out)
+    else:
+        buffer = buffers.get(ctypes.c_ubyte, count)
 
     # receive
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cRead(device_data.handle, ctypes.c_int(address << 1), buffer, ctypes.c_int(count), ctypes.byref(nak)) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cRead(device_data.handle, address << 1, buffer, count, ctypes.byref(nak))
 
     # decode data
-    data = [int(element) for element in buffer]
+    data = out if out is not None else buffer[:count]
 
     # check for not acknowledged
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "read")
     return data
 
 """-----------------------------------------------------------------------"""
@@ -164,20 +136,17 @@ def exchange(device_data, data, count, address):
 
     # encode the string into a string buffer
     data = bytes(data, "utf-8")
-    tx_buffer = (ctypes.c_ubyte * len(data))()
-    for index in range(0, len(tx_buffer)):
-        tx_buffer[index] = ctypes.c_ubyte(data[index])
+    tx_buffer = (ctypes.c_ubyte * len(data)).from_buffer_copy(data)
 
     # send and receive
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cWriteRead(device_data.handle, ctypes.c_int(address << 1), tx_buffer, ctypes.c_int(ctypes.sizeof(tx_buffer)), buffer, ctypes.c_int(count), ctypes.byref(nak)) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cWriteRead(device_data.handle, address << 1, tx_buffer, ctypes.sizeof(tx_buffer), buffer, count, ctypes.byref(nak))
 
     # decode data
-    rec_data = [int(element) for element in buffer]
+    rec_data = list(buffer)
 
     # check for not acknowledged
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "exchange")
     return rec_data
 
 """-----------------------------------------------------------------------"""
@@ -252,6 +221,5 @@ def close(device_data):
     """
         reset the i2c interface
     """
-    if dwf.FDwfDigitalI2cReset(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfDigitalI2cReset(device_data.handle)
     return
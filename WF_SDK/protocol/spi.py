@@ -1,28 +1,8 @@
 """ PROTOCOL: SPI CONTROL FUNCTIONS: open, read, write, exchange, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+from WF_SDK.library import dwf, constants   # shared library and constants
+from WF_SDK import buffers
 
 """-----------------------------------------------------------------------"""
 
@@ -40,83 +20,74 @@ def open(device_data, cs, sck, miso=None, mosi=None, clk_frequency=1e06, mode=0,
                     - order (endianness, True means MSB first - default, False means LSB first)
     """
     # set the clock frequency
-    if dwf.FDwfDigitalSpiFrequencySet(device_data.handle, ctypes.c_double(clk_frequency)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiFrequencySet(device_data.handle, clk_frequency)
 
     # set the clock pin
-    if dwf.FDwfDigitalSpiClockSet(device_data.handle, ctypes.c_int(sck)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiClockSet(device_data.handle, sck)
 
     if mosi != None:
         # set the mosi pin
-        if dwf.FDwfDigitalSpiDataSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(mosi)) == 0:
-            check_error()
+        dwf.FDwfDigitalSpiDataSet(device_data.handle, 0, mosi)
 
         # set the initial state
-        if dwf.FDwfDigitalSpiIdleSet(device_data.handle, ctypes.c_int(0), constants.DwfDigitalOutIdleZet) == 0:
-            check_error()
+        dwf.FDwfDigitalSpiIdleSet(device_data.handle, 0, constants.DwfDigitalOutIdleZet)
 
     if miso != None:
         # set the miso pin
-        if dwf.FDwfDigitalSpiDataSet(device_data.handle, ctypes.c_int(1), ctypes.c_int(miso)) == 0:
-            check_error()
+        dwf.FDwfDigitalSpiDataSet(device_data.handle, 1, miso)
 
         # set the initial state
-        if dwf.FDwfDigitalSpiIdleSet(device_data.handle, ctypes.c_int(1), constants.DwfDigitalOutIdleZet) == 0:
-            check_error()
+        dwf.FDwfDigitalSpiIdleSet(device_data.handle, 1, constants.DwfDigitalOutIdleZet)
 
     # set the SPI mode
-    if dwf.FDwfDigitalSpiModeSet(device_data.handle, ctypes.c_int(mode)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiModeSet(device_data.handle, mode)
 
     # set endianness
     if order:
         # MSB first
-        if dwf.FDwfDigitalSpiOrderSet(device_data.handle, ctypes.c_int(1)) == 0:
-            check_error()
+        dwf.FDwfDigitalSpiOrderSet(device_data.handle, 1)
     else:
         # LSB first
-        if dwf.FDwfDigitalSpiOrderSet(device_data.handle, ctypes.c_int(0)) == 0:
-            check_error()
+        dwf.FDwfDigitalSpiOrderSet(device_data.handle, 0)
 
     # set the cs pin HIGH
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1)
 
     # dummy write
-    if dwf.FDwfDigitalSpiWriteOne(device_data.handle, ctypes.c_int(1), ctypes.c_int(0), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiWriteOne(device_data.handle, 1, 0, 0)
     return
 
 """-----------------------------------------------------------------------"""
 
-def read(device_data, count, cs):
+def read(device_data, count, cs, out=None):
     """
         receives data from SPI
 
         parameters: - device data
                     - count (number of bytes to receive)
                     - chip select line number
+                    - writable buffer to store the bytes in, reused between reads (like a bytearray or a numpy uint8 array
+                      with at least count elements), default is None (a new list)
 
-        return:     - integer list containing the received bytes
+        return:     - integer list (or out) containing the received bytes
     """
     # enable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 0)
 
-    # create buffer to store data
-    buffer = (ctypes.c_ubyte*count)()
+    # the bytes are written directly into out, otherwise into a reusable buffer
+    if out is not None:
+        buffer = (ctypes.c_ubyte * count).from_buffer(out)
+    else:
+        buffer = buffers.get(ctypes.c_ubyte, count)
 
     # read array of 8 bit elements
-    if dwf.FDwfDigitalSpiRead(device_data.handle, ctypes.c_int(1), ctypes.c_int(8), buffer, ctypes.c_int(len(buffer))) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiRead(device_data.handle, 1, 8, buffer, count)
 
     # disable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1)
 
     # decode data
-    data = [int(element) for element in buffer]
+    data = out if out is not None else buffer[:count]
 
     return data
 
@@ -137,22 +108,17 @@ def write(device_data, data, cs):
         data = "".join(chr(element) for element in data)
 
     # enable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 0)
 
     # create buffer to write
     data = bytes(data, "utf-8")
-    buffer = (ctypes.c_ubyte * len(data))()
-    for index in range(0, len(buffer)):
-        buffer[index] = ctypes.c_ubyte(data[index])
+    buffer = (ctypes.c_ubyte * len(data)).from_buffer_copy(data)
 
     # write array of 8 bit elements
-    if dwf.FDwfDigitalSpiWrite(device_data.handle, ctypes.c_int(1), ctypes.c_int(8), buffer, ctypes.c_int(len(buffer))) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiWrite(device_data.handle, 1, 8, buffer, len(buffer))
 
     # disable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1)
 
     return
 
@@ -176,28 +142,23 @@ def exchange(device_data, data, count, cs):
         data = "".join(chr(element) for element in data)
 
     # enable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 0)
 
     # create buffer to write
     data = bytes(data, "utf-8")
-    tx_buffer = (ctypes.c_ubyte * len(data))()
-    for index in range(0, len(tx_buffer)):
-        tx_buffer[index] = ctypes.c_ubyte(data[index])
+    tx_buffer = (ctypes.c_ubyte * len(data)).from_buffer_copy(data)
 
     # create buffer to store data
     rx_buffer = (ctypes.c_ubyte*count)()
 
     # write to MOSI and read from MISO
-    if dwf.FDwfDigitalSpiWriteRead(device_data.handle, ctypes.c_int(1), ctypes.c_int(8), tx_buffer, ctypes.c_int(len(tx_buffer)), rx_buffer, ctypes.c_int(len(rx_buffer))) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiWriteRead(device_data.handle, 1, 8, tx_buffer, len(tx_buffer), rx_buffer, len(rx_buffer))
 
     # disable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1)
 
     # decode data
-    data = [int(element) for element in rx_buffer]
+    data = list(rx_buffer)
 
     return data
 
@@ -318,6 +279,5 @@ def close(device_data):
     """
         reset the spi interface
     """
-    if dwf.FDwfDigitalSpiReset(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfDigitalSpiReset(device_data.handle)
     return
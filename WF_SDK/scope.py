@@ -1,36 +1,32 @@
-""" OSCILLOSCOPE CONTROL FUNCTIONS: open, measure, trigger, record, close """
+""" OSCILLOSCOPE CONTROL FUNCTIONS: open, measure, measure_channels, measure_samples, trigger, record, record_async, record_channels, record_raw, capture, record_segments, stream, pipeline, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+import threading                  # needed for the acquisition thread of the pipeline
+from queue import Queue, Full   # needed to pass the recordings of the pipeline
+from time import sleep, perf_counter, time   # needed for the delays between the status reads, the timeouts and the timestamps
+from WF_SDK.library import dwf, constants   # shared library and constants
+from WF_SDK.device import __state__
+from WF_SDK import polling, buffers, captures
 
 """-----------------------------------------------------------------------"""
 
 class data:
-    """ stores the sampling frequency and the buffer size """
+    """
+        stores the sampling frequency and the buffer size (every device has its own copy: device_data.scope,
+        the settings of the last opened scope are also copied here)
+    """
     sampling_frequency = 20e06
     buffer_size = 8192
     max_buffer_size = 0
+    offset = 0
+    amplitude_range = 5
+    polls = 0               # status reads during the last recording
+    lost = 0                # samples lost during the last stream (the device buffer overflowed)
+    corrupted = 0           # samples which may be corrupted during the last stream
+    measuring = False       # the instrument is set up for measure (not recording)
+    dropped = 0             # recordings dropped by the last pipeline (the queue was full)
+    acquisition_filter = constants.filterDecimate   # acquisition filter of every channel
+    triggered = False       # a trigger is set up (the trigger is in the middle of the buffer)
 
 """-----------------------------------------------------------------------"""
 
@@ -44,7 +40,55 @@ class trigger_source:
 
 """-----------------------------------------------------------------------"""
 
-def open(device_data, sampling_frequency=20e06, buffer_size=0, offset=0, amplitude_range=5):
+class acquisition_filter:
+    """ acquisition filters: how the samples are taken when the sampling frequency is lower than the maximum """
+    decimate = constants.filterDecimate     # every n-th sample of the ADC
+    average = constants.filterAverage       # the average of the ADC samples in every sample period (less noise, more resolution)
+    min_max = constants.filterMinMax        # the minimum and the maximum in the sample periods, alternately (short peaks are kept)
+
+"""-----------------------------------------------------------------------"""
+
+class chunk:
+    """ a part of a streamed recording (see stream) """
+    sequence = 0            # index of the chunk, counted from 0
+    start = 0               # index of the first sample in the whole recording
+    data = None             # numpy float64 array with the voltages (one row for every channel if a list of channels is streamed)
+    lost = 0                # samples lost in this chunk (the device buffer overflowed), they are NaN in the data
+    corrupted = 0           # samples in this chunk which may be corrupted
+
+class segments:
+    """ the result of a segmented recording (see record_segments) """
+    count = 0               # number of recorded segments (less than requested on timeout)
+    data = None             # numpy float64 array with the voltages: one row for every segment (and one for every channel if a list of channels is recorded)
+    times = None            # numpy float64 array with the UTC trigger time of every segment in seconds (from the clock of the device)
+    dead_time = None        # numpy float64 array with the time the scope couldn't trigger between two segments in seconds (re-arming and prefill)
+
+class raw:
+    """ raw ADC samples of a recording (see record_raw), 2 bytes per sample instead of 8 """
+    data = None             # numpy int16 array with the ADC values (one row for every channel if a list of channels is recorded)
+    scale = None            # numpy float64 array with the Volts per ADC step of every channel
+    offset = None           # numpy float64 array with the Volts at the ADC value 0 of every channel
+
+    def volts(self, out=None):
+        """
+            convert the ADC values to Volts (computed at every call, the raw samples are kept)
+
+            parameters: - numpy float64 array to store the voltages in, default is None (a new array)
+
+            returns:    - a numpy float64 array (or out) with the shape of the data
+        """
+        import numpy              # imported here, the other functions don't need numpy
+        if self.data.ndim == 1:
+            scale, offset = self.scale[0], self.offset[0]
+        else:
+            scale, offset = self.scale[:, None], self.offset[:, None]
+        out = numpy.multiply(self.data, scale, out=out)
+        out += offset
+        return out
+
+"""-----------------------------------------------------------------------"""
+
+def open(device_data, sampling_frequency=20e06, buffer_size=0, offset=0, amplitude_range=5, acquisition_filter=acquisition_filter.decimate):
     """
         initialize the oscilloscope
 
@@ -53,37 +97,41 @@ def open(device_data, sampling_frequency=20e06, buffer_size=0, offset=0, amplitu
                     - buffer size, default is 0 (maximum)
                     - offset voltage in Volts, default is 0V
                     - amplitude range in Volts, default is ±5V
+                    - acquisition filter: decimate, average, min_max, default is decimate
     """
-    # set global variables
-    data.sampling_frequency = sampling_frequency
-    data.max_buffer_size = device_data.analog.input.max_buffer_size
+    # set the state of the scope on this device
+    state = __state__(device_data, "scope", data)
+    state.sampling_frequency = sampling_frequency
+    state.max_buffer_size = device_data.analog.input.max_buffer_size
+    state.offset = offset
+    state.amplitude_range = amplitude_range
+    state.acquisition_filter = acquisition_filter
+    state.measuring = False
 
     # enable all channels
-    if dwf.FDwfAnalogInChannelEnableSet(device_data.handle, ctypes.c_int(-1), ctypes.c_bool(True)) == 0:
-        check_error()
+    dwf.FDwfAnalogInChannelEnableSet(device_data.handle, -1, True)
     
     # set offset voltage (in Volts)
-    if dwf.FDwfAnalogInChannelOffsetSet(device_data.handle, ctypes.c_int(-1), ctypes.c_double(offset)) == 0:
-        check_error()
+    dwf.FDwfAnalogInChannelOffsetSet(device_data.handle, -1, offset)
     
     # set range (maximum signal amplitude in Volts)
-    if dwf.FDwfAnalogInChannelRangeSet(device_data.handle, ctypes.c_int(-1), ctypes.c_double(amplitude_range)) == 0:
-        check_error()
+    dwf.FDwfAnalogInChannelRangeSet(device_data.handle, -1, amplitude_range)
     
     # set the buffer size (data point in a recording)
     if buffer_size == 0:
-        buffer_size = data.max_buffer_size
-    data.buffer_size = buffer_size
-    if dwf.FDwfAnalogInBufferSizeSet(device_data.handle, ctypes.c_int(buffer_size)) == 0:
-        check_error()
+        buffer_size = state.max_buffer_size
+    state.buffer_size = buffer_size
+    dwf.FDwfAnalogInBufferSizeSet(device_data.handle, buffer_size)
     
     # set the acquisition frequency (in Hz)
-    if dwf.FDwfAnalogInFrequencySet(device_data.handle, ctypes.c_double(sampling_frequency)) == 0:
-        check_error()
+    dwf.FDwfAnalogInFrequencySet(device_data.handle, sampling_frequency)
     
-    # disable averaging (for more info check the documentation)
-    if dwf.FDwfAnalogInChannelFilterSet(device_data.handle, ctypes.c_int(-1), constants.filterDecimate) == 0:
-        check_error()
+    # set the acquisition filter (decimate disables averaging, for more info check the documentation)
+    dwf.FDwfAnalogInChannelFilterSet(device_data.handle, -1, acquisition_filter)
+
+    # scope.data mirrors the last opened scope, for the scripts reading the settings from the module
+    data.sampling_frequency, data.buffer_size, data.max_buffer_size = sampling_frequency, buffer_size, state.max_buffer_size
+    data.offset, data.amplitude_range = offset, amplitude_range
     return
 
 """-----------------------------------------------------------------------"""
@@ -97,18 +145,15 @@ def measure(device_data, channel):
         
         returns:    - the measured voltage in Volts
     """
-    # set up the instrument
-    if dwf.FDwfAnalogInConfigure(device_data.handle, ctypes.c_bool(False), ctypes.c_bool(False)) == 0:
-        check_error()
+    # set up the instrument (once for a series of measurements)
+    __voltmeter__(device_data)
     
     # read data to an internal buffer
-    if dwf.FDwfAnalogInStatus(device_data.handle, ctypes.c_bool(False), ctypes.c_int(0)) == 0:
-        check_error()
+    dwf.FDwfAnalogInStatus(device_data.handle, False, None)
     
     # extract data from that buffer
     voltage = ctypes.c_double()   # variable to store the measured voltage
-    if dwf.FDwfAnalogInStatusSample(device_data.handle, ctypes.c_int(channel - 1), ctypes.byref(voltage)) == 0:
-        check_error()
+    dwf.FDwfAnalogInStatusSample(device_data.handle, channel - 1, ctypes.byref(voltage))
     
     # store the result as float
     voltage = voltage.value
@@ -116,6 +161,66 @@ def measure(device_data, channel):
 
 """-----------------------------------------------------------------------"""
 
+def measure_channels(device_data, channels=None, average=1):
+    """
+        measure the voltages on several channels (every channel is read from the same status read)
+
+        parameters: - device data
+                    - list of the selected oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - number of status reads averaged on the host, default is 1 (no averaging)
+
+        returns:    - list of the measured voltages in Volts, one for every channel
+    """
+    if channels is None:
+        channels = range(1, device_data.analog.input.channel_count + 1)
+
+    # set up the instrument (once for a series of measurements)
+    __voltmeter__(device_data)
+    voltages = [0.0] * len(channels)
+    __sample__(device_data, channels, average, voltages)
+    return voltages
+
+"""-----------------------------------------------------------------------"""
+
+def measure_samples(device_data, count, channels=None, average=1, interval=0):
+    """
+        measure the voltages on several channels repeatedly, with the time of every measurement (needs numpy)
+
+        parameters: - device data
+                    - number of measurements
+                    - list of the selected oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - number of status reads averaged on the host for a measurement, default is 1 (no averaging)
+                    - time between the starts of two measurements in seconds, default is 0 (as fast as possible)
+
+        returns:    - numpy float64 array with the UTC time of every measurement in seconds (the middle of the averaged reads)
+                    - numpy float64 array with the measured voltages in Volts: one row for every channel, one column for every measurement
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    if channels is None:
+        channels = range(1, device_data.analog.input.channel_count + 1)
+
+    # set up the instrument (once for a series of measurements)
+    __voltmeter__(device_data)
+    times = numpy.empty(count, dtype=numpy.float64)
+    voltages = numpy.empty((len(channels), count), dtype=numpy.float64)
+    measurement = [0.0] * len(channels)
+
+    # the timestamps come from the monotonic clock, converted to UTC once
+    start = perf_counter()
+    epoch = time() - start
+    for index in range(count):
+        if interval > 0:
+            delay = start + index * interval - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        begin = perf_counter()
+        __sample__(device_data, channels, average, measurement)
+        times[index] = epoch + (begin + perf_counter()) / 2
+        voltages[:, index] = measurement
+    return times, voltages
+
+"""-----------------------------------------------------------------------"""
+
 def trigger(device_data, enable, source=trigger_source.none, channel=1, timeout=0, edge_rising=True, level=0):
     """
         set up triggering
@@ -128,78 +233,424 @@ def trigger(device_data, enable, source=trigger_source.none, channel=1, timeout=
                     - trigger edge rising - True means rising, False means falling, default is rising
                     - trigger level in Volts, default is 0V
     """
+    __state__(device_data, "scope", data).triggered = enable and source != constants.trigsrcNone
     if enable and source != constants.trigsrcNone:
         # enable/disable auto triggering
-        if dwf.FDwfAnalogInTriggerAutoTimeoutSet(device_data.handle, ctypes.c_double(timeout)) == 0:
-            check_error()
+        dwf.FDwfAnalogInTriggerAutoTimeoutSet(device_data.handle, timeout)
 
         # set trigger source
-        if dwf.FDwfAnalogInTriggerSourceSet(device_data.handle, source) == 0:
-            check_error()
+        dwf.FDwfAnalogInTriggerSourceSet(device_data.handle, source)
 
         # set trigger channel
         if source == constants.trigsrcDetectorAnalogIn:
             channel -= 1    # decrement analog channel index
-        if dwf.FDwfAnalogInTriggerChannelSet(device_data.handle, ctypes.c_int(channel)) == 0:
-            check_error()
+        dwf.FDwfAnalogInTriggerChannelSet(device_data.handle, channel)
 
         # set trigger type
-        if dwf.FDwfAnalogInTriggerTypeSet(device_data.handle, constants.trigtypeEdge) == 0:
-            check_error()
+        dwf.FDwfAnalogInTriggerTypeSet(device_data.handle, constants.trigtypeEdge)
 
         # set trigger level
-        if dwf.FDwfAnalogInTriggerLevelSet(device_data.handle, ctypes.c_double(level)) == 0:
-            check_error()
+        dwf.FDwfAnalogInTriggerLevelSet(device_data.handle, level)
 
         # set trigger edge
         if edge_rising:
             # rising edge
-            if dwf.FDwfAnalogInTriggerConditionSet(device_data.handle, constants.trigcondRisingPositive) == 0:
-                check_error()
+            dwf.FDwfAnalogInTriggerConditionSet(device_data.handle, constants.trigcondRisingPositive)
         else:
             # falling edge
-            if dwf.FDwfAnalogInTriggerConditionSet(device_data.handle, constants.trigcondFallingNegative) == 0:
-                check_error()
+            dwf.FDwfAnalogInTriggerConditionSet(device_data.handle, constants.trigcondFallingNegative)
     else:
         # turn off the trigger
-        if dwf.FDwfAnalogInTriggerSourceSet(device_data.handle, constants.trigsrcNone) == 0:
-            check_error()
+        dwf.FDwfAnalogInTriggerSourceSet(device_data.handle, constants.trigsrcNone)
     return
 
 """-----------------------------------------------------------------------"""
 
-def record(device_data, channel):
+def record(device_data, channel, as_array=False, out=None):
     """
         record an analog signal
 
         parameters: - device data
                     - the selected oscilloscope channel (1-2, or 1-4)
+                    - return a numpy array instead of a list (no copy, needs numpy), default is False
+                    - array to store the voltages in, reused between recordings (a C-contiguous numpy float64 array
+                      with buffer size elements), default is None (a new list or array)
 
-        returns:    - a list with the recorded voltages
+        returns:    - a list (or a numpy float64 array, or out) with the recorded voltages
     """
+    state = __state__(device_data, "scope", data)
+    if out is not None:
+        buffers.check(out, "float64", (state.buffer_size,), "record", "scope")
+
     # set up the instrument
-    if dwf.FDwfAnalogInConfigure(device_data.handle, ctypes.c_bool(False), ctypes.c_bool(True)) == 0:
-        check_error()
+    __start__(device_data)
     
     # read data to an internal buffer
-    while True:
-        status = ctypes.c_byte()    # variable to store buffer status
-        if dwf.FDwfAnalogInStatus(device_data.handle, ctypes.c_bool(True), ctypes.byref(status)) == 0:
-            check_error()
+    state.polls = polling.wait(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
     
-        # check internal buffer status
-        if status.value == constants.DwfStateDone.value:
-                # exit loop when ready
-                break
+    # copy buffer
+    return __get_data__(device_data, channel, as_array, out)
+
+"""-----------------------------------------------------------------------"""
+
+async def record_async(device_data, channel, timeout=None, as_array=False, out=None):
+    """
+        record an analog signal without blocking the event loop
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4)
+                    - timeout in seconds, default is None (wait until the buffer is full)
+                    - return a numpy array instead of a list (no copy, needs numpy), default is False
+                    - array to store the voltages in, see record, default is None (a new list or array)
+
+        returns:    - a list (or a numpy float64 array, or out) with the recorded voltages
+
+        raises TimeoutError if the buffer isn't filled in time, the acquisition is stopped on timeout and on cancellation
+    """
+    state = __state__(device_data, "scope", data)
+    if out is not None:
+        buffers.check(out, "float64", (state.buffer_size,), "record_async", "scope")
+
+    # set up the instrument
+    __start__(device_data)
+    
+    # read data to an internal buffer
+    try:
+        state.polls = await polling.wait_async(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency), timeout)
+    except BaseException:
+        # stop the acquisition
+        dwf.FDwfAnalogInConfigure(device_data.handle, False, False)
+        raise
     
     # copy buffer
-    buffer = (ctypes.c_double * data.buffer_size)()   # create an empty buffer
-    if dwf.FDwfAnalogInStatusData(device_data.handle, ctypes.c_int(channel - 1), buffer, ctypes.c_int(data.buffer_size)) == 0:
-        check_error()
+    return __get_data__(device_data, channel, as_array, out)
+
+"""-----------------------------------------------------------------------"""
+
+def record_channels(device_data, channels=None, out=None):
+    """
+        record several analog signals in one acquisition (the samples with the same index are simultaneous)
+
+        parameters: - device data
+                    - list of the selected oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - numpy float64 array to store the voltages in, reused between recordings (channels x buffer size),
+                      default is None (a new array)
+
+        returns:    - a numpy float64 array (or out) with the recorded voltages: one row for every selected channel (needs numpy)
+    """
+    if channels is None:
+        channels = range(1, device_data.analog.input.channel_count + 1)
+    state = __state__(device_data, "scope", data)
+    if out is not None:
+        buffers.check(out, "float64", (len(channels), state.buffer_size), "record_channels", "scope")
+
+    # set up the instrument
+    __start__(device_data)
     
-    # convert into list
-    buffer = [float(element) for element in buffer]
-    return buffer
+    # read data to an internal buffer
+    state.polls = polling.wait(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
+    
+    # copy every channel from the same acquisition
+    return __get_channels__(device_data, channels, out)
+
+"""-----------------------------------------------------------------------"""
+
+def record_raw(device_data, channel=1, out=None):
+    """
+        record the ADC values of analog signals, without converting them to Volts (needs numpy)
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4), or a list of channels (the samples with the same index are simultaneous)
+                    - numpy int16 array to store the ADC values in, reused between recordings (buffer size, or channels x buffer size),
+                      default is None (a new array)
+
+        returns:    - raw: the ADC values (data), and the scale and offset of every channel (call volts() to get the voltages)
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    channels = [channel] if isinstance(channel, int) else list(channel)
+    state = __state__(device_data, "scope", data)
+    if out is not None:
+        buffers.check(out, "int16", (state.buffer_size,) if isinstance(channel, int) else (len(channels), state.buffer_size), "record_raw", "scope")
+
+    # set up the instrument
+    __start__(device_data)
+
+    # read data to an internal buffer
+    state.polls = polling.wait(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
+
+    # copy the ADC values of every channel from the same acquisition
+    result = raw()
+    result.data = out if out is not None else numpy.empty((len(channels), state.buffer_size), dtype=numpy.int16)
+    rows = result.data.reshape(len(channels), state.buffer_size)
+    for row, selected in zip(rows, channels):
+        dwf.FDwfAnalogInStatusData16(device_data.handle, selected - 1, row.ctypes.data_as(ctypes.POINTER(ctypes.c_short)), 0, state.buffer_size)
+    if isinstance(channel, int):
+        result.data = result.data.reshape(state.buffer_size)
+
+    # the range and offset set on the device (can differ from the requested ones)
+    result.scale = numpy.empty(len(channels))
+    result.offset = numpy.empty(len(channels))
+    value = ctypes.c_double()
+    for index, selected in enumerate(channels):
+        dwf.FDwfAnalogInChannelRangeGet(device_data.handle, selected - 1, ctypes.byref(value))
+        result.scale[index] = value.value / 65536
+        dwf.FDwfAnalogInChannelOffsetGet(device_data.handle, selected - 1, ctypes.byref(value))
+        result.offset[index] = value.value
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+def capture(device_data, channel=1, out=None):
+    """
+        record analog signals with their acquisition settings (needs numpy)
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4), or a list of channels (the samples with the same index are simultaneous)
+                    - numpy float64 array to store the voltages in (buffer size, or channels x buffer size), the capture keeps it,
+                      default is None (a new array)
+
+        returns:    - captures.capture: the voltages, with the sampling frequency, range and offset set on the device,
+                      the trigger position, the channels and the UTC time of the first sample
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    channels = [channel] if isinstance(channel, int) else list(channel)
+    state = __state__(device_data, "scope", data)
+    if out is not None:
+        buffers.check(out, "float64", (state.buffer_size,) if isinstance(channel, int) else (len(channels), state.buffer_size), "capture", "scope")
+
+    # set up the instrument
+    __start__(device_data)
+
+    # read data to an internal buffer
+    state.polls = polling.wait(lambda: __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
+
+    # copy the samples
+    if isinstance(channel, int):
+        samples = __get_data__(device_data, channel, True, out)
+    else:
+        samples = __get_channels__(device_data, channels, out)
+
+    # the settings of the acquisition
+    value = ctypes.c_double()
+    dwf.FDwfAnalogInFrequencyGet(device_data.handle, ctypes.byref(value))
+    frequency = value.value
+    amplitude_range = numpy.empty(len(channels))
+    offset = numpy.empty(len(channels))
+    for index, selected in enumerate(channels):
+        dwf.FDwfAnalogInChannelRangeGet(device_data.handle, selected - 1, ctypes.byref(value))
+        amplitude_range[index] = value.value
+        dwf.FDwfAnalogInChannelOffsetGet(device_data.handle, selected - 1, ctypes.byref(value))
+        offset[index] = value.value
+    position = state.buffer_size // 2 if state.triggered else -1
+
+    # the trigger time (the start of the acquisition without trigger)
+    seconds, ticks, ticks_per_second = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+    dwf.FDwfAnalogInStatusTime(device_data.handle, ctypes.byref(seconds), ctypes.byref(ticks), ctypes.byref(ticks_per_second))
+    start = seconds.value + ticks.value / max(ticks_per_second.value, 1) - max(position, 0) / frequency
+    return captures.capture(samples, frequency, channels, position, start, amplitude_range, offset)
+
+"""-----------------------------------------------------------------------"""
+
+def record_segments(device_data, channel=1, count=10, timeout=None):
+    """
+        record several triggered acquisitions one after the other, re-arming as fast as possible (needs numpy)
+
+        parameters: - device data (set up the trigger first)
+                    - the selected oscilloscope channel (1-2, or 1-4), or a list of channels
+                    - number of segments, the length of a segment is the buffer size set in open, default is 10
+                    - timeout of the whole recording in seconds, default is None (wait for every segment)
+
+        returns:    - segments: the samples, the trigger times and the dead times between the segments
+
+        the status is read continuously (one CPU core is busy), so every segment is noticed right away,
+        and the data is copied into a preallocated array before re-arming
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    state = __state__(device_data, "scope", data)
+    channels = [channel] if isinstance(channel, int) else list(channel)
+    result = segments()
+    result.data = numpy.empty((count, len(channels), state.buffer_size), dtype=numpy.float64)
+    result.times = numpy.zeros(count, dtype=numpy.float64)
+    armed = numpy.zeros(count, dtype=numpy.float64)
+    finished = numpy.zeros(count, dtype=numpy.float64)
+
+    # the part of the buffer before the trigger has to be filled after re-arming
+    prefill = (state.buffer_size // 2) / state.sampling_frequency
+    seconds = ctypes.c_uint()
+    ticks = ctypes.c_uint()
+    ticks_per_second = ctypes.c_uint()
+    status = ctypes.c_ubyte()
+    deadline = None if timeout is None else perf_counter() + timeout
+    try:
+        for index in range(count):
+            # start the next acquisition (the settings are kept)
+            __start__(device_data)
+            armed[index] = perf_counter()
+
+            # read the status until the buffer is full
+            while True:
+                dwf.FDwfAnalogInStatus(device_data.handle, True, ctypes.byref(status))
+                if status.value == constants.DwfStateDone.value:
+                    break
+                if deadline is not None and perf_counter() > deadline:
+                    raise TimeoutError
+            finished[index] = perf_counter()
+
+            # copy the trigger time and the samples
+            dwf.FDwfAnalogInStatusTime(device_data.handle, ctypes.byref(seconds), ctypes.byref(ticks), ctypes.byref(ticks_per_second))
+            result.times[index] = seconds.value + ticks.value / max(ticks_per_second.value, 1)
+            for row, index_channel in zip(result.data[index], channels):
+                dwf.FDwfAnalogInStatusData(device_data.handle, index_channel - 1, row.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), state.buffer_size)
+            result.count = index + 1
+    except TimeoutError:
+        # stop the acquisition, keep the finished segments
+        dwf.FDwfAnalogInConfigure(device_data.handle, False, False)
+
+    # the scope can't trigger from the end of a segment until the next one is armed and prefilled
+    result.data = result.data[:result.count]
+    result.times = result.times[:result.count]
+    result.dead_time = armed[1:result.count] - finished[:max(result.count - 1, 0)] + prefill
+    if isinstance(channel, int):
+        result.data = result.data[:, 0]
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+def stream(device_data, channel=1, chunk_size=0, duration=0):
+    """
+        record analog signals continuously, without gaps if the chunks are processed in time (needs numpy)
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4), or a list of channels
+                    - number of samples in a chunk, default is 0 (the buffer size set in open)
+                    - length of the recording in seconds, default is 0 (until the generator is closed)
+
+        returns:    - a generator of chunks (the last chunk of a limited recording can be shorter)
+
+        the acquisition runs until the end of the recording, or until the loop reading the generator is left:
+        for part in scope.stream(device_data, [1, 2]): ...
+        the lost and corrupted sample counts of the whole recording are stored in device_data.scope
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    state = __state__(device_data, "scope", data)
+    channels = [channel] if isinstance(channel, int) else list(channel)
+    chunk_size = chunk_size or state.buffer_size
+    state.lost = 0
+    state.corrupted = 0
+
+    # read the status a few times while the device buffer fills (an overflow loses samples)
+    delay = min(polling.estimate(state.buffer_size, state.sampling_frequency) / 4, polling.settings.max_interval)
+    if delay < polling.settings.min_interval:
+        delay = 0
+
+    # set up the instrument
+    dwf.FDwfAnalogInAcquisitionModeSet(device_data.handle, constants.acqmodeRecord)
+    dwf.FDwfAnalogInRecordLengthSet(device_data.handle, duration)
+    __start__(device_data)
+    try:
+        status = ctypes.c_ubyte()
+        available = ctypes.c_int()
+        lost = ctypes.c_int()
+        corrupted = ctypes.c_int()
+        transfer = numpy.empty((len(channels), state.buffer_size), dtype=numpy.float64)
+        part = __new_chunk__(0, chunk_size, len(channels))
+        filled = 0
+        while True:
+            # read the new samples to an internal buffer
+            dwf.FDwfAnalogInStatus(device_data.handle, True, ctypes.byref(status))
+            dwf.FDwfAnalogInStatusRecord(device_data.handle, ctypes.byref(available), ctypes.byref(lost), ctypes.byref(corrupted))
+            state.lost += lost.value
+            state.corrupted += corrupted.value
+            part.corrupted += corrupted.value
+
+            # copy the new samples
+            if available.value > transfer.shape[1]:
+                transfer = numpy.empty((len(channels), available.value), dtype=numpy.float64)
+            for row, index in zip(transfer, channels):
+                if available.value > 0:
+                    dwf.FDwfAnalogInStatusData(device_data.handle, index - 1, row.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), available.value)
+
+            # the lost samples come before the new ones, they are marked with NaN
+            for source, count in [(None, lost.value), (transfer, available.value)]:
+                offset = 0
+                while offset < count:
+                    size = min(count - offset, chunk_size - filled)
+                    if source is None:
+                        part.data[:, filled:filled + size] = numpy.nan
+                        part.lost += size
+                    else:
+                        part.data[:, filled:filled + size] = source[:, offset:offset + size]
+                    filled += size
+                    offset += size
+                    if filled == chunk_size:
+                        yield __finish_chunk__(part, channel)
+                        part = __new_chunk__(part.sequence + 1, chunk_size, len(channels))
+                        filled = 0
+
+            # the end of a limited recording
+            if status.value == constants.DwfStateDone.value:
+                if filled > 0:
+                    part.data = part.data[:, :filled]
+                    yield __finish_chunk__(part, channel)
+                return
+            if delay > 0:
+                sleep(delay)
+    finally:
+        # stop the acquisition
+        dwf.FDwfAnalogInConfigure(device_data.handle, False, False)
+        dwf.FDwfAnalogInAcquisitionModeSet(device_data.handle, constants.acqmodeSingle)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def pipeline(device_data, channel=1, count=0, depth=2, block=True):
+    """
+        record continuously in a background thread: the next acquisition is running while the previous one is processed (needs numpy)
+
+        parameters: - device data (don't use the scope of this device in the loop)
+                    - the selected oscilloscope channel (1-2, or 1-4), or a list of channels
+                    - number of recordings, default is 0 (until the generator is closed)
+                    - number of recordings waiting in the queue, default is 2
+                    - wait for room in the queue before re-arming (True), or drop the new recording if the queue is full (False),
+                      default is True
+
+        returns:    - a generator of recordings (numpy float64 arrays, one row for every channel if a list of channels is recorded)
+
+        the arrays are reused: a recording is valid until the next one is requested, copy it to keep it
+        the number of dropped recordings is stored in device_data.scope.dropped
+        for voltages in scope.pipeline(device_data, 1): ... (break stops the acquisitions)
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    state = __state__(device_data, "scope", data)
+    channels = [channel] if isinstance(channel, int) else list(channel)
+    state.dropped = 0
+
+    # one buffer is processed, one is filled, the others wait in the queue
+    free = Queue()
+    for _ in range(depth + 2):
+        free.put(numpy.empty((len(channels), state.buffer_size), dtype=numpy.float64))
+    recordings = Queue(maxsize=depth)
+    stop = threading.Event()
+    worker = threading.Thread(target=__acquire__, args=(device_data, channels, count, block, free, recordings, stop),
+                              name="WF_SDK scope pipeline", daemon=True)
+    worker.start()
+    buffer = None
+    try:
+        while True:
+            if buffer is not None:
+                free.put(buffer)    # the previous recording is processed
+            buffer = recordings.get()
+            if buffer is None:
+                return              # every recording is done
+            if isinstance(buffer, BaseException):
+                raise buffer        # the acquisition failed
+            yield buffer[0] if isinstance(channel, int) else buffer
+    finally:
+        # stop the thread and the acquisition
+        stop.set()
+        worker.join()
+        dwf.FDwfAnalogInConfigure(device_data.handle, False, False)
+    return
 
 """-----------------------------------------------------------------------"""
 
@@ -207,6 +658,172 @@ def close(device_data):
     """
         reset the scope
     """
-    if dwf.FDwfAnalogInReset(device_data.handle) == 0:
-        check_error()
+    dwf.FDwfAnalogInReset(device_data.handle)
+    state = __state__(device_data, "scope", data)
+    state.measuring = False
+    state.triggered = False
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __start__(device_data):
+    """
+        start an acquisition (measure has to set up the instrument again)
+    """
+    __state__(device_data, "scope", data).measuring = False
+    dwf.FDwfAnalogInConfigure(device_data.handle, False, True)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __voltmeter__(device_data):
+    """
+        set up the instrument for measure, if it isn't set up yet
+    """
+    state = __state__(device_data, "scope", data)
+    if not state.measuring:
+        dwf.FDwfAnalogInConfigure(device_data.handle, False, False)
+        state.measuring = True
     return
+
+"""-----------------------------------------------------------------------"""
+
+def __sample__(device_data, channels, average, result):
+    """
+        read the last sample of several channels, averaged over several status reads
+    """
+    voltage = ctypes.c_double()   # variable to store the measured voltage
+    reference = ctypes.byref(voltage)
+    for index in range(len(channels)):
+        result[index] = 0.0
+    for _ in range(average):
+        dwf.FDwfAnalogInStatus(device_data.handle, False, None)
+        for index, channel in enumerate(channels):
+            dwf.FDwfAnalogInStatusSample(device_data.handle, channel - 1, reference)
+            result[index] += voltage.value
+    for index in range(len(channels)):
+        result[index] /= average
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __done__(device_data):
+    """
+        read the acquisition status, returns True when the buffer is full
+    """
+    status = ctypes.c_ubyte()    # variable to store buffer status
+    dwf.FDwfAnalogInStatus(device_data.handle, True, ctypes.byref(status))
+    return status.value == constants.DwfStateDone.value
+
+"""-----------------------------------------------------------------------"""
+
+def __get_data__(device_data, channel, as_array=False, out=None):
+    """
+        copy the recorded samples of a channel into a list, a numpy array, or the memory of out
+    """
+    state = __state__(device_data, "scope", data)
+
+    # the samples are written directly into out
+    if out is not None:
+        buffer = (ctypes.c_double * state.buffer_size).from_buffer(out)
+        dwf.FDwfAnalogInStatusData(device_data.handle, channel - 1, buffer, state.buffer_size)
+        return out
+
+    # the array uses the memory of the ctypes buffer (and keeps it alive)
+    if as_array:
+        import numpy              # imported here, the list return doesn't need numpy
+        buffer = (ctypes.c_double * state.buffer_size)()   # create an empty buffer
+        dwf.FDwfAnalogInStatusData(device_data.handle, channel - 1, buffer, state.buffer_size)
+        return numpy.frombuffer(buffer, dtype=numpy.float64)
+
+    # convert into list (the list is a copy, so the buffer is reused)
+    buffer = buffers.get(ctypes.c_double, state.buffer_size)
+    dwf.FDwfAnalogInStatusData(device_data.handle, channel - 1, buffer, state.buffer_size)
+    return buffer[:state.buffer_size]
+
+"""-----------------------------------------------------------------------"""
+
+def __get_channels__(device_data, channels, out=None):
+    """
+        copy the recorded samples of several channels into the rows of a numpy array
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    state = __state__(device_data, "scope", data)
+    buffer = out if out is not None else numpy.empty((len(channels), state.buffer_size), dtype=numpy.float64)
+    for row, channel in zip(buffer, channels):
+        # the rows are contiguous, FDwfAnalogInStatusData fills them directly
+        dwf.FDwfAnalogInStatusData(device_data.handle, channel - 1, row.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), state.buffer_size)
+    return buffer
+
+"""-----------------------------------------------------------------------"""
+
+def __acquire__(device_data, channels, count, block, free, recordings, stop):
+    """
+        the acquisition thread of the pipeline: arm, wait, copy into a free buffer, queue
+    """
+    state = __state__(device_data, "scope", data)
+    result = None
+    try:
+        acquired = 0
+        while not stop.is_set() and (count == 0 or acquired < count):
+            # set up the instrument
+            __start__(device_data)
+
+            # read data to an internal buffer
+            polling.wait(lambda: stop.is_set() or __done__(device_data), polling.estimate(state.buffer_size, state.sampling_frequency))
+            if stop.is_set():
+                break
+
+            # copy every channel
+            buffer = free.get()
+            for row, index in zip(buffer, channels):
+                dwf.FDwfAnalogInStatusData(device_data.handle, index - 1, row.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), state.buffer_size)
+            acquired += 1
+
+            # queue the recording
+            if block:
+                __put__(recordings, buffer, stop)
+            else:
+                try:
+                    recordings.put_nowait(buffer)
+                except Full:
+                    free.put(buffer)
+                    state.dropped += 1
+    except BaseException as exception:
+        result = exception
+    # the end of the recordings, or the error
+    __put__(recordings, result, stop)
+    return
+
+def __put__(recordings, item, stop):
+    """
+        wait for room in the queue, unless the pipeline is stopped
+    """
+    while not stop.is_set():
+        try:
+            recordings.put(item, timeout=0.1)
+            return
+        except Full:
+            pass
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __new_chunk__(sequence, chunk_size, channel_count):
+    """
+        create an empty chunk of a stream
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    part = chunk()
+    part.sequence = sequence
+    part.start = sequence * chunk_size
+    part.data = numpy.empty((channel_count, chunk_size), dtype=numpy.float64)
+    return part
+
+def __finish_chunk__(part, channel):
+    """
+        a single streamed channel gets a one dimensional array
+    """
+    if isinstance(channel, int):
+        part.data = part.data[0]
+    return part
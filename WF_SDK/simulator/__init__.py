@@ -0,0 +1,37 @@
+"""
+This module simulates Digilent Test & Measurement devices (no hardware and no WaveForms runtime is needed)
+
+select it with the WF_SDK_BACKEND=simulator environment variable, or with device.open(backend="simulator")
+"""
+
+from os import environ            # default settings
+from importlib import import_module
+
+"""-----------------------------------------------------------------------"""
+
+class settings:
+    """ simulation parameters (change them before the first device.open) """
+    # simulated devices, by the name of their capability record in WF_SDK/fixtures
+    devices = environ.get("WF_SDK_SIMULATOR_DEVICES", "Analog_Discovery_2").split(",")
+    # delay of every call which reaches the device (configuration, status and transfers) in seconds
+    latency = float(environ.get("WF_SDK_SIMULATOR_LATENCY", "0"))
+    # acquisitions and transfers take as long as on a real device, otherwise they are finished right away
+    realtime = environ.get("WF_SDK_SIMULATOR_REALTIME", "1") != "0"
+    # standard deviation of the oscilloscope noise in Volts
+    noise = 1e-03
+    # seed of the random generator, None means random
+    seed = None
+    # board temperature in °C
+    temperature = 45.0
+    # I2C devices by 7-bit address: "memory" (256 byte register map) or "temperature" (ADT7420 sensor of the Pmod TMP2)
+    i2c = {0x48: "memory", 0x4B: "temperature"}
+
+"""-----------------------------------------------------------------------"""
+
+def __getattr__(name):
+    """
+        import the simulated library on first access (it needs numpy)
+    """
+    if name == "library":
+        return import_module("WF_SDK.simulator.backend").library
+    raise AttributeError("module 'WF_SDK.simulator' has no attribute '" + name + "'")
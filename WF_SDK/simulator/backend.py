@@ -0,0 +1,1465 @@
+""" SIMULATED FDWF LIBRARY: library """
+
+import ctypes                     # import the C compatible data types
+import json                       # capability record format
+from os import path               # capability record location
+from time import perf_counter, sleep, time   # timing of the simulated acquisitions and transfers
+import numpy as np                # signal synthesis
+from WF_SDK.library import prototypes, constants, BOOL, STRING   # prototype table and constants
+from WF_SDK.simulator import settings
+
+"""-----------------------------------------------------------------------"""
+
+# internal clock frequency of the digital instruments and maximum oscilloscope sampling frequency, by device ID
+__clocks__ = {2: 100e06, 3: 100e06, 4: 800e06, 6: 125e06, 8: 100e06}
+
+# these functions reach the device, every other function is answered from the data stored in the runtime
+__status_calls__ = ["FDwfAnalogInStatus", "FDwfAnalogIOStatus", "FDwfDigitalInStatus", "FDwfDigitalIOStatus"]
+
+"""-----------------------------------------------------------------------"""
+
+class failure(Exception):
+    """
+        error of a simulated function, it is returned by FDwfGetLastError and FDwfGetLastErrorMsg
+    """
+    def __init__(self, message, code=constants.dwfercNoErc.value + 1):
+        super().__init__(message)
+        self.code = code
+        return
+
+"""-----------------------------------------------------------------------"""
+
+class library:
+    """
+        stand-in for the WaveForms runtime: every FDwf function of the prototype table is simulated
+
+        the functions are C callbacks, so the argument conversion and the error check of the library module apply unchanged
+    """
+    def __init__(self):
+        self.__engine__ = engine()
+        return
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        implementation = getattr(self.__engine__, name, None)
+        if implementation is None or name not in prototypes:
+            raise AttributeError("function '" + name + "' not found")
+        # character buffers are passed as addresses, the simulator writes them in place
+        argtypes = [ctypes.c_void_p if argtype is STRING else argtype for argtype in prototypes[name]]
+        function = ctypes.CFUNCTYPE(BOOL, *argtypes)(self.__engine__.__wrap__(name, implementation))
+        function.__name__ = name
+        setattr(self, name, function)
+        return function
+
+"""-----------------------------------------------------------------------"""
+
+class device:
+    """ a simulated device: capability record and the state of every instrument """
+    def __init__(self, name, index):
+        with open(path.join(path.dirname(path.dirname(__file__)), "fixtures", name.strip() + ".json"), "r") as file:
+            record = json.load(file)
+        self.id = record["id"]
+        self.revision = record["revision"]
+        self.name = record["name"]
+        self.version = record["version"]
+        self.serial = "SIM{:09d}".format(index)
+        self.info = record["info"]
+        self.clock = __clocks__.get(self.id, 100e06)
+        # the DIO lines of the Digital Discovery start at index 24 on the logic analyzer
+        self.dio_offset = 24 if self.id == constants.devidDDiscovery.value else 0
+        self.handle = 0
+        self.reset()
+        return
+
+    def reset(self):
+        """ put every instrument in its default state """
+        self.scope = scope(self.info["analog.input"], self.clock)
+        self.wavegen = [wavegen_channel() for _ in range(self.info["analog.output"]["channel_count"])]
+        self.analog_io = analog_io(self.info["analog.IO"])
+        self.static = static()
+        self.logic = logic(self.info["digital.input"])
+        self.pattern = pattern(self.info["digital.output"]["channel_count"])
+        self.i2c = i2c()
+        self.spi = spi()
+        self.uart = uart()
+        return
+
+"""-----------------------------------------------------------------------"""
+
+class acquisition:
+    """ timing of an acquisition (shared by the oscilloscope and the logic analyzer) """
+    def __init__(self):
+        self.start = None       # time of the first sample
+        self.event = None       # time of the trigger event
+        self.ready = None       # time when the buffer is full, None if the instrument is idle
+        self.samples = None     # recorded samples, created on the first status read after the acquisition
+        return
+
+class scope(acquisition):
+    """ oscilloscope settings """
+    def __init__(self, info, clock):
+        super().__init__()
+        self.info = info
+        count = info["channel_count"]
+        self.enabled = [True] * count
+        self.range = [min(max(5.0, info["min_range"]), info["max_range"])] * count
+        self.offset = [0.0] * count
+        self.filter = [constants.filterDecimate.value] * count
+        self.buffer_size = info["max_buffer_size"]
+        self.max_frequency = clock
+        self.frequency = clock
+        self.trigger_source = constants.trigsrcNone.value
+        self.trigger_channel = 0
+        self.trigger_type = constants.trigtypeEdge.value
+        self.trigger_level = 0.0
+        self.trigger_condition = constants.trigcondRisingPositive.value
+        self.trigger_timeout = 0.0
+        self.mode = constants.acqmodeSingle.value
+        self.record_length = 0.0    # length of a record acquisition in seconds, 0 means until stopped
+        self.position = 0           # samples of a record acquisition passed to the host (or lost)
+        self.available = 0          # samples read by the last status read of a record acquisition
+        self.lost = 0               # samples which didn't fit in the device buffer before the last status read
+        return
+
+class wavegen_channel:
+    """ waveform generator channel settings (only the carrier node shapes the signal, modulation is ignored) """
+    def __init__(self):
+        self.enabled = False
+        self.function = constants.funcDC.value
+        self.data = np.zeros(1)
+        self.frequency = 1e03
+        self.amplitude = 1.0
+        self.offset = 0.0
+        self.symmetry = 50.0
+        self.run = 0.0
+        self.wait = 0.0
+        self.repeat = 0
+        self.running = False
+        self.start = 0.0
+        return
+
+class analog_io:
+    """ power supplies, monitors and multimeter """
+    def __init__(self, info):
+        self.info = info
+        self.enabled = False
+        self.values = [[0.0] * count for count in info["node_count"]]
+        self.readings = [[0.0] * count for count in info["node_count"]]
+        return
+
+class static:
+    """ static I/O settings """
+    def __init__(self):
+        self.output = 0
+        self.enable = 0
+        self.input = 0
+        return
+
+class logic(acquisition):
+    """ logic analyzer settings """
+    def __init__(self, info):
+        super().__init__()
+        self.info = info
+        self.divider = 1
+        self.format = 16
+        self.mode = constants.acqmodeSingle.value
+        self.buffer_size = info["max_buffer_size"]
+        self.trigger_source = constants.trigsrcNone.value
+        self.position = self.buffer_size // 2   # samples after the trigger
+        self.low = 0
+        self.high = 0
+        self.rise = 0
+        self.fall = 0
+        self.trigger_timeout = 0.0
+        return
+
+class pattern_channel:
+    """ pattern generator channel settings """
+    def __init__(self):
+        self.enabled = False
+        self.type = constants.DwfDigitalOutTypePulse.value
+        self.divider = 1
+        self.idle = constants.DwfDigitalOutIdleInit.value
+        self.low = 0
+        self.high = 0
+        self.bits = np.zeros(0, dtype=np.uint8)
+        return
+
+class pattern:
+    """ pattern generator settings """
+    def __init__(self, count):
+        self.channels = [pattern_channel() for _ in range(count)]
+        self.wait = 0.0
+        self.repeat = 0
+        self.run = 0.0
+        self.running = False
+        self.start = 0.0
+        return
+
+class i2c:
+    """ I2C master settings and the responding devices """
+    def __init__(self):
+        self.rate = 100e03
+        self.stretch = True
+        self.scl = 0
+        self.sda = 0
+        self.devices = {}
+        for address, kind in settings.i2c.items():
+            self.devices[address] = temperature_sensor() if kind == "temperature" else memory()
+        return
+
+class spi:
+    """ SPI master settings, MOSI is looped back to MISO """
+    def __init__(self):
+        self.frequency = 1e06
+        self.clock = 0
+        self.data = {}
+        self.mode = 0
+        self.order = 1
+        return
+
+class uart:
+    """ UART settings, TX is looped back to RX """
+    def __init__(self):
+        self.rate = 9600.0
+        self.bits = 8
+        self.parity = 0
+        self.stop = 1.0
+        self.tx = 0
+        self.rx = 0
+        self.received = bytearray()
+        return
+
+"""-----------------------------------------------------------------------"""
+
+class memory:
+    """ I2C device with a 256 byte register map, the first written byte sets the register address """
+    def __init__(self):
+        self.registers = bytearray(256)
+        self.pointer = 0
+        return
+
+    def write(self, data):
+        if len(data) > 0:
+            self.pointer = data[0]
+            for value in data[1:]:
+                self.registers[self.pointer] = value
+                self.pointer = (self.pointer + 1) & 0xFF
+        return
+
+    def read(self, count):
+        data = bytearray()
+        for _ in range(count):
+            data.append(self.registers[self.pointer])
+            self.pointer = (self.pointer + 1) & 0xFF
+        return bytes(data)
+
+class temperature_sensor(memory):
+    """ ADT7420 temperature sensor (Pmod TMP2): temperature in registers 0-1, configuration in register 3, ID in register 11 """
+    def __init__(self):
+        super().__init__()
+        self.registers[0x0B] = 0xCB
+        return
+
+    def read(self, count):
+        if self.registers[0x03] & 0x80:
+            value = int(round(settings.temperature * 128))          # 16-bit resolution
+        else:
+            value = int(round(settings.temperature * 16)) << 3      # 13-bit resolution
+        self.registers[0x00] = (value >> 8) & 0xFF
+        self.registers[0x01] = value & 0xFF
+        return super().read(count)
+
+"""-----------------------------------------------------------------------"""
+
+class engine:
+    """ the simulated functions and the simulated devices """
+    def __init__(self):
+        self.devices = [device(name, index) for index, name in enumerate(settings.devices)]
+        self.random = np.random.default_rng(settings.seed)
+        self.next_handle = 1
+        self.last_error = ""
+        self.last_code = constants.dwfercNoErc.value
+        return
+
+    def __wrap__(self, name, implementation):
+        """ catch the errors of a function and add the latency of the device """
+        delayed = __touches_device__(name)
+        keep_error = name.startswith("FDwfGetLastError")
+
+        def call(*arguments):
+            if not keep_error:
+                self.last_error = ""
+                self.last_code = constants.dwfercNoErc.value
+            try:
+                if delayed and settings.latency > 0:
+                    __delay__(settings.latency)
+                implementation(*arguments)
+            except failure as exception:
+                self.last_error = str(exception)
+                self.last_code = exception.code
+                return 0
+            except Exception as exception:
+                self.last_error = "Simulator error: " + repr(exception)
+                self.last_code = constants.dwfercNoErc.value + 1
+                return 0
+            return 1
+        return call
+
+    def __device__(self, handle):
+        """ get an opened device by handle """
+        for candidate in self.devices:
+            if candidate.handle != 0 and candidate.handle == handle:
+                return candidate
+        raise failure("Invalid device handle")
+
+    def __enumerated__(self, index):
+        """ get a device by enumeration index """
+        if index < 0 or index >= len(self.devices):
+            raise failure("Device index out of range", 0x10)
+        return self.devices[index]
+
+    def __wait__(self, seconds):
+        """ wait for a transfer on the wire """
+        if settings.realtime and seconds > 0:
+            __delay__(seconds)
+        return
+
+    """-----------------------------------------------------------------------"""
+
+    # device
+
+    def FDwfGetLastError(self, code):
+        __set__(code, self.last_code)
+
+    def FDwfGetLastErrorMsg(self, message):
+        __write__(message, self.last_error[:511])
+
+    def FDwfGetVersion(self, version):
+        __write__(version, self.devices[0].version if len(self.devices) > 0 else "3.20.1")
+
+    def FDwfEnum(self, enum_filter, count):
+        __set__(count, len(self.devices))
+
+    def FDwfEnumDeviceType(self, index, device_id, revision):
+        candidate = self.__enumerated__(index)
+        __set__(device_id, candidate.id)
+        __set__(revision, candidate.revision)
+
+    def FDwfEnumSN(self, index, serial):
+        __write__(serial, "SN:" + self.__enumerated__(index).serial)
+
+    def FDwfEnumDeviceIsOpened(self, index, opened):
+        __set__(opened, int(self.__enumerated__(index).handle != 0))
+
+    def FDwfDeviceConfigOpen(self, index, config, handle):
+        __set__(handle, 0)
+        if index == -1:
+            candidates = [candidate for candidate in self.devices if candidate.handle == 0]
+            if len(candidates) == 0:
+                raise failure("No device available")
+            candidate = candidates[0]
+        else:
+            candidate = self.__enumerated__(index)
+            if candidate.handle != 0:
+                raise failure("The device is being used by another application", constants.dwfercNoErc.value + 3)
+        candidate.reset()
+        candidate.handle = self.next_handle
+        self.next_handle += 1
+        __set__(handle, candidate.handle)
+
+    def FDwfDeviceClose(self, handle):
+        for candidate in ([candidate for candidate in self.devices if candidate.handle != 0] if handle == -1 else [self.__device__(handle)]):
+            candidate.handle = 0
+
+    """-----------------------------------------------------------------------"""
+
+    # oscilloscope
+
+    def FDwfAnalogInReset(self, handle):
+        candidate = self.__device__(handle)
+        candidate.scope = scope(candidate.info["analog.input"], candidate.clock)
+
+    def FDwfAnalogInConfigure(self, handle, reconfigure, start):
+        candidate = self.__device__(handle)
+        if start:
+            self.__arm__(candidate, candidate.scope, self.__scope_event__)
+        else:
+            candidate.scope.ready = None
+
+    def FDwfAnalogInStatus(self, handle, read_data, status):
+        candidate = self.__device__(handle)
+        if candidate.scope.mode == constants.acqmodeRecord.value and candidate.scope.ready is not None:
+            __set__(status, self.__record__(candidate, read_data))
+            return
+        __set__(status, self.__status__(candidate.scope))
+        if read_data and candidate.scope.samples is None and __done__(candidate.scope):
+            state = candidate.scope
+            candidate.scope.samples = self.__filtered__(candidate, state.start + np.arange(state.buffer_size) / state.frequency, self.random)
+
+    def FDwfAnalogInStatusData(self, handle, channel, buffer, count):
+        state = self.__device__(handle).scope
+        __check__(channel, len(state.enabled))
+        if state.samples is not None:
+            values = state.samples[channel][:count]
+            __array__(buffer, len(values))[:] = values
+
+    def FDwfAnalogInStatusData16(self, handle, channel, buffer, first, count):
+        state = self.__device__(handle).scope
+        __check__(channel, len(state.enabled))
+        if state.samples is not None:
+            # signed 16 bit ADC values: the range is 65536 steps, 0 is the offset
+            values = state.samples[channel][first:first + count]
+            raw = np.round((values - state.offset[channel]) * 65536 / state.range[channel])
+            __array__(buffer, len(values))[:] = np.clip(raw, -32768, 32767)
+
+    def FDwfAnalogInStatusSample(self, handle, channel, voltage):
+        candidate = self.__device__(handle)
+        __check__(channel, len(candidate.scope.enabled))
+        __set__(voltage, float(self.__scope_samples__(candidate, np.array([perf_counter()]), self.random)[channel][0]))
+
+    def FDwfAnalogInStatusRecord(self, handle, available, lost, corrupted):
+        state = self.__device__(handle).scope
+        if state.mode == constants.acqmodeRecord.value:
+            __set__(available, state.available)
+            __set__(lost, state.lost)
+        else:
+            __set__(available, state.buffer_size if state.samples is not None else 0)
+            __set__(lost, 0)
+        __set__(corrupted, 0)
+
+    def FDwfAnalogInStatusTime(self, handle, seconds, ticks, ticks_per_second):
+        candidate = self.__device__(handle)
+        event = candidate.scope.event
+        if event is None or event == float("inf"):
+            event = perf_counter()
+        # the trigger time on the clock of the device, converted to UTC
+        event += time() - perf_counter()
+        __set__(seconds, int(event))
+        __set__(ticks, int((event % 1) * candidate.clock))
+        __set__(ticks_per_second, int(candidate.clock))
+
+    def FDwfAnalogInChannelCount(self, handle, count):
+        __set__(count, self.__device__(handle).info["analog.input"]["channel_count"])
+
+    def FDwfAnalogInBufferSizeInfo(self, handle, minimum, maximum):
+        info = self.__device__(handle).info["analog.input"]
+        __set__(minimum, min(16, info["max_buffer_size"]))
+        __set__(maximum, info["max_buffer_size"])
+
+    def FDwfAnalogInBitsInfo(self, handle, bits):
+        __set__(bits, self.__device__(handle).info["analog.input"]["max_resolution"])
+
+    def FDwfAnalogInChannelRangeInfo(self, handle, minimum, maximum, steps):
+        info = self.__device__(handle).info["analog.input"]
+        __set__(minimum, info["min_range"])
+        __set__(maximum, info["max_range"])
+        __set__(steps, info["steps_range"])
+
+    def FDwfAnalogInChannelOffsetInfo(self, handle, minimum, maximum, steps):
+        info = self.__device__(handle).info["analog.input"]
+        __set__(minimum, info["min_offset"])
+        __set__(maximum, info["max_offset"])
+        __set__(steps, info["steps_offset"])
+
+    def FDwfAnalogInChannelEnableSet(self, handle, channel, enable):
+        __assign__(self.__device__(handle).scope.enabled, channel, bool(enable))
+
+    def FDwfAnalogInChannelOffsetSet(self, handle, channel, offset):
+        state = self.__device__(handle).scope
+        __assign__(state.offset, channel, min(max(offset, state.info["min_offset"]), state.info["max_offset"]))
+
+    def FDwfAnalogInChannelRangeSet(self, handle, channel, amplitude_range):
+        state = self.__device__(handle).scope
+        __assign__(state.range, channel, min(max(amplitude_range, state.info["min_range"]), state.info["max_range"]))
+
+    def FDwfAnalogInChannelOffsetGet(self, handle, channel, offset):
+        state = self.__device__(handle).scope
+        __check__(channel, len(state.offset))
+        __set__(offset, state.offset[channel])
+
+    def FDwfAnalogInChannelRangeGet(self, handle, channel, amplitude_range):
+        state = self.__device__(handle).scope
+        __check__(channel, len(state.range))
+        __set__(amplitude_range, state.range[channel])
+
+    def FDwfAnalogInChannelFilterSet(self, handle, channel, filter_type):
+        __assign__(self.__device__(handle).scope.filter, channel, filter_type)
+
+    def FDwfAnalogInBufferSizeSet(self, handle, size):
+        state = self.__device__(handle).scope
+        state.buffer_size = min(max(size, 16), state.info["max_buffer_size"])
+
+    def FDwfAnalogInFrequencySet(self, handle, frequency):
+        state = self.__device__(handle).scope
+        state.frequency = min(max(frequency, 1e-03), state.max_frequency)
+
+    def FDwfAnalogInFrequencyGet(self, handle, frequency):
+        __set__(frequency, self.__device__(handle).scope.frequency)
+
+    def FDwfAnalogInAcquisitionModeSet(self, handle, mode):
+        if mode not in [constants.acqmodeSingle.value, constants.acqmodeRecord.value]:
+            raise failure("Only the single and the record acquisition modes are simulated", 0x11)
+        self.__device__(handle).scope.mode = mode
+
+    def FDwfAnalogInRecordLengthSet(self, handle, length):
+        self.__device__(handle).scope.record_length = max(length, 0.0)
+
+    def FDwfAnalogInTriggerAutoTimeoutSet(self, handle, timeout):
+        self.__device__(handle).scope.trigger_timeout = timeout
+
+    def FDwfAnalogInTriggerSourceSet(self, handle, source):
+        self.__device__(handle).scope.trigger_source = source
+
+    def FDwfAnalogInTriggerChannelSet(self, handle, channel):
+        self.__device__(handle).scope.trigger_channel = channel
+
+    def FDwfAnalogInTriggerTypeSet(self, handle, trigger_type):
+        self.__device__(handle).scope.trigger_type = trigger_type
+
+    def FDwfAnalogInTriggerLevelSet(self, handle, level):
+        self.__device__(handle).scope.trigger_level = level
+
+    def FDwfAnalogInTriggerConditionSet(self, handle, condition):
+        self.__device__(handle).scope.trigger_condition = condition
+
+    """-----------------------------------------------------------------------"""
+
+    # waveform generator
+
+    def FDwfAnalogOutReset(self, handle, channel):
+        candidate = self.__device__(handle)
+        for index in __select__(candidate.wavegen, channel):
+            candidate.wavegen[index] = wavegen_channel()
+
+    def FDwfAnalogOutConfigure(self, handle, channel, start):
+        candidate = self.__device__(handle)
+        now = perf_counter()
+        for index in __select__(candidate.wavegen, channel):
+            candidate.wavegen[index].running = bool(start)
+            candidate.wavegen[index].start = now
+
+    def FDwfAnalogOutCount(self, handle, count):
+        __set__(count, self.__device__(handle).info["analog.output"]["channel_count"])
+
+    def FDwfAnalogOutNodeInfo(self, handle, channel, nodes):
+        info = self.__device__(handle).info["analog.output"]
+        __check__(channel, info["channel_count"])
+        mask = 0
+        for index, name in enumerate(["carrier", "FM", "AM"]):
+            if name in info["node_type"][channel]:
+                mask |= 1 << index
+        __set__(nodes, mask)
+
+    def FDwfAnalogOutNodeDataInfo(self, handle, channel, node, minimum, maximum):
+        info = self.__device__(handle).info["analog.output"]
+        __check__(channel, info["channel_count"])
+        __check__(node, info["node_count"][channel])
+        __set__(minimum, 1)
+        __set__(maximum, info["max_buffer_size"][channel][node])
+
+    def FDwfAnalogOutNodeAmplitudeInfo(self, handle, channel, node, minimum, maximum):
+        self.__node_info__(handle, channel, node, "amplitude", minimum, maximum)
+
+    def FDwfAnalogOutNodeOffsetInfo(self, handle, channel, node, minimum, maximum):
+        self.__node_info__(handle, channel, node, "offset", minimum, maximum)
+
+    def FDwfAnalogOutNodeFrequencyInfo(self, handle, channel, node, minimum, maximum):
+        self.__node_info__(handle, channel, node, "frequency", minimum, maximum)
+
+    def FDwfAnalogOutNodeEnableSet(self, handle, channel, node, enable):
+        self.__node_set__(handle, channel, node, "enabled", bool(enable))
+
+    def FDwfAnalogOutNodeFunctionSet(self, handle, channel, node, function):
+        self.__node_set__(handle, channel, node, "function", function)
+
+    def FDwfAnalogOutNodeDataSet(self, handle, channel, node, data, count):
+        info = self.__device__(handle).info["analog.output"]
+        __check__(channel, info["channel_count"])
+        if count > info["max_buffer_size"][channel][0]:
+            raise failure("The buffer is too large", 0x14)
+        self.__node_set__(handle, channel, node, "data", np.clip(__array__(data, count), -1, 1).copy() if count > 0 else np.zeros(1))
+
+    def FDwfAnalogOutNodeFrequencySet(self, handle, channel, node, frequency):
+        self.__node_set__(handle, channel, node, "frequency", self.__clamp__(handle, channel, "frequency", frequency))
+
+    def FDwfAnalogOutNodeAmplitudeSet(self, handle, channel, node, amplitude):
+        self.__node_set__(handle, channel, node, "amplitude", self.__clamp__(handle, channel, "amplitude", amplitude))
+
+    def FDwfAnalogOutNodeOffsetSet(self, handle, channel, node, offset):
+        self.__node_set__(handle, channel, node, "offset", self.__clamp__(handle, channel, "offset", offset))
+
+    def FDwfAnalogOutNodeSymmetrySet(self, handle, channel, node, symmetry):
+        self.__node_set__(handle, channel, node, "symmetry", min(max(symmetry, 0.0), 100.0))
+
+    def FDwfAnalogOutRunSet(self, handle, channel, run):
+        candidate = self.__device__(handle)
+        for index in __select__(candidate.wavegen, channel):
+            candidate.wavegen[index].run = run
+
+    def FDwfAnalogOutWaitSet(self, handle, channel, wait):
+        candidate = self.__device__(handle)
+        for index in __select__(candidate.wavegen, channel):
+            candidate.wavegen[index].wait = wait
+
+    def FDwfAnalogOutRepeatSet(self, handle, channel, repeat):
+        candidate = self.__device__(handle)
+        for index in __select__(candidate.wavegen, channel):
+            candidate.wavegen[index].repeat = repeat
+
+    def __node_info__(self, handle, channel, node, name, minimum, maximum):
+        """ answer an info query of a wavegen node from the capability record """
+        info = self.__device__(handle).info["analog.output"]
+        __check__(channel, info["channel_count"])
+        __check__(node, info["node_count"][channel])
+        __set__(minimum, info["min_" + name][channel][node])
+        __set__(maximum, info["max_" + name][channel][node])
+        return
+
+    def __node_set__(self, handle, channel, node, name, value):
+        """ set a wavegen parameter, only the carrier node changes the signal """
+        candidate = self.__device__(handle)
+        for index in __select__(candidate.wavegen, channel):
+            __check__(node, 3)
+            if node == constants.AnalogOutNodeCarrier.value:
+                setattr(candidate.wavegen[index], name, value)
+        return
+
+    def __clamp__(self, handle, channel, name, value):
+        """ limit a carrier parameter to the range of the device """
+        info = self.__device__(handle).info["analog.output"]
+        channel = max(channel, 0)
+        __check__(channel, info["channel_count"])
+        return min(max(value, info["min_" + name][channel][0]), info["max_" + name][channel][0])
+
+    """-----------------------------------------------------------------------"""
+
+    # analog IO
+
+    def FDwfAnalogIOReset(self, handle):
+        candidate = self.__device__(handle)
+        candidate.analog_io = analog_io(candidate.info["analog.IO"])
+
+    def FDwfAnalogIOEnableSet(self, handle, enable):
+        self.__device__(handle).analog_io.enabled = bool(enable)
+
+    def FDwfAnalogIOStatus(self, handle):
+        candidate = self.__device__(handle)
+        state = candidate.analog_io
+        for channel in range(len(state.values)):
+            for node in range(len(state.values[channel])):
+                state.readings[channel][node] = self.__reading__(candidate, channel, node)
+
+    def FDwfAnalogIOChannelCount(self, handle, count):
+        __set__(count, self.__device__(handle).info["analog.IO"]["channel_count"])
+
+    def FDwfAnalogIOChannelName(self, handle, channel, name, label):
+        info = self.__device__(handle).info["analog.IO"]
+        __check__(channel, info["channel_count"])
+        __write__(name, info["channel_name"][channel])
+        __write__(label, info["channel_label"][channel])
+
+    def FDwfAnalogIOChannelInfo(self, handle, channel, count):
+        info = self.__device__(handle).info["analog.IO"]
+        __check__(channel, info["channel_count"])
+        __set__(count, info["node_count"][channel])
+
+    def FDwfAnalogIOChannelNodeName(self, handle, channel, node, name, unit):
+        info = self.__io_info__(handle, channel, node)
+        __write__(name, info["node_name"][channel][node])
+        __write__(unit, info["node_unit"][channel][node])
+
+    def FDwfAnalogIOChannelNodeSetInfo(self, handle, channel, node, minimum, maximum, steps):
+        info = self.__io_info__(handle, channel, node)
+        __set__(minimum, info["min_set_range"][channel][node])
+        __set__(maximum, info["max_set_range"][channel][node])
+        __set__(steps, info["set_steps"][channel][node])
+
+    def FDwfAnalogIOChannelNodeStatusInfo(self, handle, channel, node, minimum, maximum, steps):
+        info = self.__io_info__(handle, channel, node)
+        __set__(minimum, info["min_read_range"][channel][node])
+        __set__(maximum, info["max_read_range"][channel][node])
+        __set__(steps, info["read_steps"][channel][node])
+
+    def FDwfAnalogIOChannelNodeSet(self, handle, channel, node, value):
+        info = self.__io_info__(handle, channel, node)
+        minimum = info["min_set_range"][channel][node]
+        maximum = info["max_set_range"][channel][node]
+        if minimum < maximum:
+            value = min(max(value, minimum), maximum)
+        self.__device__(handle).analog_io.values[channel][node] = value
+
+    def FDwfAnalogIOChannelNodeGet(self, handle, channel, node, value):
+        self.__io_info__(handle, channel, node)
+        __set__(value, self.__device__(handle).analog_io.values[channel][node])
+
+    def FDwfAnalogIOChannelNodeStatus(self, handle, channel, node, value):
+        self.__io_info__(handle, channel, node)
+        __set__(value, self.__device__(handle).analog_io.readings[channel][node])
+
+    def __io_info__(self, handle, channel, node):
+        """ check the indexes of an analog IO node """
+        info = self.__device__(handle).info["analog.IO"]
+        __check__(channel, info["channel_count"])
+        __check__(node, info["node_count"][channel])
+        return info
+
+    def __reading__(self, candidate, channel, node):
+        """ simulated reading of an analog IO node """
+        state = candidate.analog_io
+        label = state.info["channel_label"][channel]
+        names = state.info["node_name"][channel]
+        name = names[node]
+        if name == "Temp":
+            return settings.temperature + self.random.normal(0, 0.1)
+        if label == "DMM":
+            return self.__multimeter__(candidate) if name == "Meas" else state.values[channel][node]
+        if "Enable" in names:
+            # power supply: the output follows the settings
+            enabled = state.enabled and state.values[channel][names.index("Enable")] != 0
+            if name == "Voltage":
+                return (state.values[channel][node] if enabled else 0.0) + self.random.normal(0, 1e-03)
+            if name == "Current":
+                return (1e-03 if enabled else 0.0) + abs(self.random.normal(0, 1e-05))
+            return state.values[channel][node]
+        # monitors
+        if name == "Voltage":
+            return (5.0 if label == "USB" else 0.0) + self.random.normal(0, 1e-03)
+        if name == "Current":
+            return (0.2 if label == "USB" else 0.0) + abs(self.random.normal(0, 1e-04))
+        return state.values[channel][node]
+
+    def __multimeter__(self, candidate):
+        """ simulated multimeter reading: the voltage modes measure the first wavegen channel """
+        state = candidate.analog_io
+        names = state.info["node_name"][state.info["channel_label"].index("DMM")]
+        mode = state.values[state.info["channel_label"].index("DMM")][names.index("Mode")]
+        noise = self.random.normal(0, 1e-04)
+        if mode in [constants.DwfDmmDCVoltage.value, constants.DwfDmmACVoltage.value]:
+            if len(candidate.wavegen) == 0:
+                return noise
+            channel = candidate.wavegen[0]
+            period = 1 / channel.frequency if channel.frequency > 0 else 1e-03
+            values = __wave__(channel, perf_counter() + np.arange(4096) * period / 4096, self.random)
+            if mode == constants.DwfDmmDCVoltage.value:
+                return float(np.mean(values)) + noise
+            return float(np.std(values)) + abs(noise)
+        if mode == constants.DwfDmmResistance.value:
+            return 10e03 + noise
+        if mode == constants.DwfDmmContinuity.value:
+            return 0.1 + abs(noise)
+        if mode == constants.DwfDmmDiode.value:
+            return 0.6 + noise
+        if mode == constants.DwfDmmTemperature.value:
+            return 25.0 + noise
+        return abs(noise)    # no load on the current inputs
+
+    """-----------------------------------------------------------------------"""
+
+    # static I/O
+
+    def FDwfDigitalIOReset(self, handle):
+        self.__device__(handle).static = static()
+
+    def FDwfDigitalIOOutputEnableSet(self, handle, mask):
+        self.__device__(handle).static.enable = mask
+
+    def FDwfDigitalIOOutputEnableGet(self, handle, mask):
+        __set__(mask, self.__device__(handle).static.enable)
+
+    def FDwfDigitalIOOutputSet(self, handle, mask):
+        self.__device__(handle).static.output = mask
+
+    def FDwfDigitalIOOutputGet(self, handle, mask):
+        __set__(mask, self.__device__(handle).static.output)
+
+    def FDwfDigitalIOStatus(self, handle):
+        candidate = self.__device__(handle)
+        candidate.static.input = int(self.__outputs__(candidate, np.array([perf_counter()]), self.random)[0]) & 0xFFFFFFFF
+
+    def FDwfDigitalIOInputStatus(self, handle, mask):
+        __set__(mask, self.__device__(handle).static.input)
+
+    """-----------------------------------------------------------------------"""
+
+    # logic analyzer
+
+    def FDwfDigitalInReset(self, handle):
+        candidate = self.__device__(handle)
+        candidate.logic = logic(candidate.info["digital.input"])
+
+    def FDwfDigitalInConfigure(self, handle, reconfigure, start):
+        candidate = self.__device__(handle)
+        if start:
+            self.__arm__(candidate, candidate.logic, self.__logic_event__)
+        else:
+            candidate.logic.ready = None
+
+    def FDwfDigitalInStatus(self, handle, read_data, status):
+        candidate = self.__device__(handle)
+        state = candidate.logic
+        __set__(status, self.__status__(state))
+        if read_data and state.samples is None and __done__(state):
+            times = state.start + np.arange(state.buffer_size) * state.divider / candidate.clock
+            state.samples = self.__lines__(candidate, times, self.random).astype({8: np.uint8, 16: np.uint16}.get(state.format, np.uint32))
+
+    def FDwfDigitalInStatusData(self, handle, buffer, size):
+        state = self.__device__(handle).logic
+        if state.samples is not None and buffer:
+            ctypes.memmove(buffer, state.samples.ctypes.data, min(size, state.samples.nbytes))
+
+    def FDwfDigitalInStatusRecord(self, handle, available, lost, corrupted):
+        state = self.__device__(handle).logic
+        __set__(available, state.buffer_size if state.samples is not None else 0)
+        __set__(lost, 0)
+        __set__(corrupted, 0)
+
+    def FDwfDigitalInInternalClockInfo(self, handle, frequency):
+        __set__(frequency, self.__device__(handle).clock)
+
+    def FDwfDigitalInAcquisitionModeSet(self, handle, mode):
+        self.__device__(handle).logic.mode = mode
+
+    def FDwfDigitalInDividerSet(self, handle, divider):
+        self.__device__(handle).logic.divider = max(divider, 1)
+
+    def FDwfDigitalInDividerGet(self, handle, divider):
+        __set__(divider, self.__device__(handle).logic.divider)
+
+    def FDwfDigitalInSampleFormatSet(self, handle, bits):
+        if bits not in [8, 16, 32]:
+            raise failure("Invalid sample format", 0x11)
+        self.__device__(handle).logic.format = bits
+
+    def FDwfDigitalInBitsInfo(self, handle, bits):
+        __set__(bits, self.__device__(handle).info["digital.input"]["channel_count"])
+
+    def FDwfDigitalInBufferSizeInfo(self, handle, size):
+        __set__(size, self.__device__(handle).info["digital.input"]["max_buffer_size"])
+
+    def FDwfDigitalInBufferSizeSet(self, handle, size):
+        state = self.__device__(handle).logic
+        state.buffer_size = min(max(size, 16), state.info["max_buffer_size"])
+
+    def FDwfDigitalInTriggerSourceSet(self, handle, source):
+        self.__device__(handle).logic.trigger_source = source
+
+    def FDwfDigitalInTriggerPositionSet(self, handle, position):
+        self.__device__(handle).logic.position = position
+
+    def FDwfDigitalInTriggerPrefillSet(self, handle, prefill):
+        return
+
+    def FDwfDigitalInTriggerSet(self, handle, low, high, rise, fall):
+        state = self.__device__(handle).logic
+        state.low, state.high, state.rise, state.fall = low, high, rise, fall
+
+    def FDwfDigitalInTriggerResetSet(self, handle, low, high, rise, fall):
+        self.__device__(handle)
+
+    def FDwfDigitalInTriggerAutoTimeoutSet(self, handle, timeout):
+        self.__device__(handle).logic.trigger_timeout = timeout
+
+    def FDwfDigitalInTriggerLengthSet(self, handle, minimum, maximum, sync):
+        self.__device__(handle)
+
+    def FDwfDigitalInTriggerCountSet(self, handle, count, restart):
+        self.__device__(handle)
+
+    """-----------------------------------------------------------------------"""
+
+    # pattern generator
+
+    def FDwfDigitalOutReset(self, handle):
+        candidate = self.__device__(handle)
+        candidate.pattern = pattern(len(candidate.pattern.channels))
+
+    def FDwfDigitalOutConfigure(self, handle, start):
+        state = self.__device__(handle).pattern
+        state.running = bool(start)
+        state.start = perf_counter()
+
+    def FDwfDigitalOutCount(self, handle, count):
+        __set__(count, len(self.__device__(handle).pattern.channels))
+
+    def FDwfDigitalOutDataInfo(self, handle, channel, size):
+        candidate = self.__device__(handle)
+        __check__(channel, len(candidate.pattern.channels))
+        __set__(size, candidate.info["digital.output"]["max_buffer_size"])
+
+    def FDwfDigitalOutInternalClockInfo(self, handle, frequency):
+        __set__(frequency, self.__device__(handle).clock)
+
+    def FDwfDigitalOutCounterInfo(self, handle, channel, minimum, maximum):
+        __check__(channel, len(self.__device__(handle).pattern.channels))
+        __set__(minimum, 0)
+        __set__(maximum, 32768)
+
+    def FDwfDigitalOutEnableSet(self, handle, channel, enable):
+        self.__pattern_channel__(handle, channel).enabled = bool(enable)
+
+    def FDwfDigitalOutTypeSet(self, handle, channel, output_type):
+        self.__pattern_channel__(handle, channel).type = output_type
+
+    def FDwfDigitalOutDividerSet(self, handle, channel, divider):
+        self.__pattern_channel__(handle, channel).divider = max(divider, 1)
+
+    def FDwfDigitalOutIdleSet(self, handle, channel, idle):
+        self.__pattern_channel__(handle, channel).idle = idle
+
+    def FDwfDigitalOutCounterSet(self, handle, channel, low, high):
+        state = self.__pattern_channel__(handle, channel)
+        state.low, state.high = low, high
+
+    def FDwfDigitalOutDataSet(self, handle, channel, data, count):
+        state = self.__pattern_channel__(handle, channel)
+        if count > self.__device__(handle).info["digital.output"]["max_buffer_size"]:
+            raise failure("The buffer is too large", 0x13)
+        packed = np.frombuffer(ctypes.string_at(data, (count + 7) >> 3), dtype=np.uint8) if count > 0 else np.zeros(0, dtype=np.uint8)
+        state.bits = np.unpackbits(packed, bitorder="little")[:count]
+
+    def FDwfDigitalOutWaitSet(self, handle, wait):
+        self.__device__(handle).pattern.wait = wait
+
+    def FDwfDigitalOutRepeatSet(self, handle, repeat):
+        self.__device__(handle).pattern.repeat = repeat
+
+    def FDwfDigitalOutRunSet(self, handle, run):
+        self.__device__(handle).pattern.run = run
+
+    def FDwfDigitalOutRepeatTriggerSet(self, handle, enable):
+        self.__device__(handle)
+
+    def FDwfDigitalOutTriggerSourceSet(self, handle, source):
+        self.__device__(handle)
+
+    def FDwfDigitalOutTriggerSlopeSet(self, handle, slope):
+        self.__device__(handle)
+
+    def __pattern_channel__(self, handle, channel):
+        """ get the settings of a pattern generator channel """
+        channels = self.__device__(handle).pattern.channels
+        __check__(channel, len(channels))
+        return channels[channel]
+
+    """-----------------------------------------------------------------------"""
+
+    # I2C
+
+    def FDwfDigitalI2cReset(self, handle):
+        self.__device__(handle).i2c = i2c()
+
+    def FDwfDigitalI2cClear(self, handle, free):
+        self.__device__(handle)
+        __set__(free, 1)    # the bus is never locked up
+
+    def FDwfDigitalI2cStretchSet(self, handle, enable):
+        self.__device__(handle).i2c.stretch = bool(enable)
+
+    def FDwfDigitalI2cRateSet(self, handle, rate):
+        self.__device__(handle).i2c.rate = rate
+
+    def FDwfDigitalI2cSclSet(self, handle, channel):
+        self.__device__(handle).i2c.scl = channel
+
+    def FDwfDigitalI2cSdaSet(self, handle, channel):
+        self.__device__(handle).i2c.sda = channel
+
+    def FDwfDigitalI2cWrite(self, handle, address, data, count, nak):
+        state = self.__device__(handle).i2c
+        self.__wait__((count + 1) * 9 / state.rate)
+        responder = self.__responder__(state, address, nak)
+        if responder is not None:
+            responder.write(ctypes.string_at(data, count) if count > 0 else b"")
+
+    def FDwfDigitalI2cRead(self, handle, address, data, count, nak):
+        state = self.__device__(handle).i2c
+        self.__wait__((count + 1) * 9 / state.rate)
+        responder = self.__responder__(state, address, nak)
+        if responder is not None and count > 0:
+            ctypes.memmove(data, responder.read(count), count)
+
+    def FDwfDigitalI2cWriteRead(self, handle, address, tx_data, tx_count, rx_data, rx_count, nak):
+        state = self.__device__(handle).i2c
+        self.__wait__((tx_count + rx_count + 2) * 9 / state.rate)
+        responder = self.__responder__(state, address, nak)
+        if responder is not None:
+            responder.write(ctypes.string_at(tx_data, tx_count) if tx_count > 0 else b"")
+            if rx_count > 0:
+                ctypes.memmove(rx_data, responder.read(rx_count), rx_count)
+
+    def __responder__(self, state, address, nak):
+        """ find the I2C device at an 8-bit address, a missing device doesn't acknowledge the address byte """
+        address = address >> 1
+        if address == 0:
+            # general call: acknowledged if there is any device on the bus
+            __set__(nak, 0 if len(state.devices) > 0 else 1)
+            return None
+        responder = state.devices.get(address)
+        __set__(nak, 0 if responder is not None else 1)
+        return responder
+
+    """-----------------------------------------------------------------------"""
+
+    # SPI
+
+    def FDwfDigitalSpiReset(self, handle):
+        self.__device__(handle).spi = spi()
+
+    def FDwfDigitalSpiFrequencySet(self, handle, frequency):
+        self.__device__(handle).spi.frequency = frequency
+
+    def FDwfDigitalSpiClockSet(self, handle, channel):
+        self.__device__(handle).spi.clock = channel
+
+    def FDwfDigitalSpiDataSet(self, handle, index, channel):
+        self.__device__(handle).spi.data[index] = channel
+
+    def FDwfDigitalSpiIdleSet(self, handle, index, idle):
+        self.__device__(handle)
+
+    def FDwfDigitalSpiModeSet(self, handle, mode):
+        self.__device__(handle).spi.mode = mode
+
+    def FDwfDigitalSpiOrderSet(self, handle, order):
+        self.__device__(handle).spi.order = order
+
+    def FDwfDigitalSpiSelect(self, handle, channel, level):
+        self.__device__(handle)
+
+    def FDwfDigitalSpiWriteOne(self, handle, mode, bits, value):
+        state = self.__device__(handle).spi
+        self.__wait__(bits / state.frequency)
+
+    def FDwfDigitalSpiRead(self, handle, mode, bits, data, count):
+        state = self.__device__(handle).spi
+        self.__wait__(count * bits / state.frequency)
+        if count > 0:
+            ctypes.memset(data, 0, count)   # MOSI is idle (low) during a read
+
+    def FDwfDigitalSpiWrite(self, handle, mode, bits, data, count):
+        state = self.__device__(handle).spi
+        self.__wait__(count * bits / state.frequency)
+
+    def FDwfDigitalSpiWriteRead(self, handle, mode, bits, tx_data, tx_count, rx_data, rx_count):
+        state = self.__device__(handle).spi
+        self.__wait__(max(tx_count, rx_count) * bits / state.frequency)
+        received = (ctypes.string_at(tx_data, tx_count) if tx_count > 0 else b"")[:rx_count].ljust(rx_count, b"\x00")
+        if rx_count > 0:
+            ctypes.memmove(rx_data, received, rx_count)
+
+    """-----------------------------------------------------------------------"""
+
+    # UART
+
+    def FDwfDigitalUartReset(self, handle):
+        self.__device__(handle).uart = uart()
+
+    def FDwfDigitalUartRateSet(self, handle, rate):
+        self.__device__(handle).uart.rate = rate
+
+    def FDwfDigitalUartBitsSet(self, handle, bits):
+        self.__device__(handle).uart.bits = bits
+
+    def FDwfDigitalUartParitySet(self, handle, parity):
+        self.__device__(handle).uart.parity = parity
+
+    def FDwfDigitalUartStopSet(self, handle, stop):
+        self.__device__(handle).uart.stop = stop
+
+    def FDwfDigitalUartTxSet(self, handle, channel):
+        self.__device__(handle).uart.tx = channel
+
+    def FDwfDigitalUartRxSet(self, handle, channel):
+        self.__device__(handle).uart.rx = channel
+
+    def FDwfDigitalUartTx(self, handle, data, count):
+        state = self.__device__(handle).uart
+        if data and count > 0:
+            self.__wait__(count * (1 + state.bits + (state.parity != 0) + state.stop) / state.rate)
+            state.received.extend(ctypes.string_at(data, count))
+
+    def FDwfDigitalUartRx(self, handle, data, size, count, parity):
+        state = self.__device__(handle).uart
+        if not data or size <= 0:
+            # initialize the receiver
+            state.received = bytearray()
+            __set__(count, 0)
+        else:
+            received = bytes(state.received[:size])
+            del state.received[:size]
+            ctypes.memmove(data, received, len(received))
+            __set__(count, len(received))
+        __set__(parity, 0)
+
+    """-----------------------------------------------------------------------"""
+
+    # tools
+
+    def FDwfSpectrumWindow(self, window, count, window_type, beta, noise_bandwidth):
+        values = __window__(window_type, count, beta)
+        __array__(window, count)[:] = values
+        __set__(noise_bandwidth, float(count * np.sum(values ** 2) / np.sum(values) ** 2) if count > 0 else 0.0)
+
+    def FDwfSpectrumTransform(self, data, count, magnitude, phase, spectrum_count, start, stop):
+        spectrum = np.fft.rfft(__array__(data, count)) / count
+        spectrum[1:] *= 2   # single-sided amplitude
+        if spectrum_count != len(spectrum) or start != 0 or stop != 1:
+            # evaluate the requested frequency range (normalized to the Nyquist frequency)
+            bins = np.linspace(start, stop, spectrum_count) * (len(spectrum) - 1)
+            indexes = np.arange(len(spectrum))
+            spectrum = np.interp(bins, indexes, spectrum.real) + 1j * np.interp(bins, indexes, spectrum.imag)
+        if magnitude:
+            __array__(magnitude, spectrum_count)[:] = np.abs(spectrum)
+        if phase:
+            __array__(phase, spectrum_count)[:] = np.angle(spectrum)
+
+    """-----------------------------------------------------------------------"""
+
+    # acquisitions
+
+    def __arm__(self, candidate, state, find_event):
+        """ start an acquisition, the trigger event is searched in the simulated signals """
+        now = perf_counter()
+        if isinstance(state, scope):
+            period = 1 / state.frequency
+            before = state.buffer_size // 2 if state.trigger_source != constants.trigsrcNone.value else 0
+        else:
+            period = state.divider / candidate.clock
+            before = max(state.buffer_size - state.position, 0) if state.trigger_source != constants.trigsrcNone.value else 0
+        event = find_event(candidate, now + before * period)
+        if event is None:
+            # no trigger event: wait for the auto trigger, or forever
+            event = now + before * period + state.trigger_timeout if state.trigger_timeout > 0 else float("inf")
+        state.start = event - before * period
+        state.event = event
+        state.ready = event + (state.buffer_size - before) * period
+        state.samples = None
+        if isinstance(state, scope):
+            state.position = state.available = state.lost = 0
+        return
+
+    def __status__(self, state):
+        """ the state of an acquisition """
+        if state.ready is None:
+            return constants.DwfStateReady.value
+        if __done__(state):
+            return constants.DwfStateDone.value
+        if perf_counter() >= state.event:
+            return constants.DwfStateTriggered.value
+        return constants.DwfStateArmed.value
+
+    def __record__(self, candidate, read_data):
+        """ status read of a record acquisition: the samples since the previous read, the oldest ones are lost if the device buffer overflowed """
+        state = candidate.scope
+        total = round(state.record_length * state.frequency) if state.record_length > 0 else None
+        state.available = state.lost = 0
+        if state.start == float("inf"):
+            return constants.DwfStateArmed.value
+        if settings.realtime:
+            produced = max(int((perf_counter() - state.start) * state.frequency), 0)
+        else:
+            produced = state.position + state.buffer_size    # the host always keeps up
+        if total is not None:
+            produced = min(produced, total)
+        if read_data:
+            state.lost = max(produced - state.position - state.buffer_size, 0)
+            state.position += state.lost
+            state.available = produced - state.position
+            times = state.start + (state.position + np.arange(state.available)) / state.frequency
+            state.samples = self.__filtered__(candidate, times, self.random)
+            state.position = produced
+        if total is not None and state.position >= total:
+            return constants.DwfStateDone.value
+        if produced == 0:
+            return constants.DwfStateArmed.value
+        return constants.DwfStateRunning.value
+
+    def __scope_event__(self, candidate, earliest):
+        """ time of the first trigger event of the oscilloscope after the earliest time, or None """
+        state = candidate.scope
+        if state.trigger_source == constants.trigsrcNone.value:
+            return earliest
+        if state.trigger_source != constants.trigsrcDetectorAnalogIn.value:
+            return earliest     # the other sources are always ready
+        if state.trigger_channel >= len(candidate.wavegen):
+            return None
+        channel = candidate.wavegen[state.trigger_channel]
+        if not (channel.running and channel.enabled):
+            return None
+        window = max(channel.start + channel.wait - earliest, 0) + state.buffer_size / state.frequency
+        if channel.frequency > 0:
+            window += 1.01 / channel.frequency
+        times = __grid__(earliest, window, state.frequency)
+        values = __wave__(channel, times)
+        if state.trigger_condition == constants.trigcondRisingPositive.value:
+            hits = np.flatnonzero((values[:-1] < state.trigger_level) & (values[1:] >= state.trigger_level))
+        else:
+            hits = np.flatnonzero((values[:-1] > state.trigger_level) & (values[1:] <= state.trigger_level))
+        return float(times[hits[0] + 1]) if len(hits) > 0 else None
+
+    def __logic_event__(self, candidate, earliest):
+        """ time of the first trigger event of the logic analyzer after the earliest time, or None """
+        state = candidate.logic
+        if state.trigger_source == constants.trigsrcNone.value:
+            return earliest
+        if state.trigger_source != constants.trigsrcDetectorDigitalIn.value:
+            return earliest
+        frequency = candidate.clock / state.divider
+        window = state.buffer_size / frequency
+        if candidate.pattern.running:
+            window += max(candidate.pattern.start + candidate.pattern.wait - earliest, 0)
+            for channel in candidate.pattern.channels:
+                if channel.enabled:
+                    length = channel.low + channel.high if channel.type == constants.DwfDigitalOutTypePulse.value else len(channel.bits)
+                    window = max(window, 1.01 * length * channel.divider / candidate.clock)
+        times = __grid__(earliest, window, frequency)
+        lines = self.__lines__(candidate, times)
+        previous, current = lines[:-1], lines[1:]
+        if state.rise != 0 or state.fall != 0:
+            hits = ((~previous & current & np.uint32(state.rise)) | (previous & ~current & np.uint32(state.fall))) != 0
+        elif state.low != 0 or state.high != 0:
+            hits = ((current & np.uint32(state.low)) == 0) & ((current & np.uint32(state.high)) == state.high)
+        else:
+            return earliest
+        hits = np.flatnonzero(hits)
+        return float(times[hits[0] + 1]) if len(hits) > 0 else None
+
+    def __scope_samples__(self, candidate, times, random):
+        """ oscilloscope samples: the wavegen channels are looped back to the scope channels """
+        state = candidate.scope
+        samples = np.zeros((len(state.enabled), len(times)))
+        for index in range(len(state.enabled)):
+            if index < len(candidate.wavegen):
+                samples[index] = __wave__(candidate.wavegen[index], times, random)
+            samples[index] += random.normal(0, settings.noise, len(times))
+            # clip to the input range and quantize with the resolution of the ADC
+            low = state.offset[index] - state.range[index] / 2
+            step = state.range[index] / 2 ** state.info["max_resolution"]
+            samples[index] = np.round((np.clip(samples[index], low, low + state.range[index]) - low) / step) * step + low
+            if not state.enabled[index]:
+                samples[index] = 0
+        return samples
+
+    def __filtered__(self, candidate, times, random):
+        """ oscilloscope samples with the acquisition filters: the input is sampled several times in every sample period """
+        state = candidate.scope
+        samples = self.__scope_samples__(candidate, times, random)
+        factor = int(state.max_frequency / state.frequency)
+        if factor < 2 or all(value == constants.filterDecimate.value for value in state.filter):
+            return samples
+        steps = max(min(factor, 16, 4000000 // max(len(times), 1)), 1)   # the memory use is limited
+        fine = times[:, None] + np.arange(steps) / (steps * state.frequency)
+        fine = self.__scope_samples__(candidate, fine.ravel(), random).reshape(len(state.enabled), len(times), steps)
+        for index, value in enumerate(state.filter):
+            if value == constants.filterAverage.value:
+                samples[index] = fine[index].mean(axis=1)
+            elif value == constants.filterMinMax.value:
+                # the samples are the minimum and the maximum of their periods, alternately
+                samples[index, 0::2] = fine[index, 0::2].min(axis=1)
+                samples[index, 1::2] = fine[index, 1::2].max(axis=1)
+        return samples
+
+    def __outputs__(self, candidate, times, random=None):
+        """ state of the DIO lines (pattern generator or static I/O), one bit per line """
+        lines = np.zeros(len(times), dtype=np.uint64)
+        driven = candidate.static.output & candidate.static.enable
+        for index, channel in enumerate(candidate.pattern.channels):
+            values = __pattern__(candidate.pattern, channel, times, candidate.clock, random)
+            if values is None:
+                if (driven >> index) & 1:
+                    lines |= np.uint64(1 << index)
+            else:
+                lines |= values.astype(np.uint64) << np.uint64(index)
+        return lines
+
+    def __lines__(self, candidate, times, random=None):
+        """ state of the DIO lines in the bit order of the logic analyzer """
+        lines = self.__outputs__(candidate, times, random) << np.uint64(candidate.dio_offset)
+        return (lines & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+"""-----------------------------------------------------------------------"""
+
+def __wave__(channel, times, random=None):
+    """
+        voltage of a wavegen channel at the given times (noise is flat without a random generator)
+    """
+    values = np.zeros(len(times))
+    if not (channel.running and channel.enabled):
+        return values
+    local = times - channel.start - channel.wait
+    active = local >= 0
+    if channel.run > 0 and channel.repeat > 0:
+        active &= local < channel.run * channel.repeat
+    phase = np.mod(local * channel.frequency, 1.0)
+    symmetry = channel.symmetry / 100
+    function = channel.function
+    if function == constants.funcDC.value:
+        shape = np.zeros(len(times))
+    elif function == constants.funcSine.value:
+        shape = np.sin(2 * np.pi * phase)
+    elif function == constants.funcSquare.value:
+        shape = np.where(phase < symmetry, 1.0, -1.0)
+    elif function == constants.funcTriangle.value:
+        shape = np.where(phase < symmetry, -1 + 2 * phase / max(symmetry, 1e-12), 1 - 2 * (phase - symmetry) / max(1 - symmetry, 1e-12))
+    elif function == constants.funcRampUp.value:
+        shape = 2 * phase - 1
+    elif function == constants.funcRampDown.value:
+        shape = 1 - 2 * phase
+    elif function == constants.funcNoise.value:
+        shape = random.uniform(-1, 1, len(times)) if random is not None else np.zeros(len(times))
+    elif function == constants.funcPulse.value:
+        shape = np.where(phase < symmetry, 1.0, 0.0)
+    elif function == constants.funcTrapezium.value:
+        shape = np.clip(2 * (1 - 4 * np.abs(phase - 0.5)), -1, 1)
+    elif function == constants.funcSinePower.value:
+        sine = np.sin(2 * np.pi * phase)
+        shape = np.sign(sine) * np.abs(sine) ** (1 + 2 * abs(symmetry - 0.5))
+    elif function == constants.funcCustom.value:
+        shape = channel.data[np.minimum((phase * len(channel.data)).astype(np.int64), len(channel.data) - 1)]
+    else:
+        shape = np.zeros(len(times))
+    values[active] = channel.offset + channel.amplitude * shape[active]
+    return values
+
+"""-----------------------------------------------------------------------"""
+
+def __pattern__(state, channel, times, clock, random=None):
+    """
+        logic level of a pattern generator channel at the given times, None if the channel isn't driven
+    """
+    if not (state.running and channel.enabled):
+        return None
+    local = times - state.start - state.wait
+    ticks = np.floor(np.maximum(local, 0) * clock / channel.divider).astype(np.int64)
+    if channel.type == constants.DwfDigitalOutTypePulse.value:
+        period = channel.low + channel.high
+        values = (ticks % period >= channel.low) if period > 0 else np.zeros(len(times), dtype=bool)
+    elif channel.type == constants.DwfDigitalOutTypeCustom.value:
+        values = channel.bits[ticks % len(channel.bits)] != 0 if len(channel.bits) > 0 else np.zeros(len(times), dtype=bool)
+    else:
+        values = random.integers(0, 2, len(times)) != 0 if random is not None else np.zeros(len(times), dtype=bool)
+    inactive = local < 0
+    if state.run > 0 and state.repeat > 0:
+        inactive |= local >= state.run * state.repeat
+    return np.where(inactive, channel.idle == constants.DwfDigitalOutIdleHigh.value, values)
+
+"""-----------------------------------------------------------------------"""
+
+def __window__(window_type, count, beta):
+    """
+        FFT window, normalized to an average of 1
+    """
+    index = np.arange(count)
+    if count <= 1:
+        values = np.ones(count)
+    elif window_type == constants.DwfWindowTriangular.value:
+        values = np.bartlett(count)
+    elif window_type == constants.DwfWindowHamming.value:
+        values = np.hamming(count)
+    elif window_type == constants.DwfWindowHann.value:
+        values = np.hanning(count)
+    elif window_type == constants.DwfWindowCosine.value:
+        values = np.sin(np.pi * (index + 0.5) / count)
+    elif window_type == constants.DwfWindowBlackmanHarris.value:
+        angle = 2 * np.pi * index / (count - 1)
+        values = 0.35875 - 0.48829 * np.cos(angle) + 0.14128 * np.cos(2 * angle) - 0.01168 * np.cos(3 * angle)
+    elif window_type == constants.DwfWindowFlatTop.value:
+        angle = 2 * np.pi * index / (count - 1)
+        values = 0.21557895 - 0.41663158 * np.cos(angle) + 0.277263158 * np.cos(2 * angle) - 0.083578947 * np.cos(3 * angle) + 0.006947368 * np.cos(4 * angle)
+    elif window_type == constants.DwfWindowKaiser.value:
+        values = np.kaiser(count, beta)
+    else:
+        values = np.ones(count)
+    return values / np.mean(values) if count > 0 else values
+
+"""-----------------------------------------------------------------------"""
+
+def __grid__(start, window, frequency, limit=1 << 16):
+    """
+        time points for a trigger search: the sampling period, or a coarser step for long windows
+    """
+    step = max(1 / frequency, window / limit)
+    return start + np.arange(int(window / step) + 2) * step
+
+def __done__(state):
+    """
+        check if an acquisition is finished
+    """
+    if state.ready is None or state.ready == float("inf"):
+        return False
+    return not settings.realtime or perf_counter() >= state.ready
+
+"""-----------------------------------------------------------------------"""
+
+def __touches_device__(name):
+    """
+        check if a function reaches the device (these calls get the latency)
+    """
+    if name.startswith(("FDwfGetLastError", "FDwfGetVersion", "FDwfSpectrum", "FDwfEnumDeviceType", "FDwfEnumSN", "FDwfEnumDeviceIsOpened")):
+        return False
+    if "Status" in name:
+        return name in __status_calls__
+    return not name.endswith(("Info", "Count", "Get", "Name"))
+
+def __delay__(seconds):
+    """
+        wait precisely (sleep alone overshoots short delays)
+    """
+    deadline = perf_counter() + seconds
+    if seconds > 2e-03:
+        sleep(seconds - 1e-03)
+    while perf_counter() < deadline:
+        sleep(0)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __set__(pointer, value):
+    """
+        store a value through an output pointer (NULL pointers are skipped)
+    """
+    if pointer:
+        pointer[0] = value
+    return
+
+def __write__(address, text):
+    """
+        copy a string into a character buffer
+    """
+    if address:
+        data = text.encode("ascii", "replace") + b"\0"
+        ctypes.memmove(address, data, len(data))
+    return
+
+def __array__(pointer, count):
+    """
+        numpy view of a C array
+    """
+    return np.ctypeslib.as_array(pointer, shape=(count,))
+
+def __check__(index, count):
+    """
+        check a channel or node index
+    """
+    if index < 0 or index >= count:
+        raise failure("Index out of range", 0x11)
+    return
+
+def __select__(items, index):
+    """
+        indexes of the selected channels (-1 selects every channel)
+    """
+    if index == -1:
+        return range(len(items))
+    __check__(index, len(items))
+    return [index]
+
+def __assign__(items, index, value):
+    """
+        set a value of a channel, or every channel (-1)
+    """
+    for position in __select__(items, index):
+        items[position] = value
+    return
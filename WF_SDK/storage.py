@@ -0,0 +1,281 @@
+""" RECORDING FILE FUNCTIONS: create, write, record, close, load, volts """
+
+import json                       # header format
+import builtins                   # the file functions (open is used by the instruments)
+from datetime import datetime, timezone   # date of the recording
+import numpy                      # memory mapped sample storage
+from WF_SDK import scope
+from WF_SDK.device import __state__, error
+
+"""-----------------------------------------------------------------------"""
+
+# the file starts with this line, then the JSON header, padded to HEADER_SIZE bytes
+MAGIC = b"WF_SDK recording\n"
+
+# the samples start after the header (a multiple of the page size, so the mapping is aligned)
+HEADER_SIZE = 4096
+
+# the first size of a growing file, in samples per channel
+INITIAL_CAPACITY = 1 << 20
+
+# the ADC value stored for a lost sample in an int16 recording (NaN in Volts, the measured values are clipped above it)
+LOST = -32768
+
+"""-----------------------------------------------------------------------"""
+
+class recording:
+    """
+        an opened recording file: the header and the samples (one row for every sample, one column for every channel)
+
+        the header holds: sampling_frequency, channels (channel map: the scope channel of every column),
+        range and offset (in Volts, by column), trigger_position (row of the trigger, -1 if there is none),
+        samples, lost (samples lost during the recording, they are NaN, or LOST in an int16 recording), device, serial and date,
+        format (float64: Volts, or int16: ADC values) and scale (Volts per ADC step, by column, for int16)
+    """
+    def __init__(self, name, header, writable):
+        self.name = name
+        self.header = header
+        self.writable = writable
+        self.samples = header["samples"]    # rows written
+        self.capacity = 0                   # rows in the file
+        self.growable = True
+        self.data = None                    # numpy.memmap of the rows
+        return
+
+"""-----------------------------------------------------------------------"""
+
+def create(device_data, file_name, channels=None, capacity=0, raw=False):
+    """
+        create a recording file for scope samples
+
+        parameters: - device data (the scope settings are stored in the header, call scope.open first)
+                    - file name, an existing file is overwritten
+                    - list of the recorded oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - number of samples per channel to preallocate, default is 0 (the file grows as needed)
+                    - store the ADC values (2 bytes per sample, like scope.record_raw) instead of Volts (8 bytes per sample),
+                      default is False
+
+        returns:    - the recording, see write
+    """
+    state = __state__(device_data, "scope", scope.data)
+    if channels is None:
+        channels = list(range(1, device_data.analog.input.channel_count + 1))
+    header = {"version": 1, "sampling_frequency": state.sampling_frequency, "channels": list(channels),
+              "range": [state.amplitude_range] * len(channels), "offset": [state.offset] * len(channels),
+              "trigger_position": -1, "samples": 0, "lost": 0, "device": device_data.name, "serial": device_data.serial,
+              "date": datetime.now(timezone.utc).isoformat(timespec="seconds"), "format": "int16" if raw else "float64"}
+    if raw:
+        header["scale"] = [state.amplitude_range / 65536] * len(channels)   # updated by the first scope.raw written
+    file = recording(file_name, header, True)
+    file.growable = capacity == 0
+    with builtins.open(file_name, "wb") as output:
+        output.write(__header__(header))
+    __map__(file, capacity or INITIAL_CAPACITY)
+    return file
+
+"""-----------------------------------------------------------------------"""
+
+def write(file, samples, trigger=None):
+    """
+        append samples to a recording
+
+        parameters: - the recording, see create
+                    - the samples: a scope.chunk, a scope.raw, a one dimensional array/list (one channel),
+                      or a two dimensional array with one row for every channel (like scope.record_channels)
+                    - index of the trigger in the samples, default is None (the first trigger is stored in the header)
+
+        Volts written to an int16 recording are converted to ADC values with the scale and offset in the header,
+        ADC values are converted to Volts for a float64 recording; the lost samples (NaN) of an int16 recording
+        are stored as LOST (-32768), and the measured values are clipped to -32767
+    """
+    if not file.writable:
+        raise error("The recording " + file.name + " is read-only", "write", "storage")
+    lost = 0
+    raw = file.header.get("format") == "int16"
+    if isinstance(samples, scope.chunk):
+        lost = samples.lost
+        samples = samples.data
+    if isinstance(samples, scope.raw):
+        if not raw:
+            samples = samples.volts()
+        else:
+            # the scale and offset set on the device
+            if file.samples == 0:
+                file.header["scale"] = [float(value) for value in samples.scale]
+                file.header["offset"] = [float(value) for value in samples.offset]
+            samples = samples.data
+    samples = numpy.asarray(samples)
+    if raw and samples.dtype != numpy.int16:
+        samples = numpy.asarray(samples, dtype=numpy.float64)
+        scale, offset = numpy.array(file.header["scale"]), numpy.array(file.header["offset"])
+        if samples.ndim == 2:
+            scale, offset = scale[:, None], offset[:, None]
+        samples = numpy.clip(numpy.round((samples - offset) / scale), LOST + 1, 32767)
+        samples = numpy.where(numpy.isnan(samples), LOST, samples).astype(numpy.int16)
+    elif raw:
+        samples = numpy.maximum(samples, LOST + 1)    # LOST marks the lost samples only
+    else:
+        samples = numpy.asarray(samples, dtype=numpy.float64)
+    if samples.ndim == 1:
+        samples = samples.reshape(1, -1)
+    if samples.shape[0] != len(file.header["channels"]):
+        raise error("The recording has " + str(len(file.header["channels"])) + " channels, not " + str(samples.shape[0]), "write", "storage")
+
+    # make room for the samples
+    count = samples.shape[1]
+    if file.samples + count > file.capacity:
+        if not file.growable:
+            raise error("The recording " + file.name + " is full (" + str(file.capacity) + " samples)", "write", "storage")
+        __map__(file, max(2 * file.capacity, file.samples + count))
+
+    # copy the samples
+    file.data[file.samples:file.samples + count] = samples.T
+    if trigger is not None and file.header["trigger_position"] < 0:
+        file.header["trigger_position"] = file.samples + trigger
+    file.samples += count
+    file.header["lost"] += lost
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def record(device_data, file_name, channels=None, duration=0, chunk_size=0):
+    """
+        stream scope samples into a recording file (only one chunk is kept in memory)
+
+        parameters: - device data (call scope.open first)
+                    - file name, an existing file is overwritten
+                    - list of the recorded oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - length of the recording in seconds, default is 0 (until interrupted)
+                    - number of samples in a chunk, default is 0 (the scope buffer size)
+
+        returns:    - the header of the closed recording
+
+        press Ctrl+C to stop a recording without duration, the file keeps the samples recorded until then
+    """
+    if channels is None:
+        channels = list(range(1, device_data.analog.input.channel_count + 1))
+    state = __state__(device_data, "scope", scope.data)
+    capacity = round(duration * state.sampling_frequency)
+    file = create(device_data, file_name, channels, capacity)
+    file.growable = True    # the last chunk can be a few samples longer
+    try:
+        for part in scope.stream(device_data, list(channels), chunk_size, duration):
+            write(file, part)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close(file)
+    return file.header
+
+"""-----------------------------------------------------------------------"""
+
+def close(file):
+    """
+        save the header and release the file (the unused preallocated space is removed)
+
+        parameters: - the recording
+    """
+    if file.data is not None:
+        if file.writable:
+            file.data.flush()
+        file.data = None
+    if file.writable:
+        file.header["samples"] = file.samples
+        with builtins.open(file.name, "r+b") as output:
+            output.truncate(HEADER_SIZE + file.samples * len(file.header["channels"]) * __type__(file.header).itemsize)
+            output.write(__header__(file.header))
+        file.writable = False
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def load(file_name, writable=False):
+    """
+        open a recording file, the samples are read from the disk on access (the file isn't loaded in the memory)
+
+        parameters: - file name
+                    - append to the recording with write, default is False (read-only)
+
+        returns:    - the recording: file.header is the header, file.data[row, column] are the samples in Volts
+                      (or the ADC values of an int16 recording, see volts)
+
+        a file which wasn't closed (like after a crash) is read to its end: the header isn't updated until close,
+        and the preallocated rows after the last written sample are zeros
+    """
+    with builtins.open(file_name, "rb") as source:
+        start = source.read(HEADER_SIZE)
+    if not start.startswith(MAGIC):
+        raise error(file_name + " isn't a recording file", "load", "storage")
+    header = json.loads(start[len(MAGIC):].decode("utf-8").rstrip(" \n\0"))
+    file = recording(file_name, header, writable)
+
+    # the size of the file counts, if the recording wasn't closed
+    with builtins.open(file_name, "rb") as source:
+        rows = (source.seek(0, 2) - HEADER_SIZE) // (__type__(header).itemsize * len(header["channels"]))
+    if not writable and header["samples"] > 0:
+        rows = min(rows, header["samples"])
+    file.samples = rows
+    if writable or rows > 0:
+        __map__(file, max(rows, 1) if writable else rows)
+    else:
+        file.data = numpy.empty((0, len(header["channels"])), dtype=__type__(header))
+    return file
+
+"""-----------------------------------------------------------------------"""
+
+def volts(file, start=0, stop=None):
+    """
+        read samples of a recording in Volts
+
+        parameters: - the recording
+                    - first row, default is 0
+                    - end row (not included), default is None (the last written row)
+
+        returns:    - a numpy float64 array, one row for every sample, one column for every channel
+                      (the lost samples are NaN)
+    """
+    if stop is None:
+        stop = file.samples
+    samples = file.data[start:stop]
+    if file.header.get("format") != "int16":
+        return numpy.array(samples, dtype=numpy.float64)
+    result = samples * numpy.array(file.header["scale"]) + numpy.array(file.header["offset"])
+    result[samples == LOST] = numpy.nan
+    return numpy.asarray(result)
+
+"""-----------------------------------------------------------------------"""
+
+def __header__(header):
+    """
+        encode the header, padded to its fixed size
+    """
+    content = MAGIC + json.dumps(header).encode("utf-8") + b"\n"
+    if len(content) > HEADER_SIZE:
+        raise error("The header of the recording is longer than " + str(HEADER_SIZE) + " bytes", "write", "storage")
+    return content + b" " * (HEADER_SIZE - len(content))
+
+"""-----------------------------------------------------------------------"""
+
+def __map__(file, capacity):
+    """
+        resize a recording file and map its samples into the memory
+    """
+    channels = len(file.header["channels"])
+    element = __type__(file.header)
+    if file.data is not None:
+        file.data.flush()
+        file.data = None
+    if file.writable:
+        with builtins.open(file.name, "r+b") as output:
+            output.truncate(HEADER_SIZE + capacity * channels * element.itemsize)
+    file.data = numpy.memmap(file.name, dtype=element, mode="r+" if file.writable else "r", offset=HEADER_SIZE, shape=(capacity, channels))
+    file.capacity = capacity
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __type__(header):
+    """
+        type of the samples (the files without format store Volts)
+    """
+    return numpy.dtype(header.get("format", "float64"))
@@ -1,28 +1,8 @@
-""" TOOLS: spectrum """
+""" TOOLS: spectrum, downsample """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-from math import log10, sqrt      # import necessary math functions
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+from math import sqrt             # import necessary math functions
+from WF_SDK.library import dwf, constants   # shared library and constants
 
 """-----------------------------------------------------------------------"""
 
@@ -37,35 +17,151 @@ class window:
     flat_top = constants.DwfWindowFlatTop
     kaiser = constants.DwfWindowKaiser
 
+class magnitude:
+    """ spectrum magnitude units """
+    dBV = "dBV"             # 20 * log10(RMS voltage)
+    volts = "V"             # RMS voltage
+
+class downsampling:
+    """ downsampling methods for displaying long recordings """
+    min_max = "min_max"     # the minimum and the maximum of every interval (the envelope, every peak is kept)
+    lttb = "lttb"           # largest triangle three buckets (the points which keep the shape of the signal)
+
 """-----------------------------------------------------------------------"""
 
-def spectrum(buffer, window, sample_rate, frequency_start, frequency_stop):
+def spectrum(buffer, window, sample_rate, frequency_start, frequency_stop, unit=magnitude.dBV):
     """
-        calculates the spectrum of a signal
+        calculates the spectrum of a signal (needs numpy)
 
-        parameters: - buffer: list of data points in the signal
+        parameters: - buffer: list or numpy array of data points in the signal (it isn't modified, float64 arrays aren't copied)
                     - window type: rectangular, triangular, hamming, hann, cosine, blackman_harris, flat_top, kaiser
                     - sample rate of the signal in Hz
                     - starting frequency of the spectrum in Hz
                     - end frequency of the spectrum in Hz
+                    - unit of the magnitude: dBV, volts (RMS), default is dBV
+
+        returns:    - numpy float64 array with the magnitude of the frequency bins
     """
-    # get and apply window
-    buffer_length = len(buffer)
-    window_buffer = (ctypes.c_double * buffer_length)()   # create an empty buffer
-    dwf.FDwfSpectrumWindow(window_buffer, ctypes.c_int(buffer_length), window, ctypes.c_double(1), ctypes.c_double(0))
-    for index in range(buffer_length):
-        buffer[index] *= float(window_buffer[index])
+    import numpy                  # imported here, the other functions don't need numpy
+    signal = numpy.ascontiguousarray(buffer, dtype=numpy.float64)
+    buffer_length = len(signal)
+
+    # apply the window (into a new array)
+    signal = signal * __window__(buffer_length, window)
 
     # get the spectrum
     spectrum_length = int(buffer_length / 2 + 1)
-    c_spectrum = (ctypes.c_double * spectrum_length)()   # create an empty buffer
-    c_buffer = (ctypes.c_double * buffer_length)()
-    for index in range(0, len(buffer)):
-        c_buffer[index] = ctypes.c_double(buffer[index])
+    result = numpy.empty(spectrum_length, dtype=numpy.float64)
     frequency_start = max(frequency_start * 2.0 / sample_rate, 0.0)
     frequency_stop = min(frequency_stop * 2.0 / sample_rate, 1.0)
-    dwf.FDwfSpectrumTransform(c_buffer, ctypes.c_int(buffer_length), c_spectrum, ctypes.c_int(0), ctypes.c_int(spectrum_length), ctypes.c_double(frequency_start), ctypes.c_double(frequency_stop))
-    spectrum = []
-    for index in range(spectrum_length):
-        spectrum.append(20.0 * log10(float(c_spectrum[index]) / sqrt(2)))
-    return spectrum
+    dwf.FDwfSpectrumTransform(signal.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), buffer_length,
+                              result.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), None, spectrum_length, frequency_start, frequency_stop)
+    result /= sqrt(2)    # peak to RMS
+    if unit == magnitude.dBV:
+        with numpy.errstate(divide="ignore"):
+            numpy.log10(result, out=result)
+        result *= 20.0
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+def downsample(buffer, points, method=downsampling.min_max):
+    """
+        reduce the number of data points of a signal for displaying it
+
+        parameters: - buffer: list or numpy array of data points, or a two dimensional array with one row for every channel
+                    - maximum number of returned data points (at least 3)
+                    - method: min_max, lttb, default is min_max
+
+        returns:    - the indices of the kept data points (divide them by the sampling frequency to get the time)
+                    - the kept data points
+                    (both have one row for every channel for a two dimensional buffer, every channel is reduced separately)
+
+        shorter buffers are returned unchanged
+    """
+    import numpy                  # imported here, the other functions don't need numpy
+    buffer = numpy.asarray(buffer, dtype=numpy.float64)
+    length = buffer.shape[-1]
+    if length <= points or points < 3:
+        indices = numpy.broadcast_to(numpy.arange(length), buffer.shape)
+        return indices, buffer
+    signals = buffer.reshape(-1, length)
+    if method == downsampling.lttb:
+        indices = numpy.array([__lttb__(signal, points) for signal in signals])
+    else:
+        indices = __min_max__(signals, points)
+    values = numpy.take_along_axis(signals, indices, axis=1)
+    if buffer.ndim == 1:
+        return indices[0], values[0]
+    return indices, values
+
+"""-----------------------------------------------------------------------"""
+
+def __min_max__(buffer, points):
+    """
+        indices of the minimum and the maximum of every interval in every row, in time order
+    """
+    import numpy
+    length = buffer.shape[1]
+    intervals = points // 2
+    size = -(-length // intervals)   # samples in an interval, rounded up
+    intervals = -(-length // size)
+    # the last interval is padded with the last sample
+    padded = numpy.pad(buffer, ((0, 0), (0, intervals * size - length)), mode="edge").reshape(buffer.shape[0], intervals, size)
+    start = numpy.arange(intervals) * size
+    indices = numpy.sort(numpy.stack([padded.argmin(axis=2), padded.argmax(axis=2)], axis=2), axis=2) + start[:, None]
+    return numpy.minimum(indices.reshape(buffer.shape[0], -1), length - 1)
+
+"""-----------------------------------------------------------------------"""
+
+def __lttb__(signal, points):
+    """
+        indices selected by the largest triangle three buckets algorithm (the first and the last points are always kept)
+    """
+    import numpy
+    length = len(signal)
+    # the buckets between the first and the last point, with the average point of every bucket
+    edges = (numpy.arange(points - 1) * (length - 2) / (points - 2)).astype(numpy.int64) + 1
+    edges[-1] = length - 1
+    counts = numpy.diff(edges)
+    average_x = (edges[:-1] + edges[1:] - 1) / 2
+    average_y = numpy.add.reduceat(signal[:-1], edges[:-1]) / counts
+    average_x = numpy.append(average_x, length - 1)
+    average_y = numpy.append(average_y, signal[-1])
+
+    # every point depends on the previous choice, the buckets are processed in order
+    indices = numpy.empty(points, dtype=numpy.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+    previous_x, previous_y = 0.0, signal[0]
+    for bucket in range(points - 2):
+        first, last = edges[bucket], edges[bucket + 1]
+        next_x, next_y = average_x[bucket + 1], average_y[bucket + 1]
+        # twice the area of the triangles of the previous point, the candidates and the average of the next bucket
+        area = numpy.abs((previous_x - next_x) * (signal[first:last] - previous_y) - (previous_x - numpy.arange(first, last)) * (next_y - previous_y))
+        selected = first + int(area.argmax())
+        indices[bucket + 1] = selected
+        previous_x, previous_y = selected, signal[selected]
+    return indices
+
+"""-----------------------------------------------------------------------"""
+
+# window arrays by (length, window type), reused by spectrum
+__windows__ = {}
+
+def __window__(length, window):
+    """
+        get a window from the cache, or compute it
+    """
+    key = (length, getattr(window, "value", window))
+    values = __windows__.get(key)
+    if values is None:
+        import numpy
+        window_buffer = (ctypes.c_double * length)()   # create an empty buffer
+        dwf.FDwfSpectrumWindow(window_buffer, length, window, 1, None)
+        values = numpy.frombuffer(window_buffer, dtype=numpy.float64)
+        values.flags.writeable = False    # shared by every call
+        if len(__windows__) >= 32:
+            __windows__.clear()    # keep the cache small
+        __windows__[key] = values
+    return values
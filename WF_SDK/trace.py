@@ -0,0 +1,274 @@
+""" CALL TRACING FUNCTIONS: start, stop, clear, section, summary, report, export """
+
+import sys                        # caller module of a call
+import threading                  # calls can come from several threads
+from os import getpid             # process ID in the exported trace
+from time import perf_counter_ns  # call durations
+from contextlib import contextmanager
+from WF_SDK import library
+
+"""-----------------------------------------------------------------------"""
+
+class data:
+    """ stores the recorded calls (shared by every device) """
+    enabled = False
+    events = []             # (name, module, start_ns, duration_ns, bytes, thread ID), in call order
+    limit = 1000000         # events recorded at most (the statistics are always updated)
+    dropped = 0             # events not recorded because of the limit
+    functions = {}          # statistics by function name
+    previous = {}           # arguments of the last call of every setter, to find redundant calls
+
+"""-----------------------------------------------------------------------"""
+
+__lock__ = threading.Lock()
+
+# transferred bytes of the data calls, computed from the arguments
+__sizes__ = {
+    "FDwfAnalogInStatusData": lambda arguments: 8 * arguments[3],
+    "FDwfAnalogInStatusData16": lambda arguments: 2 * arguments[4],
+    "FDwfAnalogOutNodeDataSet": lambda arguments: 8 * arguments[4],
+    "FDwfDigitalInStatusData": lambda arguments: arguments[2],
+    "FDwfDigitalOutDataSet": lambda arguments: (arguments[3] + 7) >> 3,
+    "FDwfDigitalI2cWrite": lambda arguments: arguments[3],
+    "FDwfDigitalI2cRead": lambda arguments: arguments[3],
+    "FDwfDigitalI2cWriteRead": lambda arguments: arguments[3] + arguments[5],
+    "FDwfDigitalSpiRead": lambda arguments: arguments[4] * ((arguments[2] + 7) >> 3),
+    "FDwfDigitalSpiWrite": lambda arguments: arguments[4] * ((arguments[2] + 7) >> 3),
+    "FDwfDigitalSpiWriteRead": lambda arguments: (arguments[4] + arguments[6]) * ((arguments[2] + 7) >> 3),
+    "FDwfDigitalUartTx": lambda arguments: arguments[2],
+    "FDwfDigitalUartRx": lambda arguments: __value__(arguments[3], arguments[2]),
+}
+
+"""-----------------------------------------------------------------------"""
+
+def start(events=True, limit=1000000):
+    """
+        start recording every FDwf call
+
+        parameters: - record every call for the exported trace, False keeps the statistics only, default is True
+                    - maximum number of recorded calls, default is 1000000
+    """
+    data.limit = limit if events else 0
+    data.enabled = True
+    library.wrap(__wrap__, __skip__)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def stop():
+    """
+        stop recording (the results are kept until clear)
+    """
+    data.enabled = False
+    library.wrap(None)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def clear():
+    """
+        delete the recorded calls and the statistics
+    """
+    with __lock__:
+        data.events = []
+        data.dropped = 0
+        data.functions = {}
+        data.previous = {}
+    return
+
+"""-----------------------------------------------------------------------"""
+
+@contextmanager
+def section(name):
+    """
+        mark a step of a test in the trace, like: with trace.section("measure the rise time"): ...
+
+        parameters: - name of the step
+    """
+    begin = perf_counter_ns()
+    try:
+        yield
+    finally:
+        if data.enabled:
+            __record__(name, "section", begin, perf_counter_ns() - begin, 0, False)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def summary():
+    """
+        get the statistics of every function
+
+        returns:    - dictionary by function name: calls, total_ns, min_ns, max_ns, mean_ns, p50_ns, p90_ns, p99_ns,
+                      bytes, redundant (setter calls repeating the previous arguments), skipped (setter calls not sent
+                      by the shadow register cache, not counted in calls), modules (calls by caller module),
+                      histogram (calls by duration bucket: bucket k counts the durations from 2^(k-1) to 2^k ns)
+    """
+    with __lock__:
+        result = {}
+        for name, stats in data.functions.items():
+            stats = dict(stats, histogram=dict(stats["histogram"]), modules=dict(stats["modules"]))
+            stats["mean_ns"] = stats["total_ns"] / stats["calls"] if stats["calls"] > 0 else 0
+            for percent in [50, 90, 99]:
+                stats["p{}_ns".format(percent)] = min(__percentile__(stats["histogram"], stats["calls"], percent), stats["max_ns"])
+            result[name] = stats
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+def report(file=None, histograms=False):
+    """
+        print the statistics, the slowest functions first
+
+        parameters: - output file, default is the standard output
+                    - print the duration histogram of every function, default is False
+    """
+    file = file or sys.stdout
+    stats = sorted(summary().items(), key=lambda item: item[1]["total_ns"], reverse=True)
+    print("{:<40} {:>8} {:>11} {:>10} {:>10} {:>10} {:>10} {:>9} {:>8}  {}".format(
+          "function", "calls", "total", "mean", "p50", "p99", "bytes", "redundant", "skipped", "callers"), file=file)
+    for name, function in stats:
+        callers = ", ".join(module + ": " + str(count) for module, count in sorted(function["modules"].items(), key=lambda item: -item[1]))
+        print("{:<40} {:>8} {:>9.3f}ms {:>8.1f}us {:>8.1f}us {:>8.1f}us {:>10} {:>9} {:>8}  {}".format(
+              name, function["calls"], function["total_ns"] / 1e06, function["mean_ns"] / 1e03, function["p50_ns"] / 1e03,
+              function["p99_ns"] / 1e03, function["bytes"], function["redundant"], function["skipped"], callers), file=file)
+        if histograms and function["histogram"]:
+            largest = max(function["histogram"].values())
+            for bucket in sorted(function["histogram"]):
+                count = function["histogram"][bucket]
+                print("{:>50} {:>8}  {}".format("< " + __duration__(1 << bucket), count, "#" * max(1, round(40 * count / largest))), file=file)
+    if data.dropped > 0:
+        print(str(data.dropped) + " calls weren't recorded in the trace (limit: " + str(data.limit) + ")", file=file)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def export(file_name):
+    """
+        save the recorded calls as a Chrome trace (open it in chrome://tracing or https://ui.perfetto.dev)
+
+        parameters: - file name, like "trace.json"
+    """
+    import json                   # imported here, so importing the module stays fast
+    process = getpid()
+    with __lock__:
+        events = list(data.events)
+    trace_events = []
+    for name, module, begin, duration, size, thread in events:
+        event = {"name": name, "cat": module, "ph": "X", "ts": begin / 1e03, "dur": duration / 1e03, "pid": process, "tid": thread}
+        if size > 0:
+            event["args"] = {"bytes": size}
+        trace_events.append(event)
+    with open(file_name, "wt") as file:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ns"}, file)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __wrap__(name, function):
+    """
+        time a function, used by library.wrap
+    """
+    size = __sizes__.get(name)
+    setter = name.endswith("Set") and not name.endswith("DataSet")
+
+    def traced(*arguments):
+        begin = perf_counter_ns()
+        try:
+            return function(*arguments)
+        finally:
+            duration = perf_counter_ns() - begin
+            frame = sys._getframe(1)
+            while frame.f_globals.get("__name__") == "WF_SDK.library":
+                frame = frame.f_back    # the caller of the shadow register cache
+            module = frame.f_globals.get("__name__", "?")
+            if module.startswith("WF_SDK."):
+                module = module[7:].replace(".", "/")
+            __record__(name, module, begin, duration, size(arguments) if size is not None else 0, __arguments__(arguments) if setter else None)
+    traced.__name__ = name
+    return traced
+
+"""-----------------------------------------------------------------------"""
+
+def __skip__(name, arguments):
+    """
+        count a setter call skipped by the shadow register cache, used by library.wrap
+    """
+    with __lock__:
+        __statistics__(name)["skipped"] += 1
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __record__(name, module, begin, duration, size, arguments):
+    """
+        update the statistics of a function and store the call
+    """
+    with __lock__:
+        stats = __statistics__(name)
+        if stats["calls"] == 0:
+            stats["min_ns"] = stats["max_ns"] = duration
+        stats["calls"] += 1
+        stats["total_ns"] += duration
+        stats["min_ns"] = min(stats["min_ns"], duration)
+        stats["max_ns"] = max(stats["max_ns"], duration)
+        stats["bytes"] += size
+        stats["modules"][module] = stats["modules"].get(module, 0) + 1
+        bucket = int(duration).bit_length()
+        stats["histogram"][bucket] = stats["histogram"].get(bucket, 0) + 1
+        if arguments:
+            if data.previous.get(name) == arguments:
+                stats["redundant"] += 1
+            data.previous[name] = arguments
+        if len(data.events) < data.limit:
+            data.events.append((name, module, begin, duration, size, threading.get_ident()))
+        elif data.limit > 0:
+            data.dropped += 1
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __statistics__(name):
+    """
+        statistics of a function, created at its first call (call it holding the lock)
+    """
+    stats = data.functions.get(name)
+    if stats is None:
+        stats = {"calls": 0, "total_ns": 0, "min_ns": 0, "max_ns": 0, "bytes": 0, "redundant": 0, "skipped": 0,
+                 "modules": {}, "histogram": {}}
+        data.functions[name] = stats
+    return stats
+
+def __arguments__(arguments):
+    """
+        comparable values of the setter arguments (ctypes values are unpacked)
+    """
+    return tuple(getattr(argument, "value", argument) for argument in arguments)
+
+def __value__(pointer, default):
+    """
+        value behind a byref() argument, like the received byte count
+    """
+    target = getattr(pointer, "_obj", None)
+    return target.value if target is not None else default
+
+def __percentile__(histogram, calls, percent):
+    """
+        upper bound of the duration bucket of a percentile
+    """
+    limit = calls * percent / 100
+    count = 0
+    for bucket in sorted(histogram):
+        count += histogram[bucket]
+        if count >= limit:
+            return 1 << bucket
+    return 0
+
+def __duration__(nanoseconds):
+    """
+        format a duration with a readable unit
+    """
+    for unit, scale in [("s", 1e09), ("ms", 1e06), ("us", 1e03)]:
+        if nanoseconds >= scale:
+            return "{:g}{}".format(nanoseconds / scale, unit)
+    return str(nanoseconds) + "ns"
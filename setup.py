@@ -12,5 +12,7 @@ setup(
    author = "Digilent Inc.",
    author_email = "almos.veres-vitalyos@digilent.ro",
    url = "https://digilent.com/reference/test-and-measurement/guides/waveforms-sdk-getting-started",
-   packages = ["WF_SDK", "WF_SDK.protocol"],
+   packages = ["WF_SDK", "WF_SDK.protocol", "WF_SDK.simulator"],
+   package_data = {"WF_SDK": ["fixtures/*.json"]},
+   install_requires = ["numpy"],   # tools.spectrum, measurements, storage, captures and the simulator
 )
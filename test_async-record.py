@@ -0,0 +1,66 @@
+from WF_SDK import device, scope, logic, wavegen, pattern, error   # import instruments
+
+import asyncio                    # needed for the event loop
+
+"""-----------------------------------------------------------------------"""
+
+async def heartbeat():
+    """
+        show that the event loop keeps running during the recordings
+    """
+    while True:
+        print("waiting for the recordings...")
+        await asyncio.sleep(0.1)
+
+async def main(device_data):
+    """
+        record with the scope and the logic analyzer at the same time
+    """
+    ticker = asyncio.create_task(heartbeat())
+    try:
+        analog, digital = await asyncio.gather(scope.record_async(device_data, channel=1, timeout=5),
+                                               logic.record_async(device_data, channel=0, timeout=5))
+    finally:
+        ticker.cancel()
+    print("scope: " + str(len(analog)) + " samples, logic analyzer: " + str(len(digital)) + " samples")
+    return
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # connect to the device
+    device_data = device.open()
+
+    """-----------------------------------"""
+
+    # handle devices without analog I/O channels
+    if device_data.name != "Digital Discovery":
+
+        # a slow recording: 8192 samples at 10KHz take 0.8 seconds
+        scope.open(device_data, sampling_frequency=10e03, buffer_size=8192)
+        logic.open(device_data, sampling_frequency=10e03, buffer_size=8192)
+
+        # generate a 100Hz sine signal on wavegen channel 1 and a 100Hz clock on DIO 0
+        wavegen.generate(device_data, channel=1, function=wavegen.function.sine, offset=0, frequency=100, amplitude=2)
+        pattern.generate(device_data, channel=0, function=pattern.function.pulse, frequency=100)
+
+        try:
+            asyncio.run(main(device_data))
+        except TimeoutError:
+            print("the recordings didn't finish in time")
+
+        # reset the instruments
+        scope.close(device_data)
+        logic.close(device_data)
+        wavegen.close(device_data)
+        pattern.close(device_data)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
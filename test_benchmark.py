@@ -0,0 +1,224 @@
+from WF_SDK import device, scope, logic, wavegen, pattern, tools, measurements, simulator, library, error, warning   # import instruments
+from WF_SDK.protocol import i2c, spi, uart                                                                           # import protocol instruments
+
+import argparse                    # needed for the command line options
+import json                        # needed for the result files
+import numpy                       # needed for the reused storage
+import platform                    # needed to describe the machine
+import subprocess                  # needed to get the commit
+import sys                         # needed for the exit code
+from datetime import datetime, timezone   # needed to date the results
+from math import sin, pi           # needed to create the test signals
+from os import environ, path       # needed to select the backend and to find the repository
+from statistics import median      # needed to summarize the results
+from time import perf_counter_ns   # needed for the measurements
+
+"""-----------------------------------------------------------------------"""
+
+# number of timed runs of every benchmark
+REPEAT = 20
+
+# shortest timed run in ns, fast functions are called several times in one run
+MIN_RUN_TIME = 10e06
+
+# a benchmark slower than the baseline by this ratio is reported as a regression
+THRESHOLD = 1.25
+
+"""-----------------------------------------------------------------------"""
+
+def measure(function):
+    """
+        time a function, returns the durations of a call in ns (one for every timed run)
+    """
+    # warm up and calibrate the number of calls in a run
+    start = perf_counter_ns()
+    function()
+    calls = max(1, int(MIN_RUN_TIME / max(perf_counter_ns() - start, 1)))
+    results = []
+    for _ in range(REPEAT):
+        start = perf_counter_ns()
+        for _ in range(calls):
+            function()
+        results.append((perf_counter_ns() - start) / calls)
+    return results
+
+def ignore_nak(function):
+    """
+        on real hardware nothing may answer on the bus, the encoding is measured anyway
+    """
+    def call():
+        try:
+            function()
+        except warning:
+            pass
+    return call
+
+def commit():
+    """
+        get the checked out commit, like "3c7734f" or "3c7734f-dirty"
+    """
+    try:
+        output = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=path.dirname(path.abspath(__file__)), capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(results, baseline):
+    """
+        print the results next to a baseline, returns the names of the regressed benchmarks
+    """
+    regressions = []
+    print("{:<40} {:>12} {:>12} {:>8}".format("benchmark", "baseline", "current", "ratio"))
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            print("{:<40} {:>12} {:>10.0f}ns {:>8}".format(name, "-", result["median_ns"], "new"))
+            continue
+        before = baseline["results"][name]["median_ns"]
+        ratio = result["median_ns"] / before
+        flag = ""
+        if ratio > THRESHOLD:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print("{:<40} {:>10.0f}ns {:>10.0f}ns {:>7.2f}x{}".format(name, before, result["median_ns"], ratio, flag))
+    return regressions
+
+"""-----------------------------------------------------------------------"""
+
+parser = argparse.ArgumentParser(description="measure the instrument functions (on simulated devices by default)")
+parser.add_argument("output", nargs="?", help="result file, default is benchmark-<commit>.json")
+parser.add_argument("--baseline", help="result file of an earlier commit to compare with")
+parser.add_argument("--filter", default="", help="run only the benchmarks containing this text")
+options = parser.parse_args()
+
+# the simulator measures the Python side only: no latency, no waiting for acquisitions
+backend = environ.get("WF_SDK_BACKEND", "simulator")
+simulator.settings.latency = 0
+simulator.settings.realtime = False
+simulator.settings.seed = 0
+
+results = {"commit": commit(), "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+           "python": platform.python_version(), "machine": platform.machine(), "system": platform.system(),
+           "backend": backend, "repeat": REPEAT, "results": {}}
+
+def run(name, function, items):
+    """
+        measure a benchmark, then print and store the results
+    """
+    if options.filter not in name:
+        return
+    durations = measure(function)
+    result = {"median_ns": median(durations), "min_ns": min(durations), "items": items, "ns_per_item": median(durations) / items}
+    results["results"][name] = result
+    print("{:<40} {:>10.0f}ns {:>10.0f}ns {:>10.1f}ns".format(name, result["median_ns"], result["min_ns"], result["ns_per_item"]))
+    return
+
+try:
+    print("{:<40} {:>12} {:>12} {:>12}".format("benchmark", "median", "minimum", "per item"))
+
+    # connecting includes the enumeration and reading the device information
+    run("device.open", lambda: device.close(device.open(backend=backend)), 1)
+
+    # connect to the device
+    device_data = device.open(backend=backend)
+    results["device"] = device_data.name
+
+    """-----------------------------------"""
+
+    # test data
+    samples = 8192
+    signal = [sin(2 * pi * 10 * index / samples) for index in range(samples)]
+    custom = signal[::2]
+    signal_array = numpy.array(signal)
+    long_signal = numpy.sin(numpy.linspace(0, 200 * pi, 1000000))
+    captures = numpy.sign(numpy.sin(numpy.linspace(0, 20 * pi, samples) + numpy.linspace(0, pi, 100)[:, None]))
+    bits = [(index // 3) & 1 for index in range(device_data.digital.output.max_buffer_size)]
+    message = list(range(64))
+    text = "Hello World! " * 5
+
+    # instrument setup
+    scope.open(device_data, sampling_frequency=1e06, buffer_size=samples)
+    logic.open(device_data, sampling_frequency=1e06, buffer_size=min(samples, device_data.digital.input.max_buffer_size))
+    scope.record(device_data, 1)
+    logic.record(device_data, 0)
+    i2c.open(device_data, sda=0, scl=1, clk_rate=1e06)
+    spi.open(device_data, cs=2, sck=3, miso=4, mosi=5, clk_frequency=10e06)
+    uart.open(device_data, rx=6, tx=7, baud_rate=1e06)
+
+    # reused storage for the out= benchmarks
+    analog_out = numpy.empty(device_data.scope.buffer_size)
+    digital_out = numpy.empty(device_data.logic.buffer_size, dtype=numpy.uint8)
+    received = bytearray()
+
+    # name: (function, number of processed items)
+    benchmarks = {
+        "device.__get_info__": (lambda: device.__get_info__(device_data), 1),
+        "scope.measure_channels": (lambda: scope.measure_channels(device_data), device_data.analog.input.channel_count),
+        "scope.record": (lambda: scope.record(device_data, 1), device_data.scope.buffer_size),
+        "scope.record list conversion": (lambda: scope.__get_data__(device_data, 1), device_data.scope.buffer_size),
+        "scope.record array view": (lambda: scope.__get_data__(device_data, 1, as_array=True), device_data.scope.buffer_size),
+        "scope.record into out": (lambda: scope.__get_data__(device_data, 1, out=analog_out), device_data.scope.buffer_size),
+        "scope.record_raw": (lambda: scope.record_raw(device_data, 1), device_data.scope.buffer_size),
+        "scope.capture": (lambda: scope.capture(device_data, 1), device_data.scope.buffer_size),
+        "scope.record_channels": (lambda: scope.record_channels(device_data), device_data.scope.buffer_size * device_data.analog.input.channel_count),
+        "logic.record": (lambda: logic.record(device_data, 0), device_data.logic.buffer_size),
+        "logic.capture": (lambda: logic.capture(device_data, 0), device_data.logic.buffer_size),
+        "logic.record bit extraction": (lambda: logic.__get_data__(device_data, 0), device_data.logic.buffer_size),
+        "logic.record bit extraction into out": (lambda: logic.__get_data__(device_data, 0, out=digital_out), device_data.logic.buffer_size),
+        "tools.spectrum": (lambda: tools.spectrum(list(signal), tools.window.hann, 1e06, 0, 500e03), samples),
+        "tools.spectrum array": (lambda: tools.spectrum(signal_array, tools.window.hann, 1e06, 0, 500e03), samples),
+        "tools.downsample min_max": (lambda: tools.downsample(long_signal, 2000, tools.downsampling.min_max), len(long_signal)),
+        "tools.downsample lttb": (lambda: tools.downsample(long_signal, 2000, tools.downsampling.lttb), len(long_signal)),
+        "measurements.measure 100 captures": (lambda: measurements.measure(captures, 1e06), captures.size),
+        "wavegen.generate custom upload": (lambda: wavegen.generate(device_data, 1, wavegen.function.custom, 0, data=custom), len(custom)),
+        "pattern.generate bit packing": (lambda: pattern.generate(device_data, 0, pattern.function.custom, 1e03, data=bits), len(bits)),
+        "i2c.write list": (ignore_nak(lambda: i2c.write(device_data, message, 0x48)), len(message)),
+        "i2c.write string": (ignore_nak(lambda: i2c.write(device_data, text, 0x48)), len(text)),
+        "i2c.exchange": (ignore_nak(lambda: i2c.exchange(device_data, message, len(message), 0x48)), len(message)),
+        "spi.write list": (lambda: spi.write(device_data, message, 2), len(message)),
+        "spi.write string": (lambda: spi.write(device_data, text, 2), len(text)),
+        "spi.exchange": (lambda: spi.exchange(device_data, message, len(message), 2), len(message)),
+        "uart.write string": (lambda: uart.write(device_data, text), len(text)),
+        "uart.read": (lambda: uart.read(device_data), 1),
+        "uart.read into out": (lambda: uart.read(device_data, out=received), 1),
+    }
+    for name, (function, items) in benchmarks.items():
+        run(name, function, items)
+
+    # the shadow register cache is off by default
+    library.shadow(True)
+    run("wavegen.generate unchanged settings", lambda: wavegen.generate(device_data, 2, wavegen.function.sine, 0, 1e03, 1), 1)
+    library.shadow(False)
+
+    # reset the instruments
+    scope.close(device_data)
+    logic.close(device_data)
+    wavegen.close(device_data)
+    pattern.close(device_data)
+    i2c.close(device_data)
+    spi.close(device_data)
+    uart.close(device_data)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
+    sys.exit(2)
+
+# save the results
+output = options.output or "benchmark-" + results["commit"] + ".json"
+with open(output, "wt") as f:
+    json.dump(results, f, indent=1)
+print("results saved to " + output)
+
+# compare with an earlier commit
+if options.baseline:
+    with open(options.baseline, "rt") as f:
+        baseline = json.load(f)
+    print("\ncompared with " + baseline["commit"])
+    if len(compare(results, baseline)) > 0:
+        sys.exit(1)
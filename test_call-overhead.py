@@ -0,0 +1,97 @@
+from WF_SDK import device, static       # import instruments
+from WF_SDK import library              # needed to check the backend
+from WF_SDK.library import dwf, lib_path, warning, shadow   # typed call layer
+
+import ctypes                           # needed for the untyped reference calls
+import inspect                          # needed for the old error path
+from time import perf_counter_ns        # needed for the measurements
+
+"""-----------------------------------------------------------------------"""
+
+# number of calls in every measurement
+REPEAT = 10000
+
+# every setter call has to reach the library (a cached setter would measure a dictionary lookup)
+shadow(False)
+
+# connect to the device
+device_data = device.open()
+print(device_data.name + " connected")
+
+"""-----------------------------------------------------------------------"""
+
+def measure(name, function, repeat=REPEAT):
+    """
+        call a function repeatedly and print the average duration of a call
+    """
+    start = perf_counter_ns()
+    for _ in range(repeat):
+        function()
+    duration = (perf_counter_ns() - start) / repeat
+    print("{:>10.0f}ns  {}".format(duration, name))
+    return duration
+
+def compare(name, untyped, typed, repeat=REPEAT):
+    """
+        measure the untyped and the typed version of a call
+    """
+    before = measure(name + ", untyped", untyped, repeat)
+    after = measure(name + ", typed", typed, repeat)
+    print("{:>10.2f}x  speedup".format(before / after))
+    return
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    mask = ctypes.c_uint()
+    handle = device_data.handle
+
+    def untyped_get():
+        if raw.FDwfDigitalIOOutputGet(handle, ctypes.byref(mask)) == 0:
+            device.check_error()
+
+    def typed_get():
+        dwf.FDwfDigitalIOOutputGet(handle, ctypes.byref(mask))
+
+    def untyped_set():
+        if raw.FDwfDigitalOutCounterSet(handle, ctypes.c_int(0), ctypes.c_uint(10), ctypes.c_uint(10)) == 0:
+            device.check_error()
+
+    def typed_set():
+        dwf.FDwfDigitalOutCounterSet(handle, 0, 10, 10)
+
+    # error path, like an I2C NAK: the old code searched the call stack for the caller name
+    def untyped_error():
+        try:
+            raise warning("NAK: index 1", inspect.stack()[1].function, "protocol/i2c")
+        except warning:
+            pass
+
+    def typed_error():
+        try:
+            raise warning("NAK: index 1", "write", "protocol/i2c")
+        except warning:
+            pass
+
+    print("average duration of a call")
+    if library.backend == "simulator":
+        # the simulated devices have no untyped library to compare with
+        measure("getter with 1 pointer argument, typed", typed_get)
+        measure("setter with 3 scalar arguments, typed", typed_set)
+    else:
+        # untyped reference: a separate library handle without prototypes, used like the old call sites
+        raw = ctypes.cdll.LoadLibrary(lib_path)
+        compare("getter with 1 pointer argument", untyped_get, typed_get)
+        compare("setter with 3 scalar arguments", untyped_set, typed_set)
+    compare("raising an error", untyped_error, typed_error, REPEAT // 100)
+
+    # a full instrument function: read-modify-write of the DIO output mask
+    static.set_mode(device_data, 0, True)
+    measure("static.set_state", lambda: static.set_state(device_data, 0, True))
+    static.close(device_data)
+
+except KeyboardInterrupt:
+    pass
+
+# close the connection
+device.close(device_data)
@@ -0,0 +1,51 @@
+from WF_SDK import device, scope, wavegen, trace, error   # import instruments
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # connect to the device
+    device_data = device.open()
+
+    """-----------------------------------"""
+
+    # handle devices without analog I/O channels
+    if device_data.name != "Digital Discovery":
+
+        # record every FDwf call from here
+        trace.start()
+
+        # every step shows up as a separate block in the exported trace
+        with trace.section("configure"):
+            scope.open(device_data, sampling_frequency=1e06, buffer_size=8192)
+            wavegen.generate(device_data, channel=1, function=wavegen.function.sine, offset=0, frequency=10e03, amplitude=2)
+
+        with trace.section("record"):
+            for _ in range(10):
+                buffer = scope.record(device_data, channel=1)
+
+        with trace.section("process"):
+            average = sum(buffer) / len(buffer)
+
+        # stop recording the calls
+        trace.stop()
+
+        # the slowest functions first: time spent in the device and in data transfers, redundant and skipped setter calls
+        trace.report(histograms=True)
+
+        # open the file in chrome://tracing or https://ui.perfetto.dev
+        trace.export("trace.json")
+        print("trace saved to trace.json")
+
+        # reset the instruments
+        scope.close(device_data)
+        wavegen.close(device_data)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
@@ -0,0 +1,59 @@
+from WF_SDK import device, simulator, error   # import instruments
+from os import listdir, path                  # needed to find the capability records
+
+"""-----------------------------------------------------------------------"""
+
+# the capability records of the simulated devices are in the device cache format:
+# every record has to load like a cache entry and match what the simulated device reports
+folder = path.join(path.dirname(device.__file__), "fixtures")
+names = sorted(file_name[:-len(".json")] for file_name in listdir(folder) if file_name.endswith(".json"))
+
+# simulate every device at once (set before the first device.open)
+simulator.settings.devices = names
+
+"""-----------------------------------------------------------------------"""
+
+def fields(device_data):
+    """
+        copy the device information, like the cache stores it
+    """
+    result = {"name": device_data.name, "version": device_data.version}
+    for name, section in device.__info_sections__(device_data):
+        result[name] = {key: value for key, value in vars(section).items() if not key.startswith("__")}
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+failures = 0
+try:
+    for index, name in enumerate(names):
+        # enumerate the simulated device
+        device_data = device.open(serial="SIM{:09d}".format(index), backend="simulator")
+        enumerated = fields(device_data)
+
+        # load the capability record into the same device data
+        try:
+            device.__load_info__(device_data, path.join(folder, name + ".json"))
+            loaded = fields(device_data)
+            differences = [part + "." + key for part in enumerated if isinstance(enumerated[part], dict)
+                           for key in enumerated[part] if enumerated[part][key] != loaded[part][key]]
+            differences += [part for part in enumerated if not isinstance(enumerated[part], dict) and enumerated[part] != loaded[part]]
+        except (ValueError, KeyError) as e:
+            differences = ["the record can't be loaded: " + repr(e)]
+
+        # print the result
+        if len(differences) > 0:
+            failures += 1
+            print(name + ": FAILED, different: " + ", ".join(differences))
+        else:
+            print(name + ": OK")
+
+        # close the connection
+        device.close(device_data)
+
+    print(str(len(names) - failures) + " of " + str(len(names)) + " capability records are consistent")
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
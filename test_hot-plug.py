@@ -0,0 +1,37 @@
+from WF_SDK import device, error       # import instruments
+
+from time import sleep                # needed for delays
+
+"""-----------------------------------------------------------------------"""
+
+def changed(arrived, removed):
+    """
+        called by the watcher when a device is connected or disconnected
+    """
+    for device_info in arrived:
+        print("connected: " + device_info.name + " (" + device_info.serial + ")")
+    for device_info in removed:
+        print("disconnected: " + device_info.name + " (" + device_info.serial + ")")
+    return
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # list the connected devices
+    for device_info in device.enum():
+        print(device_info.name + " (" + device_info.serial + ")" + (" is busy" if device_info.busy else ""))
+
+    # watch for connected and disconnected devices
+    device.watch(changed, interval=1)
+
+    try:
+        while True:
+            sleep(0.5)  # connect and disconnect devices meanwhile
+    except KeyboardInterrupt:
+        pass    # exit on Ctrl+C
+
+    # stop watching
+    device.unwatch()
+
+except error as e:
+    print(e)
@@ -0,0 +1,37 @@
+import subprocess                  # needed to start fresh interpreters
+import sys                         # needed to get the interpreter path
+from statistics import median      # needed to summarize the results
+
+"""-----------------------------------------------------------------------"""
+
+# number of fresh interpreters started for every measurement
+REPEAT = 20
+
+# import statements to measure
+targets = ["import WF_SDK",
+           "from WF_SDK import device",
+           "from WF_SDK.protocol import i2c",
+           "from WF_SDK import device, scope, wavegen, tools",
+           "from WF_SDK import device, scope, wavegen, supplies, dmm, logic, pattern, static, tools",
+           "from WF_SDK.protocol import i2c, spi, uart"]
+
+# the measurement is done inside the child process, so interpreter startup is not counted
+child = "from time import perf_counter; start = perf_counter(); {}; print(perf_counter() - start)"
+
+"""-----------------------------------------------------------------------"""
+
+def measure(statement):
+    """
+        returns the import times of a statement in ms, one for every fresh interpreter
+    """
+    results = []
+    for _ in range(REPEAT):
+        output = subprocess.run([sys.executable, "-c", child.format(statement)], capture_output=True, text=True, check=True)
+        results.append(float(output.stdout) * 1e03)
+    return results
+
+print("import time, " + str(REPEAT) + " fresh interpreters per statement")
+print("{:>10} {:>10}  {}".format("median", "minimum", "statement"))
+for statement in targets:
+    results = measure(statement)
+    print("{:>8.2f}ms {:>8.2f}ms  {}".format(median(results), min(results), statement))
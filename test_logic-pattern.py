@@ -25,19 +25,15 @@ try:
 
     sleep(1)    # wait 1 second
 
-    # record a logic signal on a DIO channel
-    buffer = logic.record(device_data, channel=DIO_IN)
+    # record a logic signal on a DIO channel (with the sampling frequency of the recording)
+    recording = logic.capture(device_data, channel=DIO_IN)
 
     # limit displayed data size
-    length = len(buffer)
-    if length > 10000:
-        length = 10000
-    buffer = buffer[0:length]
-
-    # generate buffer for time moments
-    time = []
-    for index in range(length):
-        time.append(index * 1e06 / logic.data.sampling_frequency)   # convert time to μs
+    length = min(len(recording), 10000)
+    buffer = recording.data[0:length]
+
+    # time moments of the displayed data
+    time = recording.time(0, length) * 1e06   # convert time to μs
 
     # plot
     plt.plot(time, buffer)
@@ -0,0 +1,43 @@
+from WF_SDK import device, scope, wavegen, storage, error   # import instruments
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # connect to the device
+    device_data = device.open()
+
+    """-----------------------------------"""
+
+    # handle devices without analog I/O channels
+    if device_data.name != "Digital Discovery":
+
+        # 2 channels at 100KHz: 1.6MB of samples every second, only one chunk is in the memory at a time
+        scope.open(device_data, sampling_frequency=100e03, buffer_size=8192)
+
+        # generate a 1KHz sine signal on wavegen channel 1
+        wavegen.generate(device_data, channel=1, function=wavegen.function.sine, offset=0, frequency=1e03, amplitude=2)
+
+        # record 10 seconds into a file
+        header = storage.record(device_data, "recording.wfr", channels=[1, 2], duration=10)
+        print("recorded " + str(header["samples"]) + " samples, lost: " + str(header["lost"]))
+
+        # reset the scope and the wavegen
+        scope.close(device_data)
+        wavegen.close(device_data)
+
+        # open the file again: only the accessed samples are read from the disk
+        recording = storage.load("recording.wfr")
+        start = 5 * int(recording.header["sampling_frequency"])
+        part = recording.data[start:start + 1000, 0]
+        print("channel 1 after 5 seconds: between " + str(round(part.min(), 3)) + "V and " + str(round(part.max(), 3)) + "V")
+        storage.close(recording)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
@@ -0,0 +1,47 @@
+from WF_SDK import device, scope, wavegen, measurements, error   # import instruments
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # connect to the device
+    device_data = device.open()
+
+    """-----------------------------------"""
+
+    # handle devices without analog I/O channels
+    if device_data.name != "Digital Discovery":
+
+        # 8192 samples at 10MHz: 8 periods of the test signal in a segment
+        scope.open(device_data, sampling_frequency=10e06, buffer_size=8192)
+
+        # set up triggering on scope channel 1
+        scope.trigger(device_data, enable=True, source=scope.trigger_source.analog, channel=1, level=0)
+
+        # generate a 10KHz square signal with 25% duty cycle on wavegen channel 1
+        wavegen.generate(device_data, channel=1, function=wavegen.function.square, offset=0, frequency=10e03, amplitude=2, symmetry=25)
+
+        # measure a single recording
+        results = measurements.measure(scope.record(device_data, channel=1), device_data.scope.sampling_frequency)
+        for name, value in results.items():
+            print("{:<14} {:.6g}".format(name, value))
+
+        # measure 50 segments at once, then check the limits
+        recorded = scope.record_segments(device_data, channel=1, count=50)
+        results = measurements.measure(recorded.data, device_data.scope.sampling_frequency,
+                                       [measurements.measurement.frequency, measurements.measurement.duty_cycle])
+        passed = (abs(results["frequency"] - 10e03) < 10) & (abs(results["duty_cycle"] - 25) < 1)
+        print("passed: " + str(int(passed.sum())) + " of " + str(recorded.count) + " segments")
+
+        # reset the scope and the wavegen
+        scope.close(device_data)
+        wavegen.close(device_data)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
@@ -0,0 +1,60 @@
+from WF_SDK import device, scope, wavegen, error   # import instruments
+
+from time import perf_counter     # needed to measure the throughput
+import numpy                      # needed for the analysis
+
+"""-----------------------------------------------------------------------"""
+
+def analyze(voltages):
+    """
+        stand-in for the processing of a recording: the frequency of the strongest component
+    """
+    spectrum = numpy.abs(numpy.fft.rfft(voltages * numpy.hanning(len(voltages))))
+    return numpy.argmax(spectrum[1:]) + 1
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # connect to the device
+    device_data = device.open()
+
+    """-----------------------------------"""
+
+    # handle devices without analog I/O channels
+    if device_data.name != "Digital Discovery":
+
+        # 8192 samples at 10MHz: an acquisition takes 0.8ms
+        scope.open(device_data, sampling_frequency=10e06, buffer_size=8192)
+
+        # generate a 100KHz sine signal on wavegen channel 1
+        wavegen.generate(device_data, channel=1, function=wavegen.function.sine, offset=0, frequency=100e03, amplitude=2)
+
+        count = 100
+
+        # record, then process
+        start = perf_counter()
+        for _ in range(count):
+            analyze(scope.record(device_data, channel=1, as_array=True))
+        serial = count / (perf_counter() - start)
+
+        # process while the next acquisition is running
+        start = perf_counter()
+        for voltages in scope.pipeline(device_data, channel=1, count=count):
+            analyze(voltages)
+        pipelined = count / (perf_counter() - start)
+
+        print("recordings per second: " + str(round(serial, 1)) + " serial, " + str(round(pipelined, 1)) + " pipelined")
+
+        # reset the scope and the wavegen
+        scope.close(device_data)
+        wavegen.close(device_data)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
@@ -0,0 +1,40 @@
+from WF_SDK import device, scope, wavegen, error   # import instruments
+
+"""-----------------------------------------------------------------------"""
+
+try:
+    # connect to the device
+    device_data = device.open()
+
+    """-----------------------------------"""
+
+    # handle devices without analog I/O channels
+    if device_data.name != "Digital Discovery":
+
+        # the device buffer holds 0.1 seconds at 100KHz, the stream reads it several times meanwhile
+        scope.open(device_data, sampling_frequency=100e03, buffer_size=10000)
+
+        # generate a 50Hz sine signal on wavegen channel 1
+        wavegen.generate(device_data, channel=1, function=wavegen.function.sine, offset=0, frequency=50, amplitude=2)
+
+        # record 5 seconds from both channels in chunks of 0.5 seconds
+        for part in scope.stream(device_data, channel=[1, 2], chunk_size=50000, duration=5):
+            print("chunk " + str(part.sequence) + ": channel 1 between " + str(round(part.data[0].min(), 3)) + "V and " +
+                  str(round(part.data[0].max(), 3)) + "V, lost samples: " + str(part.lost))
+
+        # the totals of the whole recording
+        print("lost samples: " + str(device_data.scope.lost) + ", corrupted samples: " + str(device_data.scope.corrupted))
+
+        # reset the scope and the wavegen
+        scope.close(device_data)
+        wavegen.close(device_data)
+
+    """-----------------------------------"""
+
+    # close the connection
+    device.close(device_data)
+
+except error as e:
+    print(e)
+    # close the connection
+    device.close(device.data)
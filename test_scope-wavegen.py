@@ -25,22 +25,17 @@ try:
 
         sleep(1)    # wait 1 second
 
-        # record data with the scopeon channel 1
-        buffer = scope.record(device_data, channel=1)
+        # record data with the scope on channel 1 (with the sampling frequency of the recording)
+        recording = scope.capture(device_data, channel=1)
 
-        # limit displayed data size
-        length = len(buffer)
-        if length > 10000:
-            length = 10000
-        buffer = buffer[0:length]
+        # limit displayed data size (the peaks are kept)
+        indices, displayed = tools.downsample(recording.data, 10000, tools.downsampling.min_max)
 
-        # generate buffer for time moments
-        time = []
-        for index in range(len(buffer)):
-            time.append(index * 1e03 / scope.data.sampling_frequency)   # convert time to ms
+        # time moments of the displayed data
+        time = recording.time()[indices] * 1e03   # convert time to ms
 
         # plot
-        plt.plot(time, buffer)
+        plt.plot(time, displayed)
         plt.xlabel("time [ms]")
         plt.ylabel("voltage [V]")
         plt.show()
@@ -50,7 +45,7 @@ try:
         # compute the spectrum from 0Hz to 100KHz
         start_frequency = 0
         stop_frequency = 100e03
-        spectrum = tools.spectrum(buffer, tools.window.flat_top, scope.data.sampling_frequency, start_frequency, stop_frequency)
+        spectrum = tools.spectrum(recording.data, tools.window.flat_top, recording.sampling_frequency, start_frequency, stop_frequency)
 
         # calculate frequency domain data
         frequency = []